@@ -0,0 +1,90 @@
+"""
+Throughput of the graph engine on synthetic graphs of 10 to 10000 Nodes.
+
+* chain: a SinOsc followed by a chain of audio rate OpNodes
+* dag: random SinOsc, Lowpass and OpNode Nodes, each reading one or two earlier Nodes
+
+Measured for each graph:
+
+* group: Group.calc_func, evaluating the sorted Nodes one by one
+* plan: World._process_block, the compiled plan with the default options
+* plan_optimized: the plan with buffer sharing and op fusion
+"""
+
+import numpy as np
+import pyAudioGraph as ag
+from harness import Benchmark
+
+BUF_LEN = 64
+SIZES = (10, 100, 1000, 10000)
+QUICK_SIZES = (10, 100)
+
+
+def chain(world, n_nodes):
+    """Return the Nodes of a chain of n_nodes: a SinOsc followed by OpNodes."""
+    osc = ag.Nodes.SinOsc(world, freq=440)
+    nodes, w = [osc], osc.w_out
+    for k in range(n_nodes - 1):
+        w = w * 0.999 if k % 2 else w + 0.001
+        nodes.append(w.parent)
+    return nodes
+
+
+def dag(world, n_nodes, seed=0):
+    """
+    Return the Nodes of a random directed acyclic graph of n_nodes: 1 SinOsc out of 10, 1 Lowpass out of 10,
+    the others products or means of two earlier Nodes, so that the signals stay within [-1, 1].
+    """
+    rng = np.random.RandomState(seed)
+    osc = ag.Nodes.SinOsc(world, freq=110)
+    nodes, wires = [osc], [osc.w_out]
+    while len(nodes) < n_nodes:
+        r = rng.rand()
+        if r < 0.1:
+            n = ag.Nodes.SinOsc(world, freq=rng.uniform(50, 5000))
+        elif r < 0.2:
+            n = ag.Nodes.Lowpass(world, f0=rng.uniform(100, 5000))
+            wires[rng.randint(len(wires))].plug_into(n.w_in)
+        else:
+            a, b = wires[rng.randint(len(wires))], wires[rng.randint(len(wires))]
+            if r < 0.6:
+                w = a * b
+            else:
+                w = a + b
+                nodes.append(w.parent)
+                w = w * 0.5
+            n = w.parent
+        nodes.append(n)
+        wires.append(n.w_out)
+    return nodes
+
+
+def _world(shape, n_nodes, optimized=False):
+    w = ag.World(buf_len=BUF_LEN)
+    nodes = shape(w, n_nodes)
+    if optimized:
+        w.set_buffer_sharing(True)
+        w.set_op_fusion(True)
+    return w, nodes
+
+
+def benchmarks(quick=False):
+    for n_nodes in (QUICK_SIZES if quick else SIZES):
+        for shape in (chain, dag):
+            w, nodes = _world(shape, n_nodes)
+            g = ag.Group(w)
+            for n in nodes:
+                g.append(n)
+            g.sort()
+            yield Benchmark('graph/group/%s/n=%d' % (shape.__name__, n_nodes), g.calc_func, BUF_LEN, 'frame')
+
+            w, nodes = _world(shape, n_nodes)
+            w.append(nodes)
+            w.sort()
+            yield Benchmark('graph/plan/%s/n=%d' % (shape.__name__, n_nodes), w._process_block, BUF_LEN, 'frame')
+
+            w, nodes = _world(shape, n_nodes, optimized=True)
+            w.append(nodes)
+            w.sort()
+            yield Benchmark('graph/plan_optimized/%s/n=%d' % (shape.__name__, n_nodes), w._process_block,
+                            BUF_LEN, 'frame')
@@ -0,0 +1,153 @@
+"""
+Microbenchmarks of the calc_func of each class of pyAudioGraph.Nodes, and of OpNode, at several buf_len.
+
+The audio inputs are read from a SinOsc evaluated once, the control inputs keep their defaults. A class of
+pyAudioGraph.Nodes missing from FACTORIES is reported on stderr, so that new Nodes get a benchmark.
+"""
+
+import sys
+import numpy as np
+import pyAudioGraph as ag
+from harness import Benchmark
+
+BUF_LENS = (64, 512)
+QUICK_BUF_LENS = (64,)
+
+
+def _signal(world, freq=440):
+    """An audio rate OutWire holding a sine."""
+    osc = ag.Nodes.SinOsc(world, freq=freq)
+    osc.calc_func()
+    return osc.w_out
+
+
+def _plug(world, in_wires):
+    for k, iw in enumerate(in_wires):
+        _signal(world, 220 * (k + 1)).plug_into(iw)
+
+
+def _out_node(world):
+    n = ag.Nodes.OutNode(world)
+    _plug(world, n.w_in)
+    return n, n.calc_func
+
+
+def _mixer_node(world):
+    n = ag.Nodes.MixerNode(world, np.full((2, 4), 0.25))
+    _plug(world, n.w_in)
+    return n, n.calc_func
+
+
+def _monizer_node(world):
+    n = ag.Nodes.MonizerNode(world, ag.Nodes.InNode(world))
+    return n, n.calc_func
+
+
+def _sampler_node(world):
+    """Triggers a 4096 frames sample every 32 blocks."""
+    n = ag.Nodes.SamplerNode(world, 2)
+    n.add_buffer(np.random.RandomState(0).uniform(-1, 1, (2, 4096)).astype(np.float32))
+    triggers, count = [(0, 0, 0.5)], [0]
+
+    def step():
+        count[0] += 1
+        n.w_trigger_list._default_data = triggers if count[0] % 32 == 0 else ()
+        n.calc_func()
+    return n, step
+
+
+def _delay(world):
+    n = ag.Nodes.Delay(world, 4410)
+    _plug(world, [n.w_in])
+    return n, n.calc_func
+
+
+def _recorder(cls):
+    def factory(world):
+        n = cls(world, 2)
+        _plug(world, n.w_in)
+
+        def step():
+            n.calc_func()
+            n.clear()  # the recording does not grow
+        return n, step
+    return factory
+
+
+def _disk_in_node(world):
+    """Reads a looping AudioStreamArray synchronously, as in non-real-time mode."""
+    data = np.random.RandomState(0).uniform(-1, 1, (2, 44100)).astype(np.float32)
+    n = ag.Nodes.DiskInNode(world, ag.AudioStreamArray(data))
+    world.nrt = True
+    n.enable_loop(True)
+    n.prime()
+    return n, n.calc_func
+
+
+def _with_input(cls, *args):
+    def factory(world):
+        n = cls(world, *args)
+        _plug(world, [n.w_in])
+        return n, n.calc_func
+    return factory
+
+
+def _plain(cls, *args):
+    def factory(world):
+        n = cls(world, *args)
+        return n, n.calc_func
+    return factory
+
+
+def _op_node(world):
+    w = _signal(world) * 0.5
+    return w.parent, w.parent.calc_func
+
+
+# class name -> factory(world), returning the Node and the callable measured
+FACTORIES = {
+    'OutNode': _out_node,
+    'InNode': _plain(ag.Nodes.InNode),
+    'MixerNode': _mixer_node,
+    'MonizerNode': _monizer_node,
+    'SamplerNode': _sampler_node,
+    'AudioSlopeGen': _plain(ag.Nodes.AudioSlopeGen),
+    'ControlSlopeGen': _plain(ag.Nodes.ControlSlopeGen),
+    'ControlSeqGen': _plain(ag.Nodes.ControlSeqGen, np.linspace(0, 1, 100)),
+    'SignalOsc': _plain(ag.Nodes.SignalOsc, np.cos),
+    'ControlOsc': _plain(ag.Nodes.ControlOsc, np.cos),
+    'ControlSinOsc': _plain(ag.Nodes.ControlSinOsc),
+    'SinOsc': _plain(ag.Nodes.SinOsc),
+    'SawOsc': _plain(ag.Nodes.SawOsc),
+    'Delay': _delay,
+    'RmsNode': _with_input(ag.Nodes.RmsNode),
+    'ControlRateRecorder': _recorder(ag.Nodes.ControlRateRecorder),
+    'AudioRateRecorder': _recorder(ag.Nodes.AudioRateRecorder),
+    'DiskInNode': _disk_in_node,
+    'Lowpass': _with_input(ag.Nodes.Lowpass),
+    'ControlFIRFilter': _plain(ag.Nodes.ControlFIRFilter, np.ones(16) / 16),
+    'OpNode': _op_node,
+}
+
+
+def node_classes():
+    """The names of the Node classes exported by pyAudioGraph.Nodes."""
+    return sorted(name for name, obj in vars(ag.Nodes).items()
+                  if isinstance(obj, type) and issubclass(obj, ag.Node)
+                  and obj.__module__.startswith(ag.Nodes.__name__))
+
+
+def benchmarks(quick=False):
+    for name in node_classes():
+        if name not in FACTORIES:
+            print('bench_nodes: no benchmark for %s' % name, file=sys.stderr)
+
+    for buf_len in (QUICK_BUF_LENS if quick else BUF_LENS):
+        for name, factory in FACTORIES.items():
+            w = ag.World(buf_len=buf_len)
+            n, func = factory(w)
+            try:
+                yield Benchmark('nodes/%s/buf_len=%d' % (name, buf_len), func, buf_len, 'frame')
+            finally:
+                if isinstance(n, ag.Nodes.DiskInNode):
+                    n.baf.cmd_queue.join()
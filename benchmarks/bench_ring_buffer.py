@@ -0,0 +1,47 @@
+"""
+RingBuffer write, read and accumulate, in steady state, for blocks of several sizes.
+
+The length of the ring is not a multiple of the block, so that the blocks wrap around its end.
+"""
+
+import numpy as np
+import pyAudioGraph as ag
+from harness import Benchmark
+
+NCHANNELS = 2
+SIZES = (64, 512, 4096)
+QUICK_SIZES = (64,)
+
+
+def _ring(n):
+    rb = ag.RingBuffer(NCHANNELS, 3 * n + n // 2)
+    block = np.random.RandomState(0).uniform(-1, 1, (NCHANNELS, n)).astype(np.float32)
+    rb.write(block)
+    return rb, block
+
+
+def benchmarks(quick=False):
+    for n in (QUICK_SIZES if quick else SIZES):
+        rb, block = _ring(n)
+
+        def write():
+            rb.write(block)
+            rb.advance_read_index(n)
+        yield Benchmark('ring_buffer/write/n=%d' % n, write, n, 'frame')
+
+        rb, block = _ring(n)
+        out = np.zeros_like(block)
+
+        def read():
+            rb.advance_write_index(n)
+            rb.read(out)
+            rb.advance_read_index(n)
+        yield Benchmark('ring_buffer/read/n=%d' % n, read, n, 'frame')
+
+        rb, block = _ring(n)
+
+        def accumulate():
+            rb.accumulate(block, in_scale=0.5)
+            rb.advance_write_index(n)
+            rb.advance_read_index(n)
+        yield Benchmark('ring_buffer/accumulate/n=%d' % n, accumulate, n, 'frame')
@@ -0,0 +1,68 @@
+"""
+Read throughput of the audio streams, on a 16 bit stereo wave file of 10 seconds in a temporary directory.
+
+* AudioStreamWaveFile: through the wave module
+* AudioStreamWaveFileMemmap: through a memory map
+* BufferedAudioStream: a looping AudioStreamWaveFile read through the ring of frames, filled synchronously
+  (asynchronous=False), so that the time of the disk reads is counted
+"""
+
+import os
+import tempfile
+import numpy as np
+import pyAudioGraph as ag
+from pyAudioGraph.BufferedAudioStream import BufferedAudioStream
+from harness import Benchmark
+
+NCHANNELS = 2
+SAMPLE_RATE = 44100
+SIZES = (64, 512, 4096)
+QUICK_SIZES = (512,)
+
+
+def _write_wave(filename, seconds=10):
+    rng = np.random.RandomState(0)
+    writer = ag.WaveFileWriter(filename, NCHANNELS, SAMPLE_RATE, SAMPLE_RATE)
+    try:
+        for _ in range(seconds):
+            writer.write(rng.uniform(-0.5, 0.5, (NCHANNELS, SAMPLE_RATE)).astype(np.float32))
+    finally:
+        writer.close()
+
+
+def _rewinding_read(stream, out):
+    n = out.shape[1]
+
+    def read():
+        if stream.pos() + n > stream.length:
+            stream.seek(0)
+        stream.read(out)
+    return read
+
+
+def benchmarks(quick=False):
+    with tempfile.TemporaryDirectory() as tmp:
+        filename = os.path.join(tmp, 'bench.wav')
+        _write_wave(filename)
+        cmd_queue = ag.AsyncCmdQueue()
+        try:
+            for n in (QUICK_SIZES if quick else SIZES):
+                out = np.zeros((NCHANNELS, n), dtype=np.float32)
+
+                stream = ag.AudioStreamWaveFile(filename)
+                yield Benchmark('streams/AudioStreamWaveFile/read/n=%d' % n, _rewinding_read(stream, out), n, 'frame')
+
+                stream = ag.AudioStreamWaveFileMemmap(filename)
+                yield Benchmark('streams/AudioStreamWaveFileMemmap/read/n=%d' % n, _rewinding_read(stream, out),
+                                n, 'frame')
+
+                stream = BufferedAudioStream(ag.AudioStreamWaveFile(filename), cmd_queue, frame_length=n)
+                stream.enable_loop(True)
+                stream.prime()
+
+                def buffered_read(stream=stream):
+                    stream.read(out, asynchronous=False)
+                yield Benchmark('streams/BufferedAudioStream/read/n=%d' % n, buffered_read, n, 'frame')
+                del stream
+        finally:
+            cmd_queue.join()
@@ -0,0 +1,119 @@
+"""
+Compare the results of run.py against a baseline and flag the regressions.
+
+usage:
+
+    python benchmarks/compare.py [baseline.json] results.json [--threshold 0.1] [--stat median]
+
+Without a baseline file, the results are compared against benchmarks/baseline.json, the reference committed with
+the suite. Timings only compare on the same machine: record a baseline of your own before changing the code with
+
+    python benchmarks/run.py -o benchmarks/baseline.json
+
+(or -o elsewhere, passing that file to compare.py). A note is printed when the two files come from different
+platforms or versions of python, numpy or scipy.
+
+A benchmark regresses when its time grows by more than threshold (0.1: 10% slower), and improves when it shrinks
+by more than threshold. The exit status is 1 if any benchmark regressed, so that the comparison can gate a build.
+The new benchmarks are listed, the ones missing from the results (e.g. of a run with -k) are only counted, unless
+--verbose. Neither is flagged.
+"""
+
+import argparse
+import json
+import os
+import sys
+
+STATS = ('min', 'median', 'mean', 'max')
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+ENVIRONMENT = ('platform', 'machine', 'python', 'numpy', 'scipy')
+
+
+def compare(baseline, results, threshold=0.1, stat='median'):
+    """
+    Parameters
+    ----------
+    baseline, results : dict
+        as written by run.py
+    threshold : float
+        relative change of the time flagged as regression or improvement
+    stat : str
+        the time compared, one of STATS
+
+    Returns
+    -------
+    out : list of (name, baseline time, new time, ratio, status)
+        status is 'regression', 'improvement', 'ok', 'new' or 'missing', times in seconds, ratio new / baseline.
+        Sorted by name.
+    """
+    assert(stat in STATS)
+    base, new = baseline['results'], results['results']
+    out = []
+    for name in sorted(set(base) | set(new)):
+        if name not in base:
+            out.append((name, None, new[name][stat], None, 'new'))
+        elif name not in new:
+            out.append((name, base[name][stat], None, None, 'missing'))
+        else:
+            t0, t1 = base[name][stat], new[name][stat]
+            ratio = t1 / t0
+            if ratio > 1 + threshold:
+                status = 'regression'
+            elif ratio < 1 - threshold:
+                status = 'improvement'
+            else:
+                status = 'ok'
+            out.append((name, t0, t1, ratio, status))
+    return out
+
+
+def report(rows, verbose=False):
+    """Return a text table of the rows returned by compare, only the flagged and new ones unless verbose."""
+    lines = ['%-56s %12s %12s %8s  %s' % ('benchmark', 'baseline us', 'new us', 'ratio', 'status')]
+    for name, t0, t1, ratio, status in rows:
+        if status in ('ok', 'missing') and not verbose:
+            continue
+        lines.append('%-56s %12s %12s %8s  %s' % (name, '-' if t0 is None else '%.2f' % (1e6 * t0),
+                                                  '-' if t1 is None else '%.2f' % (1e6 * t1),
+                                                  '-' if ratio is None else '%.3f' % ratio, status))
+    counts = {}
+    for row in rows:
+        counts[row[4]] = counts.get(row[4], 0) + 1
+    lines.append(', '.join('%d %s' % (counts[s], s) for s in ('regression', 'improvement', 'ok', 'new', 'missing')
+                           if s in counts))
+    return '\n'.join(lines)
+
+
+def environment_changes(baseline, results):
+    """Return the keys of ENVIRONMENT whose values differ in the meta of the two results."""
+    return [key for key in ENVIRONMENT if baseline['meta'].get(key) != results['meta'].get(key)]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Compare benchmark results against a baseline.')
+    parser.add_argument('files', nargs='+', metavar='[baseline] results',
+                        help='JSON files written by run.py, the baseline defaults to benchmarks/baseline.json')
+    parser.add_argument('--threshold', type=float, default=0.1, help='relative change flagged (default 0.1)')
+    parser.add_argument('--stat', choices=STATS, default='median', help='time compared (default median)')
+    parser.add_argument('-v', '--verbose', action='store_true',
+                        help='list the unchanged and the missing benchmarks too')
+    args = parser.parse_args(argv)
+    if len(args.files) > 2:
+        parser.error('expected at most two files: [baseline] results')
+    baseline_file, results_file = ([BASELINE] + args.files)[-2:]
+
+    with open(baseline_file) as f:
+        baseline = json.load(f)
+    with open(results_file) as f:
+        results = json.load(f)
+    changes = environment_changes(baseline, results)
+    if changes:
+        print('note: %s differ from the baseline %s, record a baseline on this machine (see compare.py)' % (
+            ', '.join(changes), baseline_file))
+    rows = compare(baseline, results, args.threshold, args.stat)
+    print(report(rows, args.verbose))
+    return 1 if any(row[4] == 'regression' for row in rows) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,60 @@
+"""
+Timing of the benchmarks, shared by the benchmark modules and run.py.
+
+A benchmark module defines benchmarks(quick), a generator yielding a Benchmark for each measure. The objects a
+measure needs (worlds, temporary files, command queues) are built by the generator before yielding it, and released
+in its finally clause: run.py measures each Benchmark before asking for the next one.
+"""
+
+import math
+import timeit
+
+
+class Benchmark:
+    """
+    * name: unique name, '/' separated, e.g. 'nodes/Lowpass/buf_len=64'
+    * func: callable without arguments, the operation measured
+    * items: number of items processed by a call, e.g. frames
+    * unit: name of the items
+    """
+
+    def __init__(self, name, func, items=1, unit='call'):
+        self.name = name
+        self.func = func
+        self.items = items
+        self.unit = unit
+
+
+def measure(func, repeat=5, min_time=0.05):
+    """
+    Time func, as timeit: the garbage collector is disabled, and each repeat calls func number times.
+
+    Parameters
+    ----------
+    func : callable
+    repeat : int
+        number of timings
+    min_time : float
+        each timing lasts at least min_time seconds, number is chosen accordingly
+
+    Returns
+    -------
+    out : dict
+        number and repeat, and the min, median, mean and max time of a call, in seconds
+    """
+    timer = timeit.Timer(func)
+    t = timer.timeit(1)  # also a warm up
+    number = 1
+    while t < min_time:
+        number = max(number * 2, math.ceil(number * min_time / max(t, 1e-9)))
+        t = timer.timeit(number)
+    times = sorted(timer.repeat(repeat, number))
+    times = [t / number for t in times]
+    return {
+        'number': number,
+        'repeat': repeat,
+        'min': times[0],
+        'median': times[len(times) // 2],
+        'mean': sum(times) / len(times),
+        'max': times[-1],
+    }
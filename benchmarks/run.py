@@ -0,0 +1,101 @@
+"""
+Run the benchmarks and write their results to a JSON file.
+
+usage:
+
+    python benchmarks/run.py [-o results.json] [-k FILTER] [--quick] [--repeat N] [--min-time SECONDS]
+
+The benchmarks measure the pyAudioGraph of this working tree. The JSON file holds:
+
+* meta: the date, the commit, the versions of python, numpy and scipy, the platform and the options
+* results: for each benchmark name, the time of a call in seconds (min, median, mean, max), the items processed by
+  a call, their unit and the throughput in items per second (items / median)
+
+Compare two results files with compare.py. benchmarks/baseline.json is the reference committed with the suite,
+record it again on the machine running the comparison with
+
+    python benchmarks/run.py -o benchmarks/baseline.json
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import numpy as np  # noqa: E402
+import scipy  # noqa: E402
+from harness import measure  # noqa: E402
+import bench_graph  # noqa: E402
+import bench_nodes  # noqa: E402
+import bench_ring_buffer  # noqa: E402
+import bench_streams  # noqa: E402
+
+MODULES = (bench_graph, bench_nodes, bench_ring_buffer, bench_streams)
+
+
+def _commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', 'HEAD'], cwd=ROOT, stderr=subprocess.DEVNULL,
+                                       universal_newlines=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(name_filter=None, quick=False, repeat=5, min_time=0.05, out=sys.stdout):
+    """
+    Measure the benchmarks whose name contains name_filter.
+
+    Returns
+    -------
+    out : dict
+        the results, as written to the JSON file
+    """
+    results = {}
+    for module in MODULES:
+        for bm in module.benchmarks(quick):
+            if name_filter is not None and name_filter not in bm.name:
+                continue
+            r = measure(bm.func, repeat=repeat, min_time=min_time)
+            r['items'] = bm.items
+            r['unit'] = bm.unit
+            r['throughput'] = bm.items / r['median']
+            results[bm.name] = r
+            if out is not None:
+                print('%-56s %12.2f us %14.0f %s/s' % (bm.name, 1e6 * r['median'], r['throughput'], bm.unit),
+                      file=out)
+    meta = {
+        'date': datetime.datetime.now().isoformat(timespec='seconds'),
+        'commit': _commit(),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'scipy': scipy.__version__,
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'options': {'filter': name_filter, 'quick': quick, 'repeat': repeat, 'min_time': min_time},
+    }
+    return {'meta': meta, 'results': results}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Run the pyAudioGraph benchmarks.')
+    parser.add_argument('-o', '--output', default='benchmarks.json', help='JSON file of the results')
+    parser.add_argument('-k', '--filter', default=None, help='run the benchmarks whose name contains FILTER')
+    parser.add_argument('--quick', action='store_true', help='fewer sizes, for a smoke test')
+    parser.add_argument('--repeat', type=int, default=5, help='timings of each benchmark')
+    parser.add_argument('--min-time', type=float, default=0.05, help='seconds of each timing')
+    args = parser.parse_args(argv)
+
+    data = run(args.filter, args.quick, args.repeat, args.min_time)
+    with open(args.output, 'w') as f:
+        json.dump(data, f, indent=1, sort_keys=True)
+    print('%d results written to %s' % (len(data['results']), args.output))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,127 @@
+"""
+Audit of the memory allocated by the Nodes in calc_func, with tracemalloc (see audit_allocations).
+
+A Node meant for the audio thread should not allocate: allocations take locks in the allocator and feed the
+garbage collector, whose pauses are not bounded. For each calc_func the audit measures:
+
+* peak_bytes: the highest memory allocated during the call, temporary arrays included, 0 for an allocation-free Node
+* net_bytes: the memory still allocated after the call (e.g. a growing list)
+* net_objects: the Python objects still allocated after the call (blocks of the Python allocator)
+
+tracemalloc does not count the temporary objects, their size shows in peak_bytes. The small Python objects of a
+call (scalars, views, argument tuples) come from the free lists of the interpreter and do not reach the system
+allocator: AllocationReport.allocating tolerates SMALL_OBJECTS bytes of them.
+"""
+
+import sys
+import tracemalloc
+import numpy as np
+
+SMALL_OBJECTS = 1024  # bytes, less than the buffer of a block from buf_len 256
+
+
+class NodeAllocations:
+    """Allocations of a Node over the audited blocks: blocks, max and mean peak_bytes, net_bytes, net_objects."""
+
+    def __init__(self, name, node, peaks, net_bytes, net_objects):
+        self.name = name
+        self.node = node
+        self.blocks = len(peaks)
+        self.peak_bytes = int(np.max(peaks))
+        self.mean_peak_bytes = float(np.mean(peaks))
+        self.net_bytes = int(net_bytes)
+        self.net_objects = int(net_objects)
+
+
+class AllocationReport:
+    """
+    Result of audit_allocations.
+
+    * nodes: list of NodeAllocations, in evaluation order
+    """
+
+    def __init__(self, nodes):
+        self.nodes = nodes
+
+    def allocating(self, threshold=SMALL_OBJECTS):
+        """Return the NodeAllocations of the Nodes whose peak_bytes exceeds threshold in some block."""
+        return [s for s in self.nodes if s.peak_bytes > threshold]
+
+    def report(self):
+        """Return a text table, the largest allocations first."""
+        lines = ['%-24s %10s %14s %10s %12s' % ('node', 'peak B', 'mean peak B', 'net B', 'net objects')]
+        for s in sorted(self.nodes, key=lambda s: s.peak_bytes, reverse=True):
+            lines.append('%-24s %10d %14.1f %10d %12d' % (s.name[:24], s.peak_bytes, s.mean_peak_bytes,
+                                                          s.net_bytes, s.net_objects))
+        return '\n'.join(lines)
+
+
+def _nothing():
+    pass
+
+
+def _measure(calc_func, get=tracemalloc.get_traced_memory, reset=tracemalloc.reset_peak,
+             blocks=sys.getallocatedblocks):
+    """Return the peak and net bytes, and the net objects allocated by calc_func."""
+    reset()
+    current = get()[0]
+    objects = blocks()
+    calc_func()
+    objects = blocks() - objects
+    after, peak = get()
+    return peak - current, after - current, objects
+
+
+def audit_allocations(world, n_blocks=16, warmup=2):
+    """
+    Evaluate the plan of world under tracemalloc and measure the allocations of each calc_func.
+
+    The first warmup blocks are evaluated without measuring, as Nodes may allocate their buffers lazily.
+    The Nodes are evaluated by the World as in World.run, the world input and output are not touched.
+    The wrappers of the plan (e.g. the sleeping Nodes of Silence) are reported under the wrapped Node.
+
+    Parameters
+    ----------
+    world : World
+    n_blocks : int
+        number of blocks audited
+    warmup : int
+        number of blocks evaluated before the audit
+
+    Returns
+    -------
+    out : AllocationReport
+    """
+    if world._plan is None:
+        world.compile()
+    plan = world._plan
+    for _ in range(warmup):
+        for calc_func in plan:
+            calc_func()
+
+    # the integers of the measure itself are counted: calibrate on a function doing nothing, measured in the
+    # same loop as the plan
+    audited = (_nothing,) + tuple(plan)
+    peaks = np.zeros((len(audited), n_blocks), dtype=np.int64)
+    net_bytes = np.zeros((len(audited), n_blocks), dtype=np.int64)
+    net_objects = np.zeros((len(audited), n_blocks), dtype=np.int64)
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    try:
+        for j in range(n_blocks):
+            for k, calc_func in enumerate(audited):
+                peaks[k, j], net_bytes[k, j], net_objects[k, j] = _measure(calc_func)
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+    peaks = np.maximum(peaks[1:] - int(np.median(peaks[0])), 0)
+    net_bytes = net_bytes[1:].sum(axis=1) - n_blocks * int(np.median(net_bytes[0]))
+    net_objects = net_objects[1:].sum(axis=1) - n_blocks * int(np.median(net_objects[0]))
+
+    nodes = []
+    for k, calc_func in enumerate(plan):
+        node = getattr(calc_func, '__self__', calc_func)
+        node = getattr(node, 'node', node)
+        nodes.append(NodeAllocations(type(node).__name__, node, peaks[k], net_bytes[k], net_objects[k]))
+    return AllocationReport(nodes)
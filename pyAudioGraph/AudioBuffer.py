@@ -71,7 +71,7 @@ class AudioBuffer:
             number of samples to read
         start : int
             start position of the source buffer
-        out_buffer : numpy.ndarray of shape (nchannels, n)
+        out_buffer : numpy.ndarray of shape (nchannels, n), or list of nchannels numpy.ndarray of shape (1, n)
             output buffer
         out_offset : int
             start position of the destination buffer
@@ -81,9 +81,13 @@ class AudioBuffer:
         int
             number of samples read
         """
-        assert(self.length >= start and out_buffer.ndim == 2 and out_buffer.shape[0] == self.nchannels)
+        assert(self.length >= start and len(out_buffer) == self.nchannels)
         to_read = np.minimum(length, self.length - start)  # how much space to fill
-        out_buffer[:, out_offset:out_offset + to_read] = self.buf[:, start:start + to_read]
+        if isinstance(out_buffer, list):
+            for c, out_ in enumerate(out_buffer):
+                out_[:, out_offset:out_offset + to_read] = self.buf[c, start:start + to_read]
+        else:
+            out_buffer[:, out_offset:out_offset + to_read] = self.buf[:, start:start + to_read]
         return to_read
 
 
@@ -239,17 +243,17 @@ class RingBuffer:
 
         Parameters
         ----------
-        out_buffer : numpy.ndarray of shape (nchannels, n)
-            output buffer
+        out_buffer : numpy.ndarray of shape (nchannels, n), or list of nchannels numpy.ndarray of shape (1, n)
+            output buffer, e.g. the buffers of nchannels OutWires
 
         Returns
         -------
         int
             number of read samples
         """
-        assert(out_buffer.ndim == 2 and out_buffer.shape[0] == self._nchannels)
+        assert(len(out_buffer) == self._nchannels)
 
-        remaining = np.minimum(out_buffer.shape[1], self._available)
+        remaining = np.minimum(out_buffer[0].shape[-1], self._available)
         count = 0
         tail_tmp = self._tail
 
@@ -1,5 +1,8 @@
 """Audio Driver module implements the audio callback using pyAudio (portaudio)."""
 
+import time
+import numpy as np
+
 # This conditional import is needed for passing Travis CI compilation
 try:
     import pyaudio
@@ -7,15 +10,114 @@ try:
 except ImportError:
     pyaudio_available = False
 
+# PaStreamCallbackFlags and PaStreamCallbackResult of portaudio, as in pyaudio
+paInputUnderflow, paInputOverflow, paOutputUnderflow, paOutputOverflow = 1, 2, 4, 8
+paContinue = 0
+
+_XRUN_FLAGS = (('input_underflow', paInputUnderflow), ('input_overflow', paInputOverflow),
+               ('output_underflow', paOutputUnderflow), ('output_overflow', paOutputOverflow))
+
+
+class CallbackMonitor:
+    """
+    Health of the audio callback: xruns reported by the device, callback-to-callback jitter and compute time
+    against the deadline (buf_len / sample_rate), over a rolling window of the last callbacks.
+
+    Written only by the audio thread, read by the other threads without locks: stats() copies the window,
+    so it may mix two consecutive callbacks.
+    """
+
+    def __init__(self, period, window=1024, on_xrun=None):
+        """
+        Parameters
+        ----------
+        period : float
+            the deadline of a callback in seconds, buf_len / sample_rate
+        window : int
+            number of callbacks in the rolling statistics
+        on_xrun : callable on_xrun(status, monitor) or None
+            called in the audio thread when the device reports an xrun, keep it short
+        """
+        self.period = period
+        self.window = window
+        self.on_xrun = on_xrun
+        self.n_callbacks = 0
+        self.xruns = {name: 0 for name, _ in _XRUN_FLAGS}
+        self.latency = 0.  # output latency reported by the device in the last callback, seconds
+        self._intervals = np.full(window, period)  # time since the previous callback
+        self._compute = np.zeros(window)  # time spent in the callback
+        self._last_start = None
+
+    def update(self, start, end, status=0, time_info=None):
+        """
+        Record a callback, in the audio thread.
+
+        Parameters
+        ----------
+        start, end : float
+            time.perf_counter() at the start and at the end of the callback
+        status : int
+            PaStreamCallbackFlags of the callback
+        time_info : dict or None
+            the time_info of the callback
+        """
+        k = self.n_callbacks % self.window
+        if self._last_start is not None:
+            self._intervals[k] = start - self._last_start
+        self._compute[k] = end - start
+        self._last_start = start
+        if time_info:
+            self.latency = time_info.get('output_buffer_dac_time', 0.) - time_info.get('current_time', 0.)
+        self.n_callbacks += 1
+
+        if status & (paInputUnderflow | paInputOverflow | paOutputUnderflow | paOutputOverflow):
+            for name, flag in _XRUN_FLAGS:
+                if status & flag:
+                    self.xruns[name] += 1
+            if self.on_xrun is not None:
+                self.on_xrun(status, self)
+
+    def stats(self):
+        """
+        Returns
+        -------
+        out : dict
+            * callbacks: number of callbacks since the start
+            * xruns: dict of the counts of input_underflow, input_overflow, output_underflow, output_overflow
+            * jitter_mean, jitter_p99, jitter_max: deviation of the callback intervals from the period, seconds
+            * load_mean, load_p99, load_max: compute time as a fraction of the period
+            * deadline_misses: callbacks of the window whose compute time exceeded the period
+            * latency: output latency reported by the device, seconds
+        """
+        n = min(self.n_callbacks, self.window)
+        intervals, compute = self._intervals[:n].copy(), self._compute[:n].copy()
+        jitter = np.abs(intervals - self.period) if n else np.zeros(1)
+        load = compute / self.period if n else np.zeros(1)
+        return {'callbacks': self.n_callbacks,
+                'xruns': dict(self.xruns),
+                'jitter_mean': float(np.mean(jitter)),
+                'jitter_p99': float(np.percentile(jitter, 99)),
+                'jitter_max': float(np.max(jitter)),
+                'load_mean': float(np.mean(load)),
+                'load_p99': float(np.percentile(load, 99)),
+                'load_max': float(np.max(load)),
+                'deadline_misses': int(np.sum(compute > self.period)),
+                'latency': self.latency}
+
 
 class AudioDriver:
-    """Wraps the pyAudio functionality needed to manage the audio thread."""
+    """
+    Wraps the pyAudio functionality needed to manage the audio thread.
+
+    monitor (CallbackMonitor) keeps the xruns, the jitter and the compute time of the callbacks.
+    """
 
-    def __init__(self, world):
+    def __init__(self, world, window=1024, on_xrun=None):
         self.world = world
         self.sample_rate = world.sample_rate
         self.buf_len = world.buf_len
         self.nchannels = world.nchannels
+        self.monitor = CallbackMonitor(world.buf_len / world.sample_rate, window=window, on_xrun=on_xrun)
 
         if(pyaudio_available):
             self._p = pyaudio.PyAudio()
@@ -57,8 +159,10 @@ class AudioDriver:
         flag must be either paContinue, paComplete or paAbort
         """
         assert(frame_count == self.buf_len)
+        start = time.perf_counter()
         out_data = self.world.run(in_data)
-        return (out_data, pyaudio.paContinue)
+        self.monitor.update(start, time.perf_counter(), status, time_info)
+        return (out_data, paContinue)
 
     def stop(self):
         """Stop the audio thread."""
@@ -1,4 +1,41 @@
-import numpy as np
+from collections import deque
+
+
+def node_parents(node):
+    """
+    Return the Nodes connected to the InWires of node.
+
+    Parameters
+    ----------
+    node : Node
+
+    Returns
+    -------
+    out : list of Node
+        one entry for each connected InWire (duplicates are possible)
+    """
+    out = []
+    for iw in node.in_wires:
+        ow = iw.out_wire()
+        if ow is not None:
+            out.append(ow.parent)
+    return out
+
+
+def node_children(node):
+    """
+    Return the Nodes connected to the OutWires of node.
+
+    Parameters
+    ----------
+    node : Node
+
+    Returns
+    -------
+    out : list of Node
+        one entry for each connected InWire (duplicates are possible)
+    """
+    return [iw.parent for ow in node.out_wires for iw in ow.in_wires()]
 
 
 class Node:
@@ -33,100 +70,294 @@ class Node:
         """
         pass
 
+    def is_pure(self):
+        """
+        Return True if calc_func computes the outputs only from the inputs, without internal state or side effects.
+        With constant inputs the outputs are constant, and may be computed once (see Pruning.fold_constants).
+        """
+        return False
+
+    def signal_in_wires(self):
+        """
+        Return the InWires of the signal processed by the Node, if silent signal inputs give silent outputs once
+        the tail has decayed (e.g. filters, delays, mixers), whatever the other inputs. None (default) otherwise.
+
+        Such a Node may sleep while its signal inputs are silent (see Silence): it is reset (when it has a reset
+        method) and not evaluated, its outputs are zeros.
+        """
+        return None
+
+    def tail_decayed(self):
+        """
+        Return True if the internal state of the Node (e.g. filter memory, delay line) is negligible, so that
+        silent signal inputs would give silent outputs. Called after each calc_func, when signal_in_wires is not None.
+        """
+        return True
+
 
 class Group(Node):
     """
     A Group of Nodes and a Node itself. Implements the composite design pattern for the Nodes.
     Create the nodes and then simply append the output node[s] to the group.
     Expose the inner Node's [Obj]In|OutWire through [Obj]In|OutWireAdaptor
+
+    After the first sort(), append(), remove() and connect() keep the group sorted incrementally. Until then the
+    nodes are only collected, so that their parents may be plugged after append() and are found by sort().
+    The parents plugged after append() into a sorted group are found by compile(), which sorts the group again.
     """
     def __init__(self, world):
         super().__init__(world)
         self.nodesList = []
-        self.is_sorted = True
+        self._nodes_index = {}  # node -> position in nodesList
+        self.is_sorted = False
 
     def append(self, node):
-        if node in self.nodesList:
+        if node in self._nodes_index:
             print("Trying to append a node that is already in the group, doing nothing")
             return
 
+        if self.is_sorted and self._insert_sorted(node):
+            return
+
+        self._nodes_index[node] = len(self.nodesList)
         self.nodesList.append(node)
         self.is_sorted = False
 
+    def remove(self, node):
+        """
+        Disconnect node from the graph and remove it from the group.
+        The Nodes connected to its OutWires fall back to their default data.
+        Parents that are no longer needed are not removed.
+
+        Parameters
+        ----------
+        node : Node
+            a Node of the group
+        """
+        if node not in self._nodes_index:
+            raise ValueError(str(node.__class__.__name__) + " is not in the group")
+
+        for iw in node.in_wires:
+            ow = iw.out_wire()
+            if ow is not None:
+                ow.unplug(iw)
+        for ow in node.out_wires:
+            for iw in list(ow.in_wires()):
+                ow.unplug(iw)
+
+        i = self._nodes_index.pop(node)
+        del self.nodesList[i]
+        self._reindex(i)
+
+    def connect(self, out_wire, in_wire):
+        """
+        Plug out_wire into in_wire, restoring the topological order locally if the group is sorted.
+
+        Parameters
+        ----------
+        out_wire : OutWire
+        in_wire : InWire
+            the InWire of a Node of the group
+        """
+        out_wire.plug_into(in_wire)
+        if not self.is_sorted:
+            return
+
+        src, dst = in_wire.out_wire().parent, in_wire.parent
+        if dst not in self._nodes_index:
+            self.is_sorted = False
+        elif src not in self._nodes_index:
+            self.append(src)
+        else:
+            try:
+                self._reorder(src, dst)
+            except ValueError:
+                out_wire.unplug(in_wire)
+                raise
+
     def calc_func(self):
         if not self.is_sorted:
             self.sort()
+        profiler = self.world.profiler
+        if profiler is not None:
+            profiler.run_nodes(self.nodesList)
+            return
+        tracer = self.world.tracer
+        if tracer is not None:
+            tracer.run_nodes(self.nodesList)
+            return
         for n in self.nodesList:
             n.calc_func()
 
     def clear(self):
         self.nodesList = []
-        self.is_sorted = True
+        self._nodes_index = {}
+        self.is_sorted = False
 
-    def _topological_sort_util(self, v, connections, visited, stack):
-        visited[v] = True
+    def compile(self):
+        """
+        Flatten the group into the ordered list of the Nodes to be evaluated.
 
-        adj = np.where(connections[v] == 1)[0]
-        for i in adj:
-            if not visited[i]:
-                self._topological_sort_util(i, connections, visited, stack)
+        Nested Groups are sorted if needed and expanded in place, so that the result contains only leaf Nodes.
+        Groups overriding calc_func are kept as a single Node. Each Node appears once, at its first position.
+        The group is sorted again if its Nodes have parents outside of it, e.g. plugged after append().
 
-        stack.append(v)
+        Returns
+        -------
+        out : list of Node
+            the Nodes in evaluation order
+        """
+        if not self.is_sorted or len(self._new_parents(self.nodesList)) > len(self.nodesList):
+            self.sort()
 
-    def _topological_sort(self, connections):
-        stack = []
+        out, seen = [], set()
+        for n in self.nodesList:
+            if isinstance(n, Group) and type(n).calc_func is Group.calc_func:
+                inner = n.compile()
+            else:
+                inner = [n]
+            for n_ in inner:
+                if n_ not in seen:
+                    seen.add(n_)
+                    out.append(n_)
+        return out
 
-        assert(connections.ndim == 2 and connections.shape[0] == connections.shape[1])
-        nnodes = connections.shape[0]
-        visited = [False for _ in range(nnodes)]
+    def _reindex(self, start=0):
+        index, nl = self._nodes_index, self.nodesList
+        for i in range(start, len(nl)):
+            index[nl[i]] = i
 
-        for v in range(nnodes):
-            if not visited[v]:
-                self._topological_sort_util(v, connections, visited, stack)
+    def _reach(self, start, neighbours, lo, hi):
+        """Nodes reachable from start through neighbours, among those at positions lo..hi"""
+        index = self._nodes_index
+        seen, stack = {start}, [start]
+        while stack:
+            for n in neighbours(stack.pop()):
+                i = index.get(n)
+                if i is not None and lo <= i <= hi and n not in seen:
+                    seen.add(n)
+                    stack.append(n)
+        return seen
+
+    def _reorder(self, src, dst):
+        """
+        Restore the topological order after the edge src -> dst was added (Pearce-Kelly).
+        Only the nodes between the two positions that are affected by the new edge are moved.
+        """
+        index, nl = self._nodes_index, self.nodesList
+        lo, hi = index[dst], index[src]
+        if hi < lo:
+            return
 
-        stack.reverse()
-        return stack
+        fwd = self._reach(dst, node_children, lo, hi)
+        if src in fwd:
+            raise ValueError("connecting " + str(src.__class__.__name__) + " to " +
+                             str(dst.__class__.__name__) + " would create a cycle")
+        bwd = self._reach(src, node_parents, lo, hi)
+
+        moved = sorted(bwd, key=index.get) + sorted(fwd, key=index.get)
+        slots = sorted(index[n] for n in moved)
+        for i, n in zip(slots, moved):
+            nl[i] = n
+            index[n] = i
+
+    def _insert_sorted(self, node):
+        """
+        Insert node and its new parents into the sorted list, without sorting it again.
+
+        Returns
+        -------
+        out : bool
+            False if the new nodes cannot be placed between their parents and children
+        """
+        index = self._nodes_index
+        new = self._new_parents([node])
+
+        lb, ub = -1, len(self.nodesList)
+        for n in new:
+            for p in node_parents(n):
+                if p in index:
+                    lb = max(lb, index[p])
+            for c in node_children(n):
+                if c in index:
+                    ub = min(ub, index[c])
+                elif c not in new:
+                    return False  # connected to a node outside the group
+        if lb >= ub:
+            return False
+
+        self.nodesList[ub:ub] = self._kahn_sort(new)
+        self._reindex(ub)
+        return True
+
+    def _new_parents(self, nodes):
+        """
+        Traverse the graph with depth first search, starting from nodes.
+        Return nodes and all their ancestors that are not in the group yet, in discovery order.
+        """
+        index = self._nodes_index
+        out = list(nodes)
+        visited, stack = set(out), list(out)
+
+        while stack:
+            for p in node_parents(stack.pop()):
+                if p not in visited and p not in index:
+                    visited.add(p)
+                    out.append(p)
+                    stack.append(p)
+        return out
 
     def _add_parents(self):
         """
-        Traverse the graph with depth first search.
         Add all the nodes that are required by the nodes in self.nodesList.
         Update self.nodesList at the end with all the nodes in the graph
         """
-        nl = self.nodesList
-        visited, stack = set(), nl
+        self._nodes_index = {}
+        self.nodesList = self._new_parents(self.nodesList)
+        self._reindex()
 
-        while stack:
-            inode = stack.pop()
-            if inode not in visited:
-                # print("visiting " + str(inode.__class__.__name__))
-                visited.add(inode)
-                for iw in inode.in_wires:
-                    ow = iw.out_wire()
-                    if(ow is not None and
-                       (ow.parent not in stack) and
-                       (ow.parent not in visited)):
-                        # print("adding " + str(ow.parent.__class__.__name__))
-                        stack.append(ow.parent)
-        self.nodesList = list(visited)
+    def _kahn_sort(self, nl):
+        """
+        Topological sort of nl, with Kahn's algorithm on the sparse adjacency lists.
+        Edges towards nodes outside nl are ignored.
+        """
+        index = {n: i for i, n in enumerate(nl)}
+        indegree = [0] * len(nl)
+        adj = [[] for _ in nl]
+        for i1, n in enumerate(nl):
+            for c in node_children(n):
+                i2 = index.get(c)
+                if i2 is not None:
+                    adj[i1].append(i2)
+                    indegree[i2] += 1
+
+        ready = deque(i for i in range(len(nl)) if indegree[i] == 0)
+        sorted_list = []
+        while ready:
+            i1 = ready.popleft()
+            sorted_list.append(nl[i1])
+            for i2 in adj[i1]:
+                indegree[i2] -= 1
+                if indegree[i2] == 0:
+                    ready.append(i2)
+
+        if len(sorted_list) < len(nl):
+            raise ValueError("the graph contains a cycle")
+        return sorted_list
 
     def sort(self):
         self._add_parents()  # add all the parents of the added nodes
 
-        nl = self.nodesList
-        nnodes = len(nl)
-        connections = np.zeros((nnodes, nnodes), dtype=int)
-        for i1 in range(nnodes):
-            for ow in nl[i1].out_wires:
+        index = self._nodes_index
+        for n in self.nodesList:
+            for ow in n.out_wires:
                 for iw in ow.in_wires():
-                    if iw.parent not in nl:
+                    if iw.parent not in index:
                         raise ValueError(str(iw.parent.__class__.__name__) +
                                          " is not in the graph, although connected to the output of " +
                                          str(ow.parent.__class__.__name__))
-                    i2 = nl.index(iw.parent)
-                    connections[i1, i2] = 1
 
-        sorted_list = self._topological_sort(connections)
-        self.nodesList = [self.nodesList[i] for i in sorted_list]
+        self.nodesList = self._kahn_sort(self.nodesList)
+        self._reindex()
 
         self.is_sorted = True
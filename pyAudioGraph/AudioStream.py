@@ -1,4 +1,7 @@
 import wave
+import struct
+import threading
+import queue
 import numpy as np
 from .Range import Range
 
@@ -42,8 +45,7 @@ class AudioStreamWaveFile(AudioStream):
         self.length = self.wf.getnframes()
         self.sample_rate = self.wf.getframerate()
         self.samplewidth = self.wf.getsampwidth()
-        self.sampleType_numpy = self._get_sample_type(self.samplewidth)
-        self.normCoeff = np.iinfo(self.sampleType_numpy).max
+        self.sampleType_numpy, self.sampleOffset, self.normCoeff = self._get_sample_format(self.samplewidth)
         self._pos = 0
 
     def read(self, out_buffer, start=0, length=None, out_range_queue=None):
@@ -56,9 +58,10 @@ class AudioStreamWaveFile(AudioStream):
 
         # read to_read frames with interlaved channels (2*to_read samples)
         data = self.wf.readframes(to_read)
-        data_np = np.fromstring(data, dtype=self.sampleType_numpy)
-        out_buffer[:, start:start + to_read] = data_np.reshape((self.nchannels, -1), order='F')
-        out_buffer[:, start:start + to_read] = out_buffer[:, start:start + to_read] / self.normCoeff
+        data_np = np.frombuffer(data, dtype=self.sampleType_numpy)
+        out = out_buffer[:, start:start + to_read]
+        out[:] = data_np.reshape((self.nchannels, -1), order='F')
+        out[:] = (out - self.sampleOffset) / self.normCoeff
         out_buffer[:, start + to_read:] = 0
         self._pos += to_read
 
@@ -67,13 +70,19 @@ class AudioStreamWaveFile(AudioStream):
 
         return to_read
 
-    def _get_sample_type(self, samplewidth):
+    @staticmethod
+    def _get_sample_format(samplewidth):
+        """
+        Return the numpy type, the offset and the normalization coefficient of integer PCM samples of samplewidth
+        bytes: a sample s stands for (s - offset) / normCoeff. 8 bit samples are unsigned, centered on 128.
+        """
         if(samplewidth == 1):
-            return np.int8
+            return np.uint8, 128, 127
         elif(samplewidth == 2):
-            return np.int16
+            return np.int16, 0, np.iinfo(np.int16).max
         elif(samplewidth == 4):
-            return np.int32
+            return np.int32, 0, np.iinfo(np.int32).max
+        raise ValueError("unsupported sample width of " + str(samplewidth) + " bytes, expected 1, 2 or 4")
 
     def seek(self, pos):
         assert(pos >= 0)
@@ -86,3 +95,223 @@ class AudioStreamWaveFile(AudioStream):
 
     def __del__(self):
         self.wf.close()
+
+
+class AudioStreamArray(AudioStream):
+    """
+    read from a numpy.ndarray of shape (nchannels, length)
+    """
+    def __init__(self, data, sample_rate=44100):
+        super().__init__()
+        assert(data.ndim == 2)
+        self.data = data
+        self.nchannels = data.shape[0]
+        self.length = data.shape[1]
+        self.sample_rate = sample_rate
+        self._pos = 0
+
+    def read(self, out_buffer, start=0, length=None, out_range_queue=None):
+        assert(out_buffer.shape[0] == self.nchannels)
+        if(length is None):
+            length = out_buffer.shape[1]
+        assert(start + length <= out_buffer.shape[1])
+
+        to_read = min(self.length - self._pos, length)
+        out_buffer[:, start:start + to_read] = self.data[:, self._pos:self._pos + to_read]
+        out_buffer[:, start + to_read:start + length] = 0
+        self._pos += to_read
+
+        if(out_range_queue is not None):
+            out_range_queue.push(Range(self._pos - to_read, self._pos))
+
+        return to_read
+
+    def seek(self, pos):
+        assert(pos >= 0)
+        self._pos = min(pos, self.length)
+
+    def pos(self):
+        return self._pos
+
+
+class AudioStreamWaveFileMemmap(AudioStreamArray):
+    """
+    read PCM wave files (8 bit unsigned, 16/32 bit integer or 32 bit float) through a memory map:
+    only the frames that are read are loaded from the disk, and no read call goes through the wave module.
+    Other formats raise ValueError.
+    """
+    def __init__(self, filename):
+        fmt, offset, size = self._parse(filename)
+        audio_format, nchannels, sample_rate, bits = fmt
+        if(audio_format == 3 and bits == 32):
+            dtype, self.sampleOffset, self.normCoeff = np.float32, 0, 1
+        elif(audio_format == 1 and bits % 8 == 0):
+            dtype, self.sampleOffset, self.normCoeff = AudioStreamWaveFile._get_sample_format(bits // 8)
+        else:
+            raise ValueError(filename + ": unsupported wave format " + str(audio_format) + " with " + str(bits) +
+                             " bits per sample")
+        frame_size = nchannels * bits // 8
+        mm = np.memmap(filename, dtype=dtype, mode='r', offset=offset, shape=(size // frame_size, nchannels))
+        super().__init__(mm.T, sample_rate)
+
+    def read(self, out_buffer, start=0, length=None, out_range_queue=None):
+        if(length is None):
+            length = out_buffer.shape[1]
+        to_read = super().read(out_buffer, start, length, out_range_queue)
+        if(self.sampleOffset != 0):
+            out_buffer[:, start:start + to_read] -= self.sampleOffset
+        if(self.normCoeff != 1):
+            out_buffer[:, start:start + to_read] /= self.normCoeff
+        return to_read
+
+    @staticmethod
+    def _parse(filename):
+        """Return ((format, nchannels, sample_rate, bits_per_sample), data offset, data size)"""
+        fmt = None
+        with open(filename, 'rb') as f:
+            riff, _, wave_id = struct.unpack('<4sI4s', f.read(12))
+            if(riff != b'RIFF' or wave_id != b'WAVE'):
+                raise ValueError(filename + " is not a wave file")
+            while True:
+                header = f.read(8)
+                if(len(header) < 8):
+                    raise ValueError(filename + " has no data chunk")
+                chunk_id, chunk_size = struct.unpack('<4sI', header)
+                if(chunk_id == b'fmt '):
+                    audio_format, nchannels, sample_rate, _, _, bits = struct.unpack('<HHIIHH', f.read(16))
+                    if(audio_format == 0xFFFE):  # WAVE_FORMAT_EXTENSIBLE, the format is in the sub-format GUID
+                        f.read(8)
+                        audio_format = struct.unpack('<H', f.read(2))[0]
+                        f.seek(chunk_size - 26, 1)
+                    else:
+                        f.seek(chunk_size - 16, 1)
+                    fmt = (audio_format, nchannels, sample_rate, bits)
+                elif(chunk_id == b'data'):
+                    if(fmt is None):
+                        raise ValueError(filename + " has no fmt chunk")
+                    return fmt, f.tell(), chunk_size
+                else:
+                    f.seek(chunk_size + (chunk_size & 1), 1)
+
+
+class AudioStreamGenerator(AudioStream):
+    """
+    read from an iterable of numpy.ndarray blocks of shape (nchannels, n), n may change from block to block.
+    length is unknown (0) and seek is not supported
+    """
+    def __init__(self, blocks, nchannels, sample_rate=44100):
+        super().__init__()
+        self.blocks = iter(blocks)
+        self.nchannels = nchannels
+        self.sample_rate = sample_rate
+        self._block = np.zeros((nchannels, 0), dtype=np.float32)  # current block
+        self._block_pos = 0
+        self._pos = 0
+
+    def read(self, out_buffer, start=0, length=None, out_range_queue=None):
+        assert(out_buffer.shape[0] == self.nchannels)
+        if(length is None):
+            length = out_buffer.shape[1]
+        assert(start + length <= out_buffer.shape[1])
+
+        count = 0
+        while(count < length):
+            if(self._block_pos == self._block.shape[1]):
+                self._block = next(self.blocks, None)
+                self._block_pos = 0
+                if(self._block is None):
+                    self._block = np.zeros((self.nchannels, 0), dtype=np.float32)
+                    break
+            n = min(length - count, self._block.shape[1] - self._block_pos)
+            out_buffer[:, start + count:start + count + n] = self._block[:, self._block_pos:self._block_pos + n]
+            self._block_pos += n
+            count += n
+        out_buffer[:, start + count:start + length] = 0
+        self._pos += count
+
+        if(out_range_queue is not None):
+            out_range_queue.push(Range(self._pos - count, self._pos))
+
+        return count
+
+    def pos(self):
+        return self._pos
+
+
+class WaveFileWriter:
+    """
+    Write float blocks to an integer PCM wave file, in a background thread.
+
+    write() copies the block to one of nbuffers preallocated buffers, and blocks only if all of them
+    are waiting to be written: the memory used does not grow with the length of the file.
+    """
+    def __init__(self, filename, nchannels, sample_rate, block_len, samplewidth=2, nbuffers=16):
+        """
+        Parameters
+        ----------
+        filename : str
+        nchannels : int
+        sample_rate : int
+        block_len : int
+            maximum number of frames passed to write()
+        samplewidth : int
+            bytes per sample: 1 (unsigned), 2 or 4, otherwise ValueError
+        nbuffers : int
+            number of blocks that can wait to be written
+        """
+        self.nchannels = nchannels
+        self.sample_rate = sample_rate
+        self.block_len = block_len
+        self.sampleType_numpy, self.sampleOffset, self.normCoeff = AudioStreamWaveFile._get_sample_format(samplewidth)
+
+        self.wf = wave.open(filename, 'wb')
+        self.wf.setnchannels(nchannels)
+        self.wf.setsampwidth(samplewidth)
+        self.wf.setframerate(sample_rate)
+
+        self._free = queue.Queue()
+        self._full = queue.Queue()
+        for _ in range(nbuffers):
+            self._free.put(np.zeros((nchannels, block_len), dtype=np.float32))
+        self._error = None
+        self.thread = threading.Thread(target=self.thread_func)
+        self.thread.start()
+
+    def write(self, block):
+        """
+        Queue a block for writing.
+
+        Parameters
+        ----------
+        block : numpy.ndarray of shape (nchannels, n), n <= block_len
+            samples in [-1, 1]
+        """
+        if self._error is not None:
+            raise self._error
+        n = block.shape[1]
+        assert(block.shape[0] == self.nchannels and n <= self.block_len)
+        buf = self._free.get()
+        buf[:, :n] = block
+        self._full.put((buf, n))
+
+    def close(self):
+        """Write the queued blocks and close the file."""
+        self._full.put(None)
+        self.thread.join()
+        self.wf.close()
+        if self._error is not None:
+            raise self._error
+
+    def thread_func(self):
+        while True:
+            item = self._full.get()
+            if item is None:
+                return
+            buf, n = item
+            try:
+                if self._error is None:
+                    data = np.clip(buf[:, :n], -1, 1) * self.normCoeff + self.sampleOffset
+                    self.wf.writeframes(data.T.astype(self.sampleType_numpy).tobytes())
+            except Exception as e:
+                self._error = e
+            self._free.put(buf)
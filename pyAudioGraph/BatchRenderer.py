@@ -0,0 +1,171 @@
+"""
+BatchRenderer renders the same graph over many inputs or parameter sets, on a pool of processes.
+"""
+
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
+from .AudioStream import AudioStreamArray, AudioStreamWaveFileMemmap
+
+_worker = {}  # state of the worker process: the World and the BatchGraph built by _init_worker
+OUTPUT_EXTENSIONS = ('.npy', '.npz', '.wav')
+
+
+class BatchGraph(ABC):
+    """
+    Describes the graph rendered by BatchRenderer. Subclass it, the instance must be picklable.
+
+    * build(world) is called once in each worker process, and creates the graph in world
+    * setup(job) is called before each job: reset the state of the nodes and apply job['params']
+    * results() is called after each job, returns extra data (e.g. the content of the recorders).
+      The key 'out' is reserved for the output of the graph.
+    """
+
+    @abstractmethod
+    def build(self, world):
+        """Create the graph in world, sorted afterwards by the worker."""
+
+    def setup(self, job):
+        pass
+
+    def results(self):
+        """
+        Returns
+        -------
+        out : dict str -> ndarray
+            without the key 'out'
+        """
+        return {}
+
+
+class BatchResult:
+    """Outcome of a job: index in the job list, output filename, returned data, wall time and length."""
+
+    def __init__(self, index, output, data, seconds, n_samples):
+        self.index = index
+        self.output = output
+        self.data = data
+        self.seconds = seconds
+        self.n_samples = n_samples
+
+
+def _init_worker(graph, world_args):
+    from .World import World
+
+    world = World(**world_args)
+    graph.build(world)
+    world.sort()
+    _worker['world'] = world
+    _worker['graph'] = graph
+
+
+def _run_job(index, job, n_blocks):
+    t0 = time.perf_counter()
+    world, graph = _worker['world'], _worker['graph']
+
+    in_data = job.get('input')
+    if isinstance(in_data, str):
+        in_data = AudioStreamWaveFileMemmap(in_data)
+    elif in_data is not None:
+        in_data = AudioStreamArray(in_data, world.sample_rate)
+    world.set_input_stream(in_data)
+    graph.setup(job)
+
+    output = job.get('output')
+    n_samples = world._n_samples(job.get('n_samples'), job.get('seconds'))
+    if n_samples is None:
+        n_samples = in_data.length
+    if output is not None and output.endswith('.wav'):
+        world.render_to_wav(output, n_samples, n_blocks=n_blocks)
+        out = None
+    else:
+        out = world.render(n_samples, n_blocks=n_blocks)
+    world.set_input_stream(None)
+
+    data = graph.results()
+    if 'out' in data:
+        raise ValueError("BatchGraph.results() returned the key 'out', reserved for the output of the graph")
+    if output is None:
+        data['out'] = out
+    elif output.endswith('.npy'):
+        np.save(output, out)
+    elif output.endswith('.npz'):
+        np.savez(output, out=out, **data)
+    return BatchResult(index, output, data, time.perf_counter() - t0, n_samples)
+
+
+def _check_job(index, job):
+    """Raise ValueError if the job cannot be rendered."""
+    if job.get('input') is None and job.get('n_samples') is None and job.get('seconds') is None:
+        raise ValueError("job %d has no 'input': give its length with 'n_samples' or 'seconds'" % index)
+    output = job.get('output')
+    if output is not None and not output.endswith(OUTPUT_EXTENSIONS):
+        raise ValueError("job %d: 'output' must end with one of %s, got %r" % (index, ', '.join(OUTPUT_EXTENSIONS),
+                                                                              output))
+
+
+class BatchRenderer:
+    """
+    Render a BatchGraph over a list of jobs, in non-real-time mode, on a pool of worker processes.
+
+    Each worker builds its World and graph once, and reuses them for all of its jobs.
+    A job is a dict with the optional keys:
+
+    * 'input': wave filename or ndarray of shape (nchannels, n), fed to World.inBuffer (see World.set_input_stream)
+    * 'n_samples' or 'seconds': the length of the rendering, the length of the input if not given
+    * 'output': filename ending with .npy, .npz (output and results()) or .wav. If missing, the output is
+      returned in BatchResult.data['out']
+    * 'params': anything used by BatchGraph.setup
+    """
+
+    def __init__(self, graph, buf_len=64, sample_rate=44100, nchannels=2, n_workers=None, n_blocks=1):
+        """
+        Parameters
+        ----------
+        graph : BatchGraph
+        buf_len, sample_rate, nchannels :
+            parameters of the World of each worker
+        n_workers : int
+            number of worker processes, None for the number of cpus
+        n_blocks : int
+            blocks evaluated at once, see World.run_nrt
+        """
+        self.graph = graph
+        self.world_args = dict(buf_len=buf_len, sample_rate=sample_rate, nchannels=nchannels)
+        self.n_workers = n_workers
+        self.n_blocks = n_blocks
+
+    def run(self, jobs, progress=None):
+        """
+        Run all the jobs.
+
+        Parameters
+        ----------
+        jobs : list of dict
+        progress : callable progress(n_done, n_jobs, result), optional
+            called in the calling process each time a job is completed
+
+        Returns
+        -------
+        out : list of BatchResult
+            in the order of jobs
+
+        Raises
+        ------
+        ValueError
+            before starting the workers, if a job has no input and no length, or an unknown output format
+        """
+        jobs = list(jobs)
+        for i, job in enumerate(jobs):
+            _check_job(i, job)
+        results = [None] * len(jobs)
+        with ProcessPoolExecutor(max_workers=self.n_workers, initializer=_init_worker,
+                                 initargs=(self.graph, self.world_args)) as pool:
+            futures = [pool.submit(_run_job, i, job, self.n_blocks) for i, job in enumerate(jobs)]
+            for n_done, f in enumerate(as_completed(futures), 1):
+                r = f.result()
+                results[r.index] = r
+                if progress is not None:
+                    progress(n_done, len(jobs), r)
+        return results
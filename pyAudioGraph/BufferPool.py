@@ -0,0 +1,97 @@
+"""
+Buffer sharing between OutWires, from the liveness of the wires in the evaluation order (see World.set_buffer_sharing).
+
+The data of an OutWire is needed from the evaluation of its parent until the evaluation of its last consumer.
+Wires whose live ranges do not overlap can use the same array, as registers in a compiler:
+the number of arrays drops from the number of wires to the maximum number of wires live at the same time.
+"""
+
+import heapq
+import numpy as np
+from .Wire import OutWire
+
+
+def wire_live_ranges(nodes):
+    """
+    Compute the live range of the OutWires that can share their buffer.
+
+    A wire is excluded if it is not connected, or if one of its consumers is not in nodes
+    (e.g. a Node inside a Group that overrides calc_func), as its data may be read at any time.
+    The OpNodes fused in a FusedOpNode (see Fusion) are evaluated at its position.
+
+    Parameters
+    ----------
+    nodes : list of Node
+        nodes in evaluation order, as returned by Group.compile or Fusion.fuse_ops
+
+    Returns
+    -------
+    out : dict OutWire -> (int, int)
+        the positions in nodes of the parent and of the last consumer of each wire
+    """
+    index = {}
+    for i, n in enumerate(nodes):
+        for m in getattr(n, 'fused_nodes', [n]):
+            index[m] = i
+    ranges = {}
+    for i, n in enumerate(nodes):
+        for ow in dict.fromkeys(n.out_wires):
+            if type(ow) is not OutWire or index.get(ow.parent) != i or not ow.in_wires():
+                continue
+            ends = [index.get(iw.parent) for iw in ow.in_wires()]
+            if None in ends:
+                continue
+            ranges[ow] = (i, max(ends))
+    return ranges
+
+
+def share_buffers(nodes, exclude=()):
+    """
+    Assign the arrays of the OutWires of nodes from a pool, with a linear scan over the live ranges.
+
+    Two wires share an array only if they have the same shape and dtype, and the last consumer of the first wire
+    is evaluated before the parent of the second one. So a Node never writes an array that it is reading.
+    Every Node must write all its connected OutWires at each calc_func, as the array holds other data between
+    the evaluations.
+
+    Parameters
+    ----------
+    nodes : list of Node
+        nodes in evaluation order, as returned by Group.compile
+    exclude : collection of OutWire
+        wires keeping their buffer, e.g. the wires on the ControlBus
+
+    Returns
+    -------
+    out : (list of OutWire, int)
+        the wires given a shared array, and the number of arrays in the pool
+    """
+    ranges = wire_live_ranges(nodes)
+    for ow in exclude:
+        ranges.pop(ow, None)
+    free = {}  # (shape, dtype) -> list of arrays
+    active = []  # heap of (end, k, key, array)
+    n_arrays = 0
+    for k, (ow, (start, end)) in enumerate(sorted(ranges.items(), key=lambda item: item[1])):
+        while active and active[0][0] < start:
+            _, _, key_, array = heapq.heappop(active)
+            free[key_].append(array)
+
+        data = ow.data()
+        key = (data.shape, data.dtype.str)
+        pool = free.setdefault(key, [])
+        if pool:
+            array = pool.pop()
+        else:
+            array = np.zeros_like(data)
+            n_arrays += 1
+        array[...] = data
+        ow._data = array
+        heapq.heappush(active, (end, k, key, array))
+    return list(ranges), n_arrays
+
+
+def release_buffers(wires):
+    """Give back a private array to each wire, with a copy of its current data."""
+    for ow in wires:
+        ow._data = np.copy(ow._data)
@@ -170,7 +170,7 @@ class BufferedAudioStream(LoopableAudioStream):
         self.loop_end = self.stream.loop_end
 
     # AudioStream
-    def read(self, out_buffer, start=0, length=None, out_range_queue=None, async=True):
+    def read(self, out_buffer, start=0, length=None, out_range_queue=None, asynchronous=True):
         assert(out_buffer.shape[0] == self.nchannels)
         if(length is None):
             length = out_buffer.shape[1]
@@ -182,7 +182,7 @@ class BufferedAudioStream(LoopableAudioStream):
 
         # async seek, if needed, and fill buffer
         if(self.ringBuffer.need_refill()):
-            self._seek_fill_buffer(async)
+            self._seek_fill_buffer(asynchronous)
 
         return length
 
@@ -205,23 +205,23 @@ class BufferedAudioStream(LoopableAudioStream):
         self.ringBuffer.clear()
         self._seek_fill_buffer(False)  # seek and fill synchronously
 
-    def _seek_fill_buffer(self, async):
+    def _seek_fill_buffer(self, asynchronous):
         if(self.needSeek):
-            self._seek_cmd(async)
+            self._seek_cmd(asynchronous)
             self.needSeek = False
 
-        self._read_cmd(async)
+        self._read_cmd(asynchronous)
 
-    def _seek_cmd(self, async):
+    def _seek_cmd(self, asynchronous):
         cmd = LambdaCommand(self.stream.seek, args=(self.needSeekPos,))
-        if(async):
+        if(asynchronous):
             self.cmd_queue.push(cmd)
         else:
             cmd()
 
-    def _read_cmd(self, async):
+    def _read_cmd(self, asynchronous):
         cmd = LambdaCommand(self.ringBuffer.fill, args=(self.stream,))
-        if(async):
+        if(asynchronous):
             self.cmd_queue.push(cmd)
         else:
             cmd()
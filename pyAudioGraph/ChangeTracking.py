@@ -0,0 +1,118 @@
+"""
+Change tracking of the control rate OutWires, for skipping the pure Nodes whose inputs did not change
+(see World.set_change_tracking).
+
+Each tracked OutWire counts its changes in OutWire.version. A pure control Node (see Node.is_pure) is evaluated
+only if the version of one of its input wires, or the default data of an unconnected InWire, changed since its
+last evaluation, otherwise it keeps its previous output. After an evaluation, the version of an output is
+incremented only if its value changed, so a converged SlopeGen or a saturated clip stops the propagation.
+"""
+
+import numpy as np
+from .AudioGraph import Node
+from .Wire import InWire, OutWire
+
+
+def _is_control(ow):
+    return isinstance(ow, OutWire) and ow.data().shape[1] == 1
+
+
+def _value(data):
+    return data.item() if data.size == 1 else data.tobytes()
+
+
+def _default_key(data):
+    return data if np.isscalar(data) or data is None else id(data)
+
+
+class _TrackedNode(Node):
+    """
+    Replaces node in the plan: evaluates it (unless skipped) and increments the version of its changed outputs.
+    """
+
+    def __init__(self, node, outputs, skippable):
+        super().__init__(node.world)
+        self.node = node
+        self._calc_func = node.calc_func
+        self._outputs = outputs
+        self._last = [_value(ow.data()) for ow in outputs]
+        self.skippable = skippable
+        self._sources = [iw.out_wire() for iw in node.in_wires if iw.out_wire() is not None]
+        self._defaults = [iw for iw in node.in_wires if iw.out_wire() is None]
+        self._seen = None
+        self.n_skipped = 0
+
+    def calc_func(self):
+        if self.skippable:
+            key = (tuple([ow.version for ow in self._sources]),
+                   tuple([_default_key(iw.get_data()) for iw in self._defaults]))
+            if key == self._seen:
+                self.n_skipped += 1
+                return
+            self._seen = key
+
+        self._calc_func()
+        last = self._last
+        for k, ow in enumerate(self._outputs):
+            v = _value(ow.data())
+            if v != last[k]:
+                last[k] = v
+                ow.version += 1
+
+
+def track_changes(nodes, constant=()):
+    """
+    Wrap the pure control Nodes, so that they are skipped when their inputs do not change,
+    and the Nodes feeding them, so that they publish the changes of their outputs.
+
+    A pure Node is skippable if all its outputs are control rate OutWires, and its inputs are InWires unconnected
+    or connected to control rate OutWires of nodes or of constant Nodes.
+    The wrapped Nodes read and write their own buffers, do not share them (see BufferPool).
+
+    Parameters
+    ----------
+    nodes : list of Node
+        nodes in evaluation order, as returned by Group.compile or Fusion.fuse_ops
+    constant : collection of Node
+        Nodes whose outputs do not change, e.g. as returned by Pruning.fold_constants
+
+    Returns
+    -------
+    out : list of Node
+        the nodes to be evaluated, in evaluation order
+    """
+    evaluated = {}
+    for n in nodes:
+        for m in getattr(n, 'fused_nodes', [n]):
+            evaluated[m] = n
+    constant = set(constant)
+
+    skippable = set()
+    for n in nodes:
+        if not n.is_pure() or not n.out_wires or not all(_is_control(ow) for ow in n.out_wires):
+            continue
+        ok = True
+        for iw in n.in_wires:
+            ow = iw.out_wire()
+            if not isinstance(iw, InWire):
+                ok = False
+            elif ow is not None and not (_is_control(ow) and (ow.parent in evaluated or ow.parent in constant)):
+                ok = False
+        if ok:
+            skippable.add(n)
+
+    publishers = set(skippable)
+    for n in skippable:
+        for iw in n.in_wires:
+            ow = iw.out_wire()
+            if ow is not None and ow.parent in evaluated:
+                publishers.add(evaluated[ow.parent])
+
+    out = []
+    for n in nodes:
+        if n in publishers:
+            outputs = [ow for ow in dict.fromkeys(n.out_wires) if _is_control(ow)]
+            out.append(_TrackedNode(n, outputs, n in skippable))
+        else:
+            out.append(n)
+    return out
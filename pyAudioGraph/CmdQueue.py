@@ -18,11 +18,12 @@ class AsyncCmdQueue:
     Asynchronous command queue
     """
     def __init__(self):
-        self.thread = threading.Thread(target=self.thread_func)
+        self.thread = threading.Thread(target=self.thread_func, name='AsyncCmdQueue')
         self.isRunning = False
         self.isFlushing = False
         self.cmdQueue = queue.Queue()
         self.cv = threading.Condition()
+        self.tracer = None
         self.launch()
 
     def push(self, cmd):
@@ -33,6 +34,12 @@ class AsyncCmdQueue:
             self.cmdQueue.put(cmd, block=False)
             self.cv.notify()
 
+    def set_tracer(self, tracer):
+        """
+        tracer: Tracer or None, records a span for each command executed (see World.set_tracer)
+        """
+        self.tracer = tracer
+
     def launch(self):
         if(not self.isRunning):
             self.isRunning = True
@@ -45,7 +52,11 @@ class AsyncCmdQueue:
                     self.cv.wait(0.1)
             while(not self.cmdQueue.empty()):
                 cmd = self.cmdQueue.get_nowait()
-                cmd()
+                tracer = self.tracer
+                if(tracer is None):
+                    cmd()
+                else:
+                    tracer.run_command(cmd)
 
     def flush(self):
         fcv = threading.Condition()
@@ -0,0 +1,52 @@
+"""
+The control bus: the data of all the control rate OutWires in one contiguous array (see World.set_control_bus).
+
+Each control wire is a column of ControlBus.values, its buffer is a view of that column. The nodes read and write
+the wires as before, while the whole state of the controls can be copied, restored or updated with slices of a
+single array, e.g. for snapshots, smoothing towards a target, recording or updating a remote copy.
+"""
+
+import numpy as np
+from .Wire import OutWire
+
+
+class ControlBus:
+    """
+    * values: ndarray of shape (batch_size, len(wires)), the data of the wires
+    * wires: the control rate OutWires, one for each column of values
+    """
+
+    def __init__(self, nodes, batch_size=1):
+        """
+        Move the control rate OutWires of nodes on the bus, with their current data.
+
+        Parameters
+        ----------
+        nodes : list of Node
+            as returned by Group.compile
+        batch_size : int
+            rows of the buffers, see World.batch_size
+        """
+        self.wires = [ow for n in nodes for ow in dict.fromkeys(n.out_wires)
+                      if type(ow) is OutWire and ow.data().shape[1] == 1]
+        self._index = {ow: k for k, ow in enumerate(self.wires)}
+        self.values = np.zeros((batch_size, len(self.wires)), dtype=np.float32)
+        for k, ow in enumerate(self.wires):
+            self.values[:, k:k + 1] = ow.data()
+            ow._data = self.values[:, k:k + 1]
+
+    def column(self, out_wire):
+        """Return the column of out_wire in values, raise KeyError if it is not on the bus."""
+        return self._index[out_wire]
+
+    def columns(self, out_wires):
+        """Return the columns of out_wires in values, as an index array for vectorised updates."""
+        return np.array([self._index[ow] for ow in out_wires], dtype=np.intp)
+
+    def snapshot(self):
+        """Return a copy of the values of all the wires."""
+        return self.values.copy()
+
+    def restore(self, values):
+        """Set the values of all the wires, e.g. from a snapshot."""
+        np.copyto(self.values, values)
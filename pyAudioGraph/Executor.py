@@ -0,0 +1,380 @@
+"""
+Executors evaluate the compiled node list of a World, in place of the serial plan (see World.set_executor).
+
+* ParallelExecutor: evaluates the independent nodes of each dependency level on a pool of threads.
+* PipelineExecutor: splits the graph in stages evaluated concurrently on consecutive blocks.
+"""
+
+import threading
+import time
+from abc import ABC, abstractmethod
+import numpy as np
+from .AudioGraph import node_parents
+
+
+def dependency_levels(nodes):
+    """
+    Group the nodes in dependency levels.
+    The nodes of a level depend only on nodes of the previous levels, so they can be evaluated concurrently.
+
+    Parameters
+    ----------
+    nodes : list of Node
+        nodes in topological order, as returned by Group.compile
+
+    Returns
+    -------
+    out : list of list of Node
+        the levels, each preserving the order of nodes
+    """
+    level = {}
+    levels = []
+    for n in nodes:
+        lv = 0
+        for p in node_parents(n):
+            if p in level:
+                lv = max(lv, level[p] + 1)
+        level[n] = lv
+        if lv == len(levels):
+            levels.append([])
+        levels[lv].append(n)
+    return levels
+
+
+def partition_stages(costs, n_stages):
+    """
+    Split a sequence of costs in at most n_stages contiguous ranges, minimizing the cost of the heaviest range.
+
+    Parameters
+    ----------
+    costs : list of float
+    n_stages : int
+
+    Returns
+    -------
+    out : list of (int, int)
+        n_stages ranges (start, end), the last ones may be empty
+    """
+    def greedy(max_cost):
+        bounds, start, acc = [], 0, 0.
+        for i, c in enumerate(costs):
+            if acc + c > max_cost and i > start:
+                bounds.append((start, i))
+                start, acc = i, 0.
+            acc += c
+        bounds.append((start, len(costs)))
+        return bounds
+
+    lo, hi = max(costs, default=0.), sum(costs)
+    for _ in range(50):  # bisection on the cost of the heaviest range
+        mid = (lo + hi) / 2
+        if len(greedy(mid)) <= n_stages:
+            hi = mid
+        else:
+            lo = mid
+    bounds = greedy(hi)
+    bounds += [(len(costs), len(costs))] * (n_stages - len(bounds))
+    return bounds
+
+
+def _run_all(calc_funcs):
+    for calc_func in calc_funcs:
+        calc_func()
+
+
+class _ThreadedExecutor(ABC):
+    """
+    Base class of the executors: measures the cost of the nodes and runs tasks on persistent threads.
+
+    The cost of each node is measured during the first calibration_blocks blocks, evaluated serially,
+    then subclasses build their schedule in _make_schedule() and evaluate it in _run_schedule().
+    """
+
+    def __init__(self, n_threads, calibration_blocks):
+        assert(n_threads >= 1)
+        self.n_threads = n_threads
+        self.calibration_blocks = calibration_blocks
+
+        self._nodes = []
+        self._cost = {}
+        self._n_calibrated = 0
+        self._schedule = None
+
+        self._tasks = [()] * n_threads
+        self._error = None
+        self._barrier = threading.Barrier(n_threads)
+        self._threads = [threading.Thread(target=self._thread_func, args=(k,), daemon=True)
+                         for k in range(1, n_threads)]
+        for t in self._threads:
+            t.start()
+
+    def compile(self, nodes):
+        """
+        Prepare the evaluation of nodes and start a new calibration.
+
+        Parameters
+        ----------
+        nodes : list of Node
+            nodes in topological order, as returned by Group.compile
+        """
+        self._nodes = list(nodes)
+        self.recalibrate()
+
+    def recalibrate(self):
+        """Measure again the cost of the nodes, e.g. after changing their parameters."""
+        self._cost = dict.fromkeys(self._nodes, 0.)
+        self._n_calibrated = 0
+        self._schedule = None
+
+    def costs(self):
+        """Return a dict node -> measured average cost of calc_func, in seconds."""
+        n = max(self._n_calibrated, 1)
+        return {node: c / n for node, c in self._cost.items()}
+
+    def run(self):
+        """Evaluate all the nodes once."""
+        if self._schedule is None:
+            if self._n_calibrated < self.calibration_blocks:
+                self._calibrate()
+                return
+            self._schedule = self._make_schedule()
+        self._run_schedule()
+
+    def close(self):
+        """Stop the threads."""
+        self._barrier.abort()
+        for t in self._threads:
+            t.join()
+
+    @abstractmethod
+    def _make_schedule(self):
+        """Return the schedule of the calibrated nodes, stored in self._schedule."""
+
+    @abstractmethod
+    def _run_schedule(self):
+        """Evaluate all the nodes once, following self._schedule."""
+
+    def _calibrate(self):
+        cost = self._cost
+        perf_counter = time.perf_counter
+        for n in self._nodes:
+            t0 = perf_counter()
+            n.calc_func()
+            cost[n] += perf_counter() - t0
+        self._n_calibrated += 1
+
+    def _run_parallel(self, tasks):
+        """Run tasks[k] in the k-th thread, tasks[0] in the calling thread, and wait for all of them."""
+        self._tasks = tasks
+        self._barrier.wait()  # start
+        try:
+            _run_all(tasks[0])
+        finally:
+            self._barrier.wait()  # end
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    def _thread_func(self, k):
+        barrier = self._barrier
+        while True:
+            try:
+                barrier.wait()
+            except threading.BrokenBarrierError:
+                return
+            try:
+                _run_all(self._tasks[k])
+            except Exception as e:
+                self._error = e
+            try:
+                barrier.wait()
+            except threading.BrokenBarrierError:
+                return
+
+
+class ParallelExecutor(_ThreadedExecutor):
+    """
+    Evaluate the graph level by level, running the nodes of each level on a persistent pool of threads.
+
+    Numpy and scipy release the GIL in most heavy operations, so independent branches of the graph
+    (e.g. several DiskInNode -> Lowpass chains feeding a MixerNode) can use several cores.
+
+    After the calibration, the nodes of each level are split in n_threads chunks of similar cost.
+    A level is evaluated in parallel only if the time saved (total cost minus the cost of the heaviest chunk)
+    exceeds sync_cost, otherwise it is evaluated serially in the calling thread.
+    """
+
+    def __init__(self, n_threads=4, sync_cost=50e-6, calibration_blocks=16):
+        """
+        Parameters
+        ----------
+        n_threads : int
+            number of threads evaluating a level, including the calling (audio) thread
+        sync_cost : float
+            estimated cost in seconds of dispatching a level to the threads
+        calibration_blocks : int
+            number of blocks used for measuring the cost of the nodes
+        """
+        super().__init__(n_threads, calibration_blocks)
+        self.sync_cost = sync_cost
+
+    def _make_schedule(self):
+        """
+        Returns
+        -------
+        out : list of (bool, tasks)
+            (False, calc_funcs) for serial steps, (True, [calc_funcs for each thread]) for parallel steps
+        """
+        costs = self.costs()
+        schedule = []
+        serial = []
+        for level in dependency_levels(self._nodes):
+            chunks, loads = self._split(level, costs)
+            total = sum(loads)
+            if len(level) > 1 and total - max(loads) > self.sync_cost:
+                if serial:
+                    schedule.append((False, tuple(serial)))
+                    serial = []
+                schedule.append((True, [tuple(n.calc_func for n in c) for c in chunks]))
+            else:
+                serial.extend(n.calc_func for n in level)
+        if serial:
+            schedule.append((False, tuple(serial)))
+        return schedule
+
+    def _run_schedule(self):
+        for parallel, tasks in self._schedule:
+            if parallel:
+                self._run_parallel(tasks)
+            else:
+                _run_all(tasks)
+
+    def _split(self, level, costs):
+        """Split level in n_threads chunks with similar cost (longest processing time first)."""
+        chunks = [[] for _ in range(self.n_threads)]
+        loads = [0.] * self.n_threads
+        for n in sorted(level, key=costs.get, reverse=True):
+            k = loads.index(min(loads))
+            chunks[k].append(n)
+            loads[k] += costs[n]
+        order = {n: i for i, n in enumerate(level)}
+        for c in chunks:
+            c.sort(key=order.get)
+        return chunks, loads
+
+
+class _PipeRegister:
+    """
+    Delay line of delay blocks, replacing an OutWire connected across pipeline stages.
+    Consumers read the oldest slot, push() overwrites it with the current data of the OutWire.
+    """
+
+    def __init__(self, out_wire, delay):
+        self.parent = out_wire.parent
+        self.out_wire = out_wire
+        data = out_wire.data()
+        self._is_array = isinstance(data, np.ndarray)
+        self._slots = [np.copy(data) if self._is_array else data for _ in range(delay)]
+        self._i = 0
+        self.silent = False  # the delayed data is not tracked, see Silence
+
+    def data(self):
+        return self._slots[self._i]
+
+    def push(self):
+        if self._is_array:
+            np.copyto(self._slots[self._i], self.out_wire.data())
+        else:
+            self._slots[self._i] = self.out_wire.data()
+        self._i += 1
+        if self._i == len(self._slots):
+            self._i = 0
+
+    def unplug(self, in_wire):
+        self.out_wire.unplug(in_wire)
+
+
+class PipelineExecutor(_ThreadedExecutor):
+    """
+    Split the sorted graph in n_stages stages, evaluated concurrently on n_stages threads.
+
+    Stage k processes block t - k while stage 0 processes block t, so the graph output is delayed by
+    up to n_stages - 1 blocks. The wires connecting two stages are replaced by delay lines of one block
+    per crossed stage, updated between blocks. After the calibration, the stages are contiguous ranges
+    of the sorted nodes with balanced measured cost.
+
+    This suits deep chains of effects, that cannot be parallelised by ParallelExecutor.
+    Nodes are Python objects sharing the interpreter, so stages run on threads, not processes.
+    """
+
+    def __init__(self, n_stages=2, calibration_blocks=16):
+        """
+        Parameters
+        ----------
+        n_stages : int
+            number of stages and threads, including the calling (audio) thread
+        calibration_blocks : int
+            number of blocks used for measuring the cost of the nodes
+        """
+        super().__init__(n_stages, calibration_blocks)
+        self._registers = []
+        self._rewired = []  # (InWire, original OutWire)
+        self._step = 0
+
+    def stages(self):
+        """Return the list of the stages (lists of Nodes), empty before the end of the calibration."""
+        if self._schedule is None:
+            return []
+        funcs = [set(s) for s in self._schedule]
+        return [[n for n in self._nodes if n.calc_func in f] for f in funcs]
+
+    def recalibrate(self):
+        self._restore_wires()
+        super().recalibrate()
+
+    def close(self):
+        super().close()
+        self._restore_wires()
+
+    def _make_schedule(self):
+        costs = self.costs()
+        nodes = self._nodes
+        stage_of = {}
+        schedule = []
+        for k, (start, end) in enumerate(partition_stages([costs[n] for n in nodes], self.n_threads)):
+            for n in nodes[start:end]:
+                stage_of[n] = k
+            schedule.append(tuple(n.calc_func for n in nodes[start:end]))
+
+        registers = {}
+        for n in nodes:
+            for iw in n.in_wires:
+                ow = iw.out_wire()
+                if ow is None or ow.parent not in stage_of:
+                    continue
+                delay = stage_of[n] - stage_of[ow.parent]
+                if delay > 0:
+                    if (ow, delay) not in registers:
+                        registers[(ow, delay)] = _PipeRegister(ow, delay)
+                    iw.set_out_wire(registers[(ow, delay)])
+                    self._rewired.append((iw, ow))
+        self._registers = list(registers.values())
+        self._step = 0
+        return schedule
+
+    def _run_schedule(self):
+        tasks = self._schedule
+        if self._step < self.n_threads - 1:  # filling the pipeline, stage k starts after k blocks
+            tasks = [t if k <= self._step else () for k, t in enumerate(tasks)]
+            self._step += 1
+
+        self._run_parallel(tasks)
+        for r in self._registers:
+            r.push()
+
+    def _restore_wires(self):
+        for iw, ow in self._rewired:
+            if isinstance(iw.out_wire(), _PipeRegister):
+                iw.set_out_wire(ow)
+        self._rewired = []
+        self._registers = []
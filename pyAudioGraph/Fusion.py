@@ -0,0 +1,247 @@
+"""
+Fusion of the trees of OpNodes built with OutWire operators, e.g. (a + b) * g - c (see World.set_op_fusion).
+
+An in-place OpNode (see Op) whose output feeds only another in-place OpNode is absorbed by it. Each tree is
+evaluated by a single FusedOpNode, at the position of its root, that runs the whole expression in one
+generated function and writes the result in the OutWire of the root.
+The absorbed OpNodes are not evaluated and their OutWires are not written.
+The fused trees are built by World.compile, so the plan must be rebuilt after changing their connections.
+"""
+
+import itertools
+import linecache
+import numpy as np
+from .AudioGraph import Node
+from .Wire import OpNode
+
+
+def _fusable(node):
+    return isinstance(node, OpNode) and node.in_place
+
+
+# ufuncs evaluated with Python floats in the control rate part of the expressions. maximum, minimum and clip keep
+# the ufuncs, that propagate NaN whatever the order of the operands, unlike max() and min()
+_SCALAR_EXPR = {
+    np.add: '({} + {})',
+    np.subtract: '({} - {})',
+    np.multiply: '({} * {})',
+    np.maximum: '_maximum({}, {})',
+    np.minimum: '_minimum({}, {})',
+    np.clip: '_minimum(_maximum({}, {}), {})',
+    np.negative: '(-{})',
+}
+
+_counter = itertools.count()  # numbers the generated sources, for their file names in the tracebacks
+
+
+class FusedOpNode(Node):
+    """
+    Evaluate a tree of in-place OpNodes as one Node of the plan.
+
+    * fused_nodes: the OpNodes of the tree, in evaluation order, the root last
+    * in_wires: the InWires of the tree connected outside of it
+    * out_wires: the OutWire of the root
+
+    The tree is compiled into a Python function calling the ufuncs one after the other, without the
+    per-node overhead of calc_func. Intermediate audio results go to scratch arrays reused along the tree.
+    In a World without batch, the control rate part of the expression (one value per block) is computed with
+    Python floats, in double precision, when made of add, subtract, multiply, maximum, minimum, clip and negative.
+    Buffers longer than chunk columns are evaluated chunk by chunk.
+
+    The arrays of the connected inputs, of the output and the scratch arrays are bound at the first evaluation,
+    after World.compile assigned the buffers: a block only reads the unconnected inputs, whose default data may
+    change.
+
+    Debugging: the generated function is in the attribute source, e.g. print(node.source), and is registered in
+    linecache under the file name '<FusedOpNode n>', so that tracebacks and pdb show its lines. To compare with the
+    OpNodes evaluated one by one, disable the fusion with World.set_op_fusion(False).
+    """
+
+    chunk = 65536  # columns evaluated at once, so that the scratch arrays of very long buffers stay in cache
+    max_depth = 32  # deeper trees are split, the generated code nests one level for each OpNode
+
+    def __init__(self, world, root, members):
+        """
+        Parameters
+        ----------
+        world : World
+        root : OpNode
+            the root of the tree
+        members : set of OpNode
+            the OpNodes of the tree, root included
+        """
+        super().__init__(world)
+        self.root = root
+        self.w_out = root.w_out
+        self.out_wires = [root.w_out]
+        self.fused_nodes = []
+
+        scalar_ok = world.batch_size == 1
+        namespace = {'_scalar': _scalar, '_maximum': np.maximum, '_minimum': np.minimum}
+        lines = []
+        self._temp_widths = []
+        free = {}  # width -> indices of scratch arrays no longer needed
+        self._leaves = []  # (InWire, connected OutWire or None) of each leaf
+
+        def name(value):
+            key = 'k%d' % len(namespace)
+            namespace[key] = value
+            return key
+
+        def visit(op):
+            """Emit the code of op, return (expression, kind, scratch array index or None)"""
+            args = [None] * len(op._args)
+            for k, c in enumerate(op._args):
+                if c is not None:
+                    args[k] = (c, 'const', None)
+            for k, iw in op._slots:
+                ow = iw.out_wire()
+                if ow is not None and ow.parent in members and ow.parent is not op:
+                    args[k] = visit(ow.parent)
+                else:
+                    args[k] = ('x%d' % len(self.in_wires), 'leaf', None)
+                    self.in_wires.append(iw)
+                    self._leaves.append((iw, ow))
+            self.fused_nodes.append(op)
+
+            width = op.w_out.data().shape[1]
+            if scalar_ok and width == 1 and op.fn in _SCALAR_EXPR:
+                operands = []
+                for expr, kind, _ in args:
+                    if kind == 'const':
+                        operands.append(repr(float(expr)))
+                    elif kind == 'leaf':
+                        operands.append('_scalar(%s)' % expr)
+                    elif kind == 'array':
+                        operands.append(expr + '.item()')
+                    else:
+                        operands.append(expr)
+                out = (_SCALAR_EXPR[op.fn].format(*operands), 'float', None)
+                if op is root:
+                    lines.append('out[0, 0] = ' + out[0])
+            else:
+                if op is root:
+                    t, target = None, 'out'
+                else:
+                    t = free[width].pop() if free.get(width) else None
+                    if t is None:
+                        t = len(self._temp_widths)
+                        self._temp_widths.append(width)
+                    target = 't%d' % t
+                operands = [name(expr) if kind == 'const' else expr for expr, kind, _ in args]
+                lines.append('%s(%s, out=%s)' % (name(op.fn), ', '.join(operands), target))
+                out = (target, 'array', t)
+            # released after choosing the target: ufuncs are faster on small arrays when out does not alias an input
+            for _, _, t in args:
+                if t is not None:
+                    free.setdefault(self._temp_widths[t], []).append(t)
+            return out
+
+        visit(root)
+
+        params = ['x%d' % j for j in range(len(self.in_wires))] + ['t%d' % t for t in range(len(self._temp_widths))]
+        source = 'def fused(%s):\n    ' % ', '.join(params + ['out']) + '\n    '.join(lines) + '\n'
+        filename = '<FusedOpNode %d>' % next(_counter)
+        linecache.cache[filename] = (len(source), None, source.splitlines(True), filename)
+        exec(compile(source, filename, 'exec'), namespace)
+        self.source = source
+        self._fn = namespace['fused']
+        self._allocate_temps()
+        self._call_args = None  # the arguments of _fn, bound by _bind
+        self._unconnected = [(j, iw.get_data) for j, (iw, ow) in enumerate(self._leaves) if ow is None]
+
+    def _allocate_temps(self):
+        rows = self.world.batch_size
+        self._temps = [np.zeros((rows, min(width, self.chunk)), dtype=np.float32) for width in self._temp_widths]
+
+    def is_pure(self):
+        return True
+
+    def _bind(self):
+        args = [None if ow is None else ow.data() for iw, ow in self._leaves]
+        self._call_args = args + self._temps + [self.w_out.buffer()]
+        if self.w_out.data().shape[1] <= self.chunk and not self._unconnected:
+            self._call_args = tuple(self._call_args)
+
+    def calc_func(self):
+        args = self._call_args
+        if args is None:
+            self._bind()
+            args = self._call_args
+        if type(args) is tuple:  # all the leaves are connected
+            self._fn(*args)
+            return
+
+        for j, get_data in self._unconnected:
+            args[j] = get_data()
+        out = args[-1]
+        width = out.shape[1]
+        if width <= self.chunk:
+            self._fn(*args)
+            return
+
+        n_leaves = len(self._leaves)
+        for start in range(0, width, self.chunk):
+            n = min(self.chunk, width - start)
+            self._fn(*[_columns(a, start, n) for a in args[:n_leaves]],
+                     *[t if t.shape[1] == 1 else t[:, :n] for t in self._temps],
+                     out[:, start:start + n])
+
+
+def _scalar(x):
+    """The value of a control leaf: wire data of shape (1, 1), or default data of an InWire."""
+    return x.item() if isinstance(x, np.ndarray) else float(x)
+
+
+def _columns(a, start, n):
+    """Columns start..start + n of a 2-dim buffer, scalars and single-column buffers are broadcast as they are."""
+    if getattr(a, 'ndim', 0) == 2 and a.shape[1] > 1:
+        return a[:, start:start + n]
+    return a
+
+
+def fuse_ops(nodes):
+    """
+    Replace each tree of in-place OpNodes with a FusedOpNode.
+
+    Parameters
+    ----------
+    nodes : list of Node
+        nodes in evaluation order, as returned by Group.compile
+
+    Returns
+    -------
+    out : list of Node
+        the nodes to be evaluated, in evaluation order
+    """
+    in_plan = set(nodes)
+    absorbed_by = {}  # OpNode -> the OpNode reading its output
+    depth = {}  # OpNode -> depth of the subtree absorbed so far
+    for n in nodes:
+        if not _fusable(n):
+            continue
+        depth[n] = depth.get(n, 0) + 1
+        consumers = n.w_out.in_wires()
+        if len(consumers) == 1 and consumers[0].parent in in_plan and _fusable(consumers[0].parent):
+            c = consumers[0].parent
+            if depth[n] < FusedOpNode.max_depth:
+                absorbed_by[n] = c
+                depth[c] = max(depth.get(c, 0), depth[n])
+
+    trees = {}  # root -> members
+    for n in nodes:
+        if n in absorbed_by:
+            root = absorbed_by[n]
+            while root in absorbed_by:
+                root = absorbed_by[root]
+            trees.setdefault(root, {root}).add(n)
+
+    out = []
+    for n in nodes:
+        if n in absorbed_by:
+            continue
+        if n in trees:
+            out.append(FusedOpNode(n.world, n, trees[n]))
+        else:
+            out.append(n)
+    return out
@@ -12,7 +12,7 @@ class MovingViterbi:
         self.l = RingList(self.size)
         self.cumscores = np.zeros(n_elem)
         self.cumscores_prev = np.zeros(n_elem)
-        self.backlinks = NPArrayFlexible(size, n_elem, dtype=np.int)
+        self.backlinks = NPArrayFlexible(size, n_elem, dtype=int)
         self.stability = stability
 
     def clear(self):
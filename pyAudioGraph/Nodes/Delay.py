@@ -1,4 +1,6 @@
 from .. import Node, RingBuffer, InWire, OutWire
+from ..SuperBlock import expand_control
+from ..Silence import SILENCE_LEVEL
 import numpy as np
 
 
@@ -8,23 +10,53 @@ class Delay(Node):
         super().__init__(world)
 
         self.samples = int(samples)
-        self.ringbuffer = RingBuffer(1, self.samples)
+        self.ringbuffer = RingBuffer(world.batch_size, self.samples)
         self.w_in = InWire(self)
         self.w_in_weight = InWire(self, weight)
         self.w_out = OutWire(self, world.buf_len)
-        self.out_temp = np.zeros((1, world.buf_len), dtype=np.float32)
         self.reset()
 
     def reset(self):
         self.ringbuffer.clear()
         self.ringbuffer.advance_write_index(self.samples)
+        self._quiet = 0  # number of the last output samples below SILENCE_LEVEL
+
+    def signal_in_wires(self):
+        return [self.w_in]
+
+    def tail_decayed(self):
+        # the delay line holds the last self.samples output samples
+        out = self.w_out.data()
+        if max(out.max(), -out.min()) < SILENCE_LEVEL:
+            self._quiet += out.shape[1]
+        else:
+            self._quiet = 0
+        return self._quiet >= self.samples
 
     def calc_func(self):
         buf_len = self.world.buf_len
         in_array = self.w_in.get_data()
         in_weight = self.w_in_weight.get_data()
-        self.ringbuffer.read(self.out_temp)
-        self.out_temp[:] = self.out_temp[:] * in_weight + in_array[:]
+        out = self.w_out.buffer()
+        self.ringbuffer.read(out)
+        out *= in_weight
+        out += in_array
         self.ringbuffer.advance_read_index(buf_len)
-        self.w_out.set_data(self.out_temp)
-        self.ringbuffer.write(self.out_temp)
+        self.ringbuffer.write(out)
+
+    def calc_func_batch(self, n_blocks):
+        length = n_blocks * self.world.buf_len
+        in_array = self.w_in.get_data()
+        in_weight = expand_control(self.w_in_weight.get_data(), self.world.buf_len)
+        out = self.w_out.buffer()
+
+        # the ring buffer holds self.samples samples: process chunks of at most that length
+        for start in range(0, length, self.samples):
+            end = min(start + self.samples, length)
+            chunk = out[:, start:end]
+            weight = in_weight if np.ndim(in_weight) == 0 else in_weight[:, start:end]
+            self.ringbuffer.read(chunk)
+            chunk *= weight
+            chunk += in_array[:, start:end]
+            self.ringbuffer.advance_read_index(end - start)
+            self.ringbuffer.write(chunk)
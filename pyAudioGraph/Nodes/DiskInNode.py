@@ -34,10 +34,14 @@ class DiskInNode(Node):
 
     def calc_func(self):
         self.rangeQueue.clear()
-        async = not self.world.nrt
-        self.baf.read(self.outBuffer, out_range_queue=self.rangeQueue, async=async)
+        asynchronous = not self.world.nrt
+        self.baf.read(self.outBuffer, out_range_queue=self.rangeQueue, asynchronous=asynchronous)
+        silent = self.rangeQueue.length == 0  # no frame of the stream: past its end, or not buffered in time
+        if silent:
+            self.outBuffer[:] = 0
         for i in range(self.nchannels):
             self.w_out[i].set_data(self.outBuffer[i])
+            self.w_out[i].silent = silent
         self.w_pos.set_data(self.baf.pos())
 
     def enable_loop(self, flag):
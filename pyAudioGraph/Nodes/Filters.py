@@ -1,6 +1,8 @@
 import numpy as np
 import scipy as sp
 from .. import Node, InWire, OutWire
+from ..SuperBlock import block_values
+from ..Silence import SILENCE_LEVEL
 
 
 def lowpass_coeff(Fs, f0, Q):
@@ -28,7 +30,41 @@ def lowpass_coeff(Fs, f0, Q):
     return b, a
 
 
+def biquad_rows(b, a, x, zi):
+    """
+    Filter each row of x with its own 2-poles filter (transposed direct form II, as scipy.signal.lfilter).
+    The loop runs on the samples, each step is vectorized on the rows.
+
+    Parameters
+    ----------
+    b, a : list of 3 ndarray of shape (rows, 1) or scalars
+        filter coefficients
+    x : ndarray of shape (rows, n)
+    zi : ndarray of shape (rows, 2)
+        initial conditions
+
+    Returns
+    -------
+    y, zf : ndarray of shape (rows, n), ndarray of shape (rows, 2)
+    """
+    a0 = a[0]
+    b0, b1, b2 = [np.reshape(b_ / a0, -1) for b_ in b]
+    a1, a2 = [np.reshape(a_ / a0, -1) for a_ in a[1:]]
+    z1, z2 = zi[:, 0], zi[:, 1]
+    y = np.empty(x.shape)
+    for n in range(x.shape[1]):
+        xn = x[:, n]
+        yn = b0 * xn + z1
+        z1 = b1 * xn - a1 * yn + z2
+        z2 = b2 * xn - a2 * yn
+        y[:, n] = yn
+    return y, np.stack([z1, z2], axis=1)
+
+
 class Lowpass(Node):
+    """
+    In a batched World (see World.batch_size) f0 and Q may carry one value for each row.
+    """
 
     def __init__(self, world, f0=400, Q=1):
         super().__init__(world)
@@ -42,17 +78,48 @@ class Lowpass(Node):
     def reset(self):
         len_a = len_b = 3
         len_zi = max(len_a, len_b) - 1  # see scipy.signal.lfilter docs
-        self.zi = np.zeros((len_zi,))  # initial condition for the filter
+        self.zi = np.zeros((self.world.batch_size, len_zi))  # initial condition for the filter, for each row
+
+    def signal_in_wires(self):
+        return [self.w_in]
+
+    def tail_decayed(self):
+        return np.abs(self.zi).max() < SILENCE_LEVEL
 
     def calc_func(self):
         # buf_len = self.world.buf_len
         Fs = self.world.sample_rate
-        f0 = self.w_f0.get_data()
-        Q = self.w_Q.get_data()
+        if self.world.batch_size == 1:  # Python floats are faster than 0-d arrays in lowpass_coeff
+            f0, Q = self.w_f0.get_value(), self.w_Q.get_value()
+        else:
+            f0, Q = self.w_f0.get_data(), self.w_Q.get_data()
         b, a = lowpass_coeff(Fs, f0, Q)
 
         in_array = self.w_in.get_data()
-        out_data, self.zi = sp.signal.lfilter(b, a, in_array[0, :], zi=self.zi)
+        out_data, self.zi = self._filter(b, a, in_array)
+        self.w_out.set_data(out_data)
+
+    def _filter(self, b, a, x):
+        if np.ndim(b[0]) == 0:  # same filter for all the rows
+            return sp.signal.lfilter(b, a, x, axis=1, zi=self.zi)
+        return biquad_rows(b, a, x, self.zi)
+
+    def calc_func_batch(self, n_blocks):
+        buf_len = self.world.buf_len
+        Fs = self.world.sample_rate
+        f0 = block_values(self.w_f0.get_data(), n_blocks)
+        Q = block_values(self.w_Q.get_data(), n_blocks)
+
+        in_array = self.w_in.get_data()
+        if np.all(f0 == f0[0]) and np.all(Q == Q[0]):  # one filter for the whole super-block
+            b, a = lowpass_coeff(Fs, f0[0], Q[0])
+            out_data, self.zi = self._filter(b, a, in_array)
+        else:
+            out_data = np.empty(in_array.shape)
+            for j in range(n_blocks):
+                b, a = lowpass_coeff(Fs, f0[j], Q[j])
+                s = slice(j * buf_len, (j + 1) * buf_len)
+                out_data[:, s], self.zi = self._filter(b, a, in_array[:, s])
         self.w_out.set_data(out_data)
 
 
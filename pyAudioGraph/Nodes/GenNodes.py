@@ -10,9 +10,14 @@ def ramp(start, length, slope):
 
 
 def phases_ramp(start_phase, length, start_freq, end_freq, sample_rate):
+    """
+    Phases of an oscillator with exponential frequency sweep.
+    Arguments may be scalars or ndarray of shape (rows, 1), the phases have shape (length,) or (rows, length)
+    """
     eps = 0.01
-    fr = np.logspace(np.log10(start_freq + eps), np.log10(end_freq + eps), num=length)
-    phase = start_phase + np.cumsum(fr / sample_rate * 2 * np.pi)
+    t = np.linspace(0, 1, length)
+    fr = (start_freq + eps) * ((end_freq + eps) / (start_freq + eps)) ** t  # geometric ramp, as np.logspace
+    phase = start_phase + np.cumsum(fr / sample_rate * 2 * np.pi, axis=-1)
     return phase
 
 
@@ -54,6 +59,8 @@ class AudioSlopeGen(SlopeGen):
 
     def __init__(self, world, initial_value=1, speed=.5):
         super().__init__(world, initial_value=initial_value, speed=speed, out_len=world.buf_len)
+        self._index = np.arange(world.buf_len, dtype=np.float64)
+        self._temp = np.zeros(world.buf_len)
 
     def calc_func(self):
         self._set_value(self.w_in.get_data())
@@ -61,7 +68,16 @@ class AudioSlopeGen(SlopeGen):
 
         buf_len = self.world.buf_len
         slope = (dest - self.v_temp) / buf_len
-        self.w_out.set_data(ramp(self.v_temp, buf_len, slope))
+        if np.ndim(dest) == 0 and buf_len > 1:
+            # ramp(self.v_temp, buf_len, slope) computed as np.linspace does, in preallocated buffers
+            stop = self.v_temp + buf_len * slope
+            temp = self._temp
+            np.multiply(self._index, (stop - self.v_temp) / (buf_len - 1), temp)
+            temp += self.v_temp
+            temp[-1] = stop
+            np.copyto(self.w_out.buffer(), temp, casting='unsafe')  # broadcast over the batch
+        else:
+            self.w_out.set_data(ramp(self.v_temp, buf_len, slope))
 
         self.v_temp = dest
 
@@ -90,15 +106,17 @@ class ControlSeqGen(Node):
         if(self.i == len(self.seq)):
             self.i = 0
 
+    def is_pure(self):
+        return len(self.seq) == 1
 
 
 class SignalOsc(Node):
 
-    def __init__(self, world, signal_fn):
+    def __init__(self, world, signal_fn, freq=400):
         super().__init__(world)
         self.signal_fn = signal_fn
 
-        self.w_freq = InWire(self, 400)
+        self.w_freq = InWire(self, freq)
         self.w_out = OutWire(self, world.buf_len)
         self.phase = 0
         self.prev_f = self.w_freq.get_data()
@@ -110,8 +128,11 @@ class SignalOsc(Node):
 
         # p = ramp(self.phase, buf_len, f / sr * 2 * np.pi)
         p = phases_ramp(self.phase, buf_len, self.prev_f, f, sr)
-        self.w_out.set_data(self.signal_fn(p))
-        self.phase = p[-1] + f / sr * 2 * np.pi
+        if isinstance(self.signal_fn, np.ufunc):
+            self.signal_fn(p, out=self.w_out.buffer())
+        else:
+            self.w_out.set_data(self.signal_fn(p))
+        self.phase = p[..., -1:] + f / sr * 2 * np.pi
         self.phase = np.mod(self.phase, 2 * np.pi)
 
         self.prev_f = f
@@ -146,11 +167,11 @@ class ControlSinOsc(ControlOsc):
 
 class SinOsc(SignalOsc):
 
-    def __init__(self, world):
-        super().__init__(world, np.sin)
+    def __init__(self, world, freq=400):
+        super().__init__(world, np.sin, freq=freq)
 
 
 class SawOsc(SignalOsc):
 
-    def __init__(self, world):
-        super().__init__(world, sp.signal.sawtooth)
+    def __init__(self, world, freq=400):
+        super().__init__(world, sp.signal.sawtooth, freq=freq)
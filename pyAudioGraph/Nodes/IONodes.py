@@ -1,5 +1,7 @@
+import numpy as np
 from ..AudioGraph import Node
 from .. import InWire, OutWire
+from ..SuperBlock import expand_control
 
 
 class OutNode(Node):
@@ -21,7 +23,12 @@ class OutNode(Node):
     def calc_func(self):
         level = self.w_level.get_data()
         for i in range(self.nchannels):
-            self.world.outBuffer[i, :] = self.w_in[i].get_data() * level
+            self.world.outBuffer[..., i, :] = self.w_in[i].get_data() * level
+
+    def calc_func_batch(self, n_blocks):
+        level = expand_control(self.w_level.get_data(), self.world.buf_len)
+        for i in range(self.nchannels):
+            self.world.outBuffer[..., i, :] = self.w_in[i].get_data() * level
 
 
 class InNode(Node):
@@ -44,4 +51,9 @@ class InNode(Node):
     def calc_func(self):
         level = self.w_level.get_data()
         for i in range(self.nchannels):
-            self.w_out[i].set_data(self.world.inBuffer[i, :] * level)
+            np.multiply(self.world.inBuffer[..., i, :], level, out=self.w_out[i].buffer())
+
+    def calc_func_batch(self, n_blocks):
+        level = expand_control(self.w_level.get_data(), self.world.buf_len)
+        for i in range(self.nchannels):
+            np.multiply(self.world.inBuffer[..., i, :], level, out=self.w_out[i].buffer())
@@ -1,6 +1,7 @@
 import itertools
 from ..AudioGraph import Node
 from .. import InWire, OutWire
+from ..SuperBlock import expand_control
 import numpy as np
 
 
@@ -14,6 +15,7 @@ class MixerNode(Node):
         """
         matrix is a matrix of shape nOutChannels x nInChannels
         -1 < matrix_ij < 1
+        in a batched World, each level may carry one value for each row
         """
         super().__init__(world)
 
@@ -22,19 +24,43 @@ class MixerNode(Node):
 
         self.w_in = [InWire(self) for i in range(ni)]
         self.w_out = [OutWire(self, world.buf_len) for o in range(no)]
-        self.temp_out = np.zeros((1, world.buf_len), dtype=np.float32)
+        self.temp = np.zeros((world.batch_size, world.buf_len), dtype=np.float32)
+        self.temp_batch = self.temp
         self.w_level = [[InWire(self, matrix[o, i])
                          for i in range(ni)] for o in range(no)]
 
+    def _mix(self, levels, temp, skip_silent=False):
+        """
+        Sum the inputs weighted by levels[o][i] directly in the buffer of each output.
+        With skip_silent the inputs flagged silent (see OutWire.silent) are not summed.
+        """
+        inputs = [(i, w_in_.get_data()) for i, w_in_ in enumerate(self.w_in)
+                  if not (skip_silent and w_in_.out_wire() is not None and w_in_.out_wire().silent)]
+        for o in range(self.nOutChannels):
+            out = self.w_out[o].buffer()
+            if not inputs:
+                out[:] = 0
+            for k, (i, in_array) in enumerate(inputs):
+                if k == 0:
+                    np.multiply(levels[o][i], in_array, out=out)
+                else:
+                    np.multiply(levels[o][i], in_array, out=temp)
+                    out += temp
+
     def calc_func(self):
-        ni, no = self.nInChannels, self.nOutChannels
-
-        for o in range(no):
-            self.temp_out[:] = 0
-            for i in range(ni):
-                in_array = self.w_in[i].get_data()
-                self.temp_out[0, :] += self.w_level[o][i].get_data() * in_array[0, :]
-            self.w_out[o].set_data(self.temp_out)
+        levels = [[w.get_data() for w in row] for row in self.w_level]
+        self._mix(levels, self.temp, skip_silent=self.world.detects_silence)
+
+    def signal_in_wires(self):
+        return self.w_in
+
+    def calc_func_batch(self, n_blocks):
+        buf_len = self.world.buf_len
+        if self.temp_batch.shape[1] != n_blocks * buf_len:
+            self.temp_batch = np.zeros((self.world.batch_size, n_blocks * buf_len), dtype=np.float32)
+
+        levels = [[expand_control(w.get_data(), buf_len) for w in row] for row in self.w_level]
+        self._mix(levels, self.temp_batch)
 
 
 class MonizerNode(MixerNode):
@@ -20,7 +20,7 @@ class ControlRateRecorder(Node):
 
     def calc_func(self):
         for i in range(self.nchannels):
-            in_scalar = self.w_in[i].get_data()
+            in_scalar = self.w_in[i].get_value()
             self.data[i][self.count] = in_scalar
         self.count += 1
 
@@ -68,6 +68,19 @@ class AudioRateRecorder(Node):
         if(self.count * b == self.size):
             self.extend()
 
+    def calc_func_batch(self, n_blocks):
+        b = self.world.buf_len
+        c = self.count
+        while((c + n_blocks) * b > self.size):
+            self.extend()
+        for i in range(self.nchannels):
+            in_array = self.w_in[i].get_data()
+            self.data[i][c * b:(c + n_blocks) * b] = in_array
+        self.count += n_blocks
+
+        if(self.count * b == self.size):
+            self.extend()
+
     def extend(self):
         new_size = self.size * 2
         for i in range(self.nchannels):
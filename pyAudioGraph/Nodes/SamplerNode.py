@@ -28,8 +28,8 @@ class SamplerNode(Node):
         self.w_out = [OutWire(self, world.buf_len) for _ in range(nout)]
         self.w_trigger_list = ObjInWire(self)
 
-        self.temp_out = np.zeros((nout, world.buf_len), dtype=np.float32)
         self.trigger_list = []
+        self._playing = 0  # samples left to play from the current write index
 
     def add_buffer(self, buf):
         assert(buf.shape[0] == self.nchannels)
@@ -41,6 +41,7 @@ class SamplerNode(Node):
 
     def reset(self):
         self.ringBuffer.clear()
+        self._playing = 0  # samples left to play from the current write index
 
     def calc_func(self):
 
@@ -51,16 +52,24 @@ class SamplerNode(Node):
         if(nb == 0):
             for o in range(no):
                 self.w_out[o].set_data(0)
+                self.w_out[o].silent = True
             return
 
         trigger_list = self.w_trigger_list.get_data()
         for t_id, t_pos, t_sc in trigger_list:
             if(t_id < nb):
                 self.ringBuffer.accumulate(self.buffers[t_id], offset=t_pos, in_scale=t_sc)
+                self._playing = max(self._playing, t_pos + self.buffers[t_id].shape[1])
+
+        silent = self._playing <= 0
+        self._playing = max(self._playing - self.world.buf_len, 0)
+        for w_out_ in self.w_out:
+            w_out_.silent = silent
+        if silent:  # the ring buffer holds only zeros, there is no need to move through it
+            for w_out_ in self.w_out:
+                w_out_.buffer().fill(0)
+            return
 
         self.ringBuffer.advance_write_index(self.world.buf_len)
-        self.ringBuffer.read(self.temp_out)
+        self.ringBuffer.read([w_out_.buffer() for w_out_ in self.w_out])
         self.ringBuffer.advance_read_index(self.world.buf_len)
-
-        for o in range(no):
-            self.w_out[o].set_data(self.temp_out[o, :])
@@ -29,7 +29,7 @@ class NPArrayFlexible:
 
     """
 
-    def __init__(self, n_rows=5, capacity=2048, dtype=np.int):
+    def __init__(self, n_rows=5, capacity=2048, dtype=int):
         """
         Create a NPArrayFlexible.
 
@@ -48,8 +48,8 @@ class NPArrayFlexible:
         self.xn = 0
 
         self._rows_capacity = n_rows
-        self.xr = np.zeros(n_rows, dtype=np.int)
-        self.xr_count = np.zeros(n_rows, dtype=np.int)
+        self.xr = np.zeros(n_rows, dtype=int)
+        self.xr_count = np.zeros(n_rows, dtype=int)
         self.xrn = 0
 
     def clear(self):
@@ -0,0 +1,243 @@
+"""
+Profiler of the audio callback: wall time of each calc_func and of each block (see World.set_profiling).
+
+The times are counted in log-scale histograms allocated when a Node is first seen, so the evaluation of a block
+only increments integers. Bins are 8 per octave of nanoseconds: the percentiles are within 1/8 of the true value.
+The histograms are written only by the thread evaluating the graph, and read without locks: a snapshot taken
+from another thread may be one block behind for some nodes.
+"""
+
+import time
+import numpy as np
+from .AudioGraph import Group
+
+N_BINS = 320  # 8 bins per octave, up to 2 ** 40 ns (18 minutes)
+
+
+def _bin(ns):
+    """The histogram bin of a duration in ns: exact below 16 ns, then the 4 most significant bits."""
+    if ns < 16:
+        return ns
+    shift = ns.bit_length() - 4
+    return min(shift * 8 + (ns >> shift), N_BINS - 1)
+
+
+def _bin_start(b):
+    """The smallest duration in ns falling in bin b."""
+    if b < 16:
+        return b
+    shift = b // 8 - 1
+    return (b % 8 + 8) << shift
+
+
+def percentile(hist, q):
+    """
+    Return the q-th percentile of the durations counted in a histogram.
+
+    Parameters
+    ----------
+    hist : sequence of int, N_BINS counts
+    q : float, 0 <= q <= 100
+
+    Returns
+    -------
+    out : float
+        the middle of the bin of the percentile, in seconds (0 for an empty histogram)
+    """
+    cum = np.cumsum(hist)
+    if cum[-1] == 0:
+        return 0.
+    b = int(np.searchsorted(cum, q / 100 * cum[-1]))
+    return (_bin_start(b) + _bin_start(b + 1)) / 2 * 1e-9
+
+
+class NodeStats:
+    """
+    Times of a Node, or of the Nodes of a class, in seconds: calls, total, mean, p50, p99 and max.
+    The histogram is in hist.
+    """
+
+    def __init__(self, name, hist, total_ns, max_ns, node=None):
+        self.name = name
+        self.node = node
+        self.hist = hist
+        self.calls = int(np.sum(hist))
+        self.total = total_ns * 1e-9
+        self.mean = self.total / self.calls if self.calls else 0.
+        self.p50 = percentile(hist, 50)
+        self.p99 = percentile(hist, 99)
+        self.max = max_ns * 1e-9
+
+
+class Profile:
+    """
+    A snapshot of the Profiler.
+
+    * blocks: NodeStats of the evaluation of the whole blocks
+    * deadline: buf_len / sample_rate, the time available for a block in real time
+    * dsp_load: dict with the mean, p50, p99 and max time of a block, as fractions of the deadline
+    * nodes: list of NodeStats, one for each Node evaluated
+    """
+
+    def __init__(self, blocks, deadline, nodes):
+        self.blocks = blocks
+        self.deadline = deadline
+        self.nodes = nodes
+        self.dsp_load = {key: getattr(blocks, key) / deadline for key in ('mean', 'p50', 'p99', 'max')}
+
+    def hotspots(self, n=10):
+        """Return the NodeStats of the n Nodes with the largest total time."""
+        return sorted(self.nodes, key=lambda s: s.total, reverse=True)[:n]
+
+    def by_class(self):
+        """Return a NodeStats for each class of Node, merging the histograms of its Nodes, by total time."""
+        groups = {}
+        for s in self.nodes:
+            groups.setdefault(s.name, []).append(s)
+        out = [NodeStats(name, np.sum([s.hist for s in group], axis=0),
+                         sum(s.total for s in group) * 1e9, max(s.max for s in group) * 1e9)
+               for name, group in groups.items()]
+        return sorted(out, key=lambda s: s.total, reverse=True)
+
+    def report(self, n=10):
+        """Return a text table of the DSP load and of the n hottest classes of Node."""
+        lines = ['DSP load: mean %.1f%%, p50 %.1f%%, p99 %.1f%%, max %.1f%% of %.2f ms, %d blocks' % (
+            100 * self.dsp_load['mean'], 100 * self.dsp_load['p50'], 100 * self.dsp_load['p99'],
+            100 * self.dsp_load['max'], 1e3 * self.deadline, self.blocks.calls)]
+        lines.append('%-24s %8s %10s %10s %10s %10s %10s' % ('class', 'calls', 'total ms', 'mean us', 'p50 us',
+                                                              'p99 us', 'max us'))
+        for s in self.by_class()[:n]:
+            lines.append('%-24s %8d %10.2f %10.2f %10.2f %10.2f %10.2f' % (
+                s.name[:24], s.calls, 1e3 * s.total, 1e6 * s.mean, 1e6 * s.p50, 1e6 * s.p99, 1e6 * s.max))
+        return '\n'.join(lines)
+
+
+class Profiler:
+    """
+    Evaluate the plan of a World, or the Nodes of a Group, measuring each calc_func with time.perf_counter_ns.
+
+    The wrappers of the plan (e.g. the sleeping Nodes of Silence, the tracked Nodes of ChangeTracking) are
+    reported under the class of the wrapped Node, their node attribute.
+
+    The Nodes evaluated by a Group are timed on their own (see run_nodes), so the time of a Group is its own
+    overhead, without the time of its Nodes: the times of all the Nodes add up to the time of the blocks.
+    """
+
+    def __init__(self, world):
+        self.world = world
+        self._index = {}  # Node -> slot
+        self._nodes = []
+        self._hists = []  # for each slot, a list of N_BINS counts
+        self._totals = []  # for each slot, total ns
+        self._maxs = []  # for each slot, max ns
+        self._block_hist = [0] * N_BINS
+        self._block_total = 0
+        self._block_max = 0
+        self._nested = 0  # ns recorded by run_nodes, subtracted from the time of the Groups
+
+    def _slot(self, node):
+        k = self._index.get(node)
+        if k is None:
+            k = self._index[node] = len(self._nodes)
+            self._nodes.append(node)
+            self._hists.append([0] * N_BINS)
+            self._totals.append(0)
+            self._maxs.append(0)
+        return k
+
+    def prepare(self, plan):
+        """
+        Allocate the histograms of the Nodes of a plan.
+
+        Parameters
+        ----------
+        plan : sequence of bound calc_func
+
+        Returns
+        -------
+        out : tuple of (calc_func, slot, is a Group)
+            the plan, as evaluated by run
+        """
+        out = []
+        for f in plan:
+            node = getattr(f, '__self__', f)
+            out.append((f, self._slot(node), isinstance(getattr(node, 'node', node), Group)))
+        return tuple(out)
+
+    def run(self, plan):
+        """Evaluate a plan prepared by prepare, recording the time of each Node and of the block."""
+        clock = time.perf_counter_ns
+        hists, totals, maxs = self._hists, self._totals, self._maxs
+        t0 = t = clock()
+        for calc_func, k, is_group in plan:
+            if is_group:
+                nested = self._nested
+                calc_func()
+                t1 = clock()
+                ns = t1 - t - (self._nested - nested)
+            else:
+                calc_func()
+                t1 = clock()
+                ns = t1 - t
+            if ns < 16:  # _bin, inlined
+                b = ns
+            else:
+                shift = ns.bit_length() - 4
+                b = shift * 8 + (ns >> shift)
+                if b >= N_BINS:
+                    b = N_BINS - 1
+            hists[k][b] += 1
+            totals[k] += ns
+            if ns > maxs[k]:
+                maxs[k] = ns
+            t = t1
+        ns = t - t0
+        self._block_hist[_bin(ns)] += 1
+        self._block_total += ns
+        if ns > self._block_max:
+            self._block_max = ns
+
+    def run_nodes(self, nodes):
+        """Evaluate nodes, as Group.calc_func, recording the time of each one, nested Groups excluded."""
+        clock = time.perf_counter_ns
+        index = self._index
+        t = clock()
+        for n in nodes:
+            nested = self._nested
+            n.calc_func()
+            t1 = clock()
+            ns = t1 - t - (self._nested - nested)
+            self._nested += ns
+            k = index.get(n)
+            if k is None:
+                k = self._slot(n)
+            self._hists[k][_bin(ns)] += 1
+            self._totals[k] += ns
+            if ns > self._maxs[k]:
+                self._maxs[k] = ns
+            t = t1
+
+    def reset(self):
+        """Clear all the counts."""
+        for k in range(len(self._nodes)):
+            self._hists[k][:] = [0] * N_BINS
+            self._totals[k] = self._maxs[k] = 0
+        self._block_hist[:] = [0] * N_BINS
+        self._block_total = self._block_max = 0
+
+    def snapshot(self):
+        """
+        Returns
+        -------
+        out : Profile
+            the statistics collected since the creation or the last reset
+        """
+        nodes = []
+        for k, n in enumerate(list(self._nodes)):
+            inner = getattr(n, 'node', n)
+            hist = np.array(self._hists[k], dtype=np.int64)
+            if hist.any():
+                nodes.append(NodeStats(type(inner).__name__, hist, self._totals[k], self._maxs[k], node=inner))
+        blocks = NodeStats('block', np.array(self._block_hist, dtype=np.int64), self._block_total, self._block_max)
+        deadline = self.world.buf_len / self.world.sample_rate
+        return Profile(blocks, deadline, nodes)
@@ -0,0 +1,67 @@
+"""
+Simplification of the compiled node list (see World.set_graph_pruning).
+
+* live_nodes: removes the Nodes whose outputs cannot reach a sink
+* fold_constants: evaluates once the pure Nodes whose inputs are all constant
+
+A sink is a Node without OutWires, as OutNode or the recorders: it is evaluated for its side effects.
+A pure Node (see Node.is_pure) computes its outputs only from its inputs, so its outputs are constant when its
+inputs are unconnected (default data) or connected to constant Nodes.
+"""
+
+from .AudioGraph import node_parents
+
+
+def live_nodes(nodes):
+    """
+    Remove the Nodes that are neither sinks nor ancestors of a sink.
+
+    Parameters
+    ----------
+    nodes : list of Node
+        nodes in evaluation order, as returned by Group.compile
+
+    Returns
+    -------
+    out : list of Node
+        the live nodes, in evaluation order
+    """
+    in_plan = set(nodes)
+    live = set()
+    stack = [n for n in nodes if not n.out_wires]
+    while stack:
+        n = stack.pop()
+        if n in live:
+            continue
+        live.add(n)
+        stack.extend(p for p in node_parents(n) if p in in_plan)
+    return [n for n in nodes if n in live]
+
+
+def fold_constants(nodes):
+    """
+    Evaluate the constant Nodes once, their OutWires keep the result.
+
+    The default data of the InWires of the constant Nodes must not change afterwards,
+    or the plan must be rebuilt (see World.compile).
+
+    Parameters
+    ----------
+    nodes : list of Node
+        nodes in evaluation order, as returned by Group.compile
+
+    Returns
+    -------
+    out : list of Node
+        the constant nodes, already evaluated, in evaluation order
+    """
+    constant = set()
+    out = []
+    for n in nodes:
+        if not n.is_pure() or not n.out_wires:
+            continue
+        if all(iw.out_wire() is None or iw.out_wire().parent in constant for iw in n.in_wires):
+            n.calc_func()
+            constant.add(n)
+            out.append(n)
+    return out
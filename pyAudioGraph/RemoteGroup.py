@@ -0,0 +1,192 @@
+"""
+RemoteGroup runs a subgraph in a child process, connected to the graph through shared memory wires.
+It needs Python 3.8 (multiprocessing.shared_memory), imported when a RemoteGroup is created.
+"""
+
+import multiprocessing
+import numpy as np
+from .AudioGraph import Node
+from .Wire import InWire, OutWire
+
+_STOP, _NRT, _HEADER_LEN = 0, 1, 2  # control values at the head of the input shared memory
+
+
+def _shared_views(shm, lens, offset=0):
+    views = []
+    for length in lens:
+        views.append(np.ndarray((1, length), dtype=np.float32, buffer=shm.buf, offset=offset * 4))
+        offset += length
+    return views
+
+
+class _SharedInNode(Node):
+    """Exposes the input shared memory as OutWires, in the child process"""
+
+    def __init__(self, world, views):
+        super().__init__(world)
+        self.w_out = [OutWire(self, v.shape[1]) for v in views]
+        for w_out, v in zip(self.w_out, views):
+            w_out._data = v  # the data is written by the parent process
+
+    def calc_func(self):
+        pass
+
+
+class _SharedOutNode(Node):
+    """Copies its InWires to the output shared memory, in the child process"""
+
+    def __init__(self, world, views):
+        super().__init__(world)
+        self.views = views
+        self.w_in = [InWire(self) for _ in views]
+
+    def calc_func(self):
+        for w_in, v in zip(self.w_in, self.views):
+            data = w_in.get_data()
+            if data is not None:
+                v[:] = data
+
+
+def _remote_main(factory, world_args, in_name, in_lens, out_name, out_lens, start, done):
+    from multiprocessing import shared_memory
+    from .World import World
+
+    shm_in = shared_memory.SharedMemory(name=in_name)
+    shm_out = shared_memory.SharedMemory(name=out_name)
+    header = np.ndarray((_HEADER_LEN,), dtype=np.float32, buffer=shm_in.buf)
+
+    world = World(*world_args)
+    in_wires, out_wires = factory(world)
+    src = _SharedInNode(world, _shared_views(shm_in, in_lens, _HEADER_LEN))
+    sink = _SharedOutNode(world, _shared_views(shm_out, out_lens))
+    for ow, iw in zip(src.w_out, in_wires):
+        ow.plug_into(iw)
+    for ow, iw in zip(out_wires, sink.w_in):
+        ow.plug_into(iw)
+    world.append(sink)
+    world.sort()
+    world._isRunning = True
+    done.release()  # ready
+
+    while True:
+        start.acquire()
+        if header[_STOP]:
+            break
+        world.nrt = bool(header[_NRT])
+        world._process_block()
+        done.release()
+
+    del header, src, sink, world
+    shm_in.close()
+    shm_out.close()
+
+
+class RemoteGroup(Node):
+    """
+    A subgraph evaluated in a child process, so that pure-Python nodes can use another core.
+
+    The subgraph is built in the child process by factory(world), that returns the lists of the InWires and the
+    OutWires to expose. The exposed wires are connected to w_in and w_out of the RemoteGroup through buffers in
+    shared memory, and the two processes are synchronised once per block with a pair of semaphores.
+
+    With latency=1 the child evaluates block t while the parent graph continues, and w_out carries block t - 1.
+    With latency=0 calc_func waits for the child, which is useful only when other threads keep the parent busy.
+
+    close() stops the child and releases the shared memory, World.dispose closes the RemoteGroups of the world.
+
+    Example:
+        def make_voice(world):
+            lp = ag.Nodes.Lowpass(world)
+            return [lp.w_in], [lp.w_out]
+
+        voice = RemoteGroup(world, make_voice, in_lens=[world.buf_len], out_lens=[world.buf_len])
+        disk_in.w_out[0].plug_into(voice.w_in[0])
+    """
+
+    def __init__(self, world, factory, in_lens, out_lens, latency=1, timeout=5.):
+        """
+        Parameters
+        ----------
+        world : World
+        factory : callable factory(world) -> (list of InWire, list of OutWire)
+            builds the subgraph in the child process, must be picklable
+        in_lens : list of int
+            buffer length of the exposed InWires (world.buf_len for audio, 1 for control)
+        out_lens : list of int
+            buffer length of the exposed OutWires
+        latency : int
+            0 or 1, blocks of delay between w_in and w_out
+        timeout : float
+            seconds to wait for the child before raising RuntimeError
+        """
+        from multiprocessing import shared_memory
+
+        super().__init__(world)
+        assert(latency in (0, 1))
+        self.latency = latency
+        self.timeout = timeout
+
+        self.w_in = [InWire(self) for _ in in_lens]
+        self.w_out = [OutWire(self, length) for length in out_lens]
+
+        self._shm_in = shared_memory.SharedMemory(create=True, size=4 * (_HEADER_LEN + sum(in_lens)))
+        self._shm_out = shared_memory.SharedMemory(create=True, size=4 * max(sum(out_lens), 1))
+        self._header = np.ndarray((_HEADER_LEN,), dtype=np.float32, buffer=self._shm_in.buf)
+        self._header[:] = 0
+        self._in_views = _shared_views(self._shm_in, in_lens, _HEADER_LEN)
+        self._out_views = _shared_views(self._shm_out, out_lens)
+
+        self._start = multiprocessing.Semaphore(0)
+        self._done = multiprocessing.Semaphore(0)
+        self._pending = False
+        self._process = multiprocessing.Process(
+            target=_remote_main,
+            args=(factory, (world.buf_len, world.sample_rate, world.nchannels),
+                  self._shm_in.name, list(in_lens), self._shm_out.name, list(out_lens), self._start, self._done),
+            daemon=True)
+        self._process.start()
+        self._closed = False
+        world._remote_groups.append(self)
+        self._wait()  # ready
+
+    def calc_func(self):
+        if self.latency == 1 and self._pending:
+            self._wait()
+            self._read_outputs()
+
+        self._header[_NRT] = self.world.nrt
+        for w_in, v in zip(self.w_in, self._in_views):
+            data = w_in.get_data()
+            if data is not None:
+                v[:] = data
+        self._start.release()
+        self._pending = True
+
+        if self.latency == 0:
+            self._wait()
+            self._read_outputs()
+
+    def close(self):
+        """Stop the child process and release the shared memory. Does nothing if already closed."""
+        if self._closed:
+            return
+        self._closed = True
+        if self._process.is_alive():
+            if self._pending:
+                self._done.acquire(timeout=self.timeout)
+            self._header[_STOP] = 1
+            self._start.release()
+            self._process.join(self.timeout)
+        del self._header, self._in_views, self._out_views
+        for shm in (self._shm_in, self._shm_out):
+            shm.close()
+            shm.unlink()
+
+    def _wait(self):
+        if not self._done.acquire(timeout=self.timeout):
+            raise RuntimeError("RemoteGroup: the child process is not responding")
+        self._pending = False
+
+    def _read_outputs(self):
+        for w_out, v in zip(self.w_out, self._out_views):
+            w_out.set_data(v)
@@ -0,0 +1,96 @@
+"""
+Silence detection and sleeping of the Nodes that give silence out of silence (see World.set_silence_detection).
+
+An OutWire is flagged silent (OutWire.silent) when its data is known to be all zeros: the sources set the flag
+cheaply from their state (e.g. a SamplerNode without playing samples, a DiskInNode past the end of the file),
+and so do the sleeping Nodes. A Node declaring its signal inputs (see Node.signal_in_wires), as filters, delays and
+mixers, falls asleep when they are all silent and its tail has decayed (see Node.tail_decayed): it is reset and
+no longer evaluated, its outputs are zeros and flagged silent until one of its signal inputs wakes up.
+So the work of a large mix follows the active voices, not the number of Nodes.
+"""
+
+from .AudioGraph import Node
+from .Wire import OutWire
+
+SILENCE_LEVEL = 1e-6  # -120 dB, below this level a tail is considered decayed
+
+
+def _silent_default(iw):
+    data = iw.get_data()
+    return data is None or (getattr(data, 'size', 1) == 1 and float(data) == 0)
+
+
+class _SleepingNode(Node):
+    """
+    Replaces node in the plan: evaluates it while one of its signal inputs is not silent, or its tail did not decay.
+    """
+
+    def __init__(self, node):
+        super().__init__(node.world)
+        self.node = node
+        self._calc_func = node.calc_func
+        self._signals = [iw.out_wire() for iw in node.signal_in_wires() if iw.out_wire() is not None]
+        self._outputs = [ow for ow in dict.fromkeys(node.out_wires) if type(ow) is OutWire]
+        self._reset = getattr(node, 'reset', None)
+        self.asleep = False
+        self.n_slept = 0
+
+    def calc_func(self):
+        silent = True
+        for ow in self._signals:
+            if not ow.silent:
+                silent = False
+                break
+
+        if self.asleep:
+            if silent:
+                self.n_slept += 1
+                for ow in self._outputs:
+                    ow.buffer().fill(0)
+                return
+            self.asleep = False
+            for ow in self._outputs:
+                ow.silent = False
+
+        self._calc_func()
+        if self.node.tail_decayed() and silent:
+            self.asleep = True
+            if self._reset is not None:
+                self._reset()
+            for ow in self._outputs:
+                ow.buffer().fill(0)
+                ow.silent = True
+
+
+def sleep_on_silence(nodes):
+    """
+    Wrap the Nodes declaring their signal inputs, so that they sleep while these are silent.
+
+    A Node is wrapped if all its unconnected signal InWires have default data None or 0.
+
+    Parameters
+    ----------
+    nodes : list of Node
+        nodes in evaluation order, as returned by Group.compile or Fusion.fuse_ops
+
+    Returns
+    -------
+    out : list of Node
+        the nodes to be evaluated, in evaluation order
+    """
+    out = []
+    for n in nodes:
+        signals = n.signal_in_wires()
+        if signals is not None and all(iw.out_wire() is not None or _silent_default(iw) for iw in signals):
+            out.append(_SleepingNode(n))
+        else:
+            out.append(n)
+    return out
+
+
+def wake_nodes(nodes):
+    """Clear the silent flag of the outputs of the wrapped nodes, as returned by sleep_on_silence."""
+    for n in nodes:
+        if isinstance(n, _SleepingNode):
+            for ow in n._outputs:
+                ow.silent = False
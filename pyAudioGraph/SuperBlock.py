@@ -0,0 +1,174 @@
+"""
+Super-block evaluation for non-real-time rendering: the graph processes n_blocks blocks at once.
+
+Nodes opt in by implementing calc_func_batch(n_blocks). Within calc_func_batch the wires carry n_blocks
+blocks: audio wires have shape (1, n_blocks * buf_len), control wires have shape (1, n_blocks) with one value
+per block, world.inBuffer and world.outBuffer have shape (nchannels, n_blocks * buf_len).
+The other nodes are evaluated block by block, through views of the same buffers.
+"""
+
+import numpy as np
+from .Wire import ObjOutWire
+
+
+def block_values(data, n_blocks):
+    """
+    Return the n_blocks values of a control InWire within calc_func_batch.
+
+    Parameters
+    ----------
+    data : scalar or ndarray of shape (1, n_blocks)
+        the result of InWire.get_data()
+
+    Returns
+    -------
+    out : ndarray of shape (n_blocks,)
+    """
+    return np.broadcast_to(np.asarray(data).reshape(-1), (n_blocks,))
+
+
+def expand_control(data, buf_len):
+    """
+    Expand the values of a control InWire within calc_func_batch to one value per sample.
+
+    Parameters
+    ----------
+    data : scalar or ndarray of shape (1, n_blocks)
+        the result of InWire.get_data()
+    buf_len : int
+        the block length
+
+    Returns
+    -------
+    out : scalar or ndarray of shape (1, n_blocks * buf_len)
+        broadcastable against the audio buffers of the super-block
+    """
+    if np.ndim(data) == 0:
+        return data
+    return np.repeat(data, buf_len, axis=1)
+
+
+class _SuperBuffer:
+    """Storage of one wire (or world buffer) for n_blocks blocks, with a view for each block."""
+
+    def __init__(self, orig, n_blocks):
+        self.orig = orig
+        self.full = np.zeros((orig.shape[0], orig.shape[1] * n_blocks), dtype=orig.dtype)
+        length = orig.shape[1]
+        self.views = [self.full[:, j * length:(j + 1) * length] for j in range(n_blocks)]
+
+
+class SuperBlockRunner:
+    """
+    Evaluate a list of sorted nodes n_blocks blocks at a time.
+
+    The nodes are split in segments of consecutive nodes, either all implementing calc_func_batch or none.
+    Batched segments are called once per super-block. The other segments are evaluated block by block.
+    Only the wires crossing segments (or connected to a batched node) are given a super-block buffer.
+    The wires internal to a non batched segment keep their buffer.
+    """
+
+    def __init__(self, world, nodes, n_blocks):
+        """
+        Parameters
+        ----------
+        world : World
+        nodes : list of Node
+            nodes in topological order, as returned by Group.compile
+        n_blocks : int
+            number of blocks of a super-block
+        """
+        assert(world.batch_size == 1)  # batched worlds are not supported
+        self.world = world
+        self.n_blocks = n_blocks
+
+        segments = []
+        for n in nodes:
+            batched = getattr(n, 'calc_func_batch', None) is not None
+            if segments and segments[-1][0] == batched:
+                segments[-1][1].append(n)
+            else:
+                segments.append((batched, [n]))
+        seg_of = {n: k for k, (_, seg) in enumerate(segments) for n in seg}
+
+        self._wires = {}  # OutWire -> _SuperBuffer
+        self._objs = {}  # ObjOutWire -> list of the data of each block
+        seg_wires = [[] for _ in segments]
+        seg_objs_in = [[] for _ in segments]
+        seg_objs_out = [[] for _ in segments]
+        for n in nodes:
+            k = seg_of[n]
+            for ow in dict.fromkeys(n.out_wires):
+                consumers = set(seg_of.get(iw.parent) for iw in ow.in_wires())
+                crossing = bool(consumers - {k})
+                if isinstance(ow, ObjOutWire):
+                    if crossing:
+                        self._objs[ow] = [None] * n_blocks
+                        seg_objs_out[k].append(ow)
+                        for c in consumers - {k, None}:
+                            seg_objs_in[c].append(ow)
+                    continue
+                if not (crossing or segments[k][0] or any(segments[c][0] for c in consumers if c is not None)):
+                    continue
+                self._wires[ow] = _SuperBuffer(ow.data(), n_blocks)
+                for c in consumers | {k}:
+                    if c is not None:
+                        seg_wires[c].append(ow)
+
+        self._world_buffers = (_SuperBuffer(world.inBuffer, n_blocks), _SuperBuffer(world.outBuffer, n_blocks))
+
+        self._segments = []
+        for k, (batched, seg) in enumerate(segments):
+            wires = [(ow, self._wires[ow]) for ow in dict.fromkeys(seg_wires[k])]
+            if batched:
+                funcs = tuple(n.calc_func_batch for n in seg)
+            else:
+                funcs = tuple(n.calc_func for n in seg)
+            self._segments.append((batched, funcs, wires,
+                                   [(ow, self._objs[ow]) for ow in seg_objs_in[k]],
+                                   [(ow, self._objs[ow]) for ow in seg_objs_out[k]]))
+
+    def out_buffer(self):
+        """Return the output of the last super-block, ndarray of shape (nchannels, n_blocks * buf_len)."""
+        return self._world_buffers[1].full
+
+    def in_buffer(self):
+        """Return the input of the next super-block, to be filled before run()."""
+        return self._world_buffers[0].full
+
+    def run(self):
+        """Evaluate n_blocks blocks."""
+        world = self.world
+        n_blocks = self.n_blocks
+        in_buf, out_buf = self._world_buffers
+        for batched, funcs, wires, objs_in, objs_out in self._segments:
+            if batched:
+                for ow, sb in wires:
+                    ow._data = sb.full
+                world.inBuffer, world.outBuffer = in_buf.full, out_buf.full
+                for calc_func_batch in funcs:
+                    calc_func_batch(n_blocks)
+                continue
+
+            for j in range(n_blocks):
+                for ow, sb in wires:
+                    ow._data = sb.views[j]
+                for ow, slots in objs_in:
+                    ow._data = slots[j]
+                world.inBuffer, world.outBuffer = in_buf.views[j], out_buf.views[j]
+                for calc_func in funcs:
+                    calc_func()
+                for ow, slots in objs_out:
+                    slots[j] = ow._data
+
+    def close(self):
+        """Restore the original buffers, with the data of the last block."""
+        for ow, sb in self._wires.items():
+            np.copyto(sb.orig, sb.views[-1])
+            ow._data = sb.orig
+        for ow, slots in self._objs.items():
+            ow._data = slots[-1]
+        in_buf, out_buf = self._world_buffers
+        for sb in self._world_buffers:
+            np.copyto(sb.orig, sb.views[-1])
+        self.world.inBuffer, self.world.outBuffer = in_buf.orig, out_buf.orig
@@ -0,0 +1,170 @@
+"""
+Timeline of the evaluation of the graph and of the worker threads, in the Chrome trace event format
+(see World.set_tracer). Open the file dumped by Tracer.dump in chrome://tracing or https://ui.perfetto.dev.
+
+Recorded spans:
+
+* each block, with nested spans for each Node of the plan and for the Nodes of the Groups evaluated by calc_func
+* each command executed by an AsyncCmdQueue (see AsyncCmdQueue.set_tracer), e.g. the disk reads and seeks
+  of a DiskInNode, named after the called function (AudioFrameRingBuffer.fill, LoopableAudioStream.seek)
+* each garbage collection, in any thread
+
+The spans go into a ring of capacity events, allocated once: when it is full the oldest spans are overwritten.
+Several threads write it without locks, each span takes a slot from an atomic counter.
+"""
+
+import gc
+import itertools
+import json
+import os
+import threading
+import time
+
+
+class Tracer:
+    """
+    Record spans in a fixed size ring and dump them as a Chrome trace.
+    """
+
+    def __init__(self, capacity=65536, gc_events=True):
+        """
+        Parameters
+        ----------
+        capacity : int
+            number of spans kept, the oldest ones are overwritten
+        gc_events : bool
+            record the garbage collections, until close()
+        """
+        self.capacity = capacity
+        self._names = []  # name of each name id
+        self._name_ids = {}  # name -> name id
+        self._threads = {}  # thread id -> thread name
+        self._seq = [-1] * capacity  # sequence number of the span in each slot, -1 if empty
+        self._name = [0] * capacity
+        self._tid = [0] * capacity
+        self._start = [0] * capacity
+        self._dur = [0] * capacity
+        self._counter = itertools.count()
+        self._block_id = self.name_id('block')
+        self._gc_ids = [self.name_id('gc (generation %d)' % g) for g in range(3)]
+        self._gc_start = 0
+        self._gc_events = gc_events
+        if gc_events:
+            gc.callbacks.append(self._gc_callback)
+
+    def name_id(self, name):
+        """Return the id of a span name, registering it if needed."""
+        k = self._name_ids.get(name)
+        if k is None:
+            k = self._name_ids[name] = len(self._names)
+            self._names.append(name)
+        return k
+
+    def record(self, name_id, start, end):
+        """
+        Record a span of the calling thread.
+
+        Parameters
+        ----------
+        name_id : int
+            as returned by name_id
+        start, end : int
+            time.perf_counter_ns() at the start and at the end of the span
+        """
+        tid = threading.get_ident()
+        if tid not in self._threads:
+            self._threads[tid] = threading.current_thread().name
+        i = next(self._counter)
+        k = i % self.capacity
+        self._name[k] = name_id
+        self._tid[k] = tid
+        self._start[k] = start
+        self._dur[k] = end - start
+        self._seq[k] = i
+
+    def _node_name_id(self, node):
+        return self.name_id(type(getattr(node, 'node', node)).__name__)
+
+    def prepare(self, plan):
+        """
+        Register the names of the Nodes of a plan, the class of the Node (of the wrapped Node for the wrappers).
+
+        Parameters
+        ----------
+        plan : sequence of bound calc_func
+
+        Returns
+        -------
+        out : tuple of (calc_func, name id)
+            the plan, as evaluated by run
+        """
+        return tuple((f, self._node_name_id(getattr(f, '__self__', f))) for f in plan)
+
+    def run(self, plan):
+        """Evaluate a plan prepared by prepare, recording a span for the block and for each Node."""
+        clock = time.perf_counter_ns
+        record = self.record
+        t0 = t = clock()
+        for calc_func, name_id in plan:
+            calc_func()
+            t1 = clock()
+            record(name_id, t, t1)
+            t = t1
+        record(self._block_id, t0, t)
+
+    def run_nodes(self, nodes):
+        """Evaluate nodes, as Group.calc_func, recording a span for each one."""
+        clock = time.perf_counter_ns
+        t = clock()
+        for n in nodes:
+            n.calc_func()
+            t1 = clock()
+            self.record(self._node_name_id(n), t, t1)
+            t = t1
+
+    def run_command(self, cmd):
+        """Execute a command of an AsyncCmdQueue, recording a span named after the called function."""
+        func = getattr(cmd, 'func', cmd)
+        name_id = self.name_id(getattr(func, '__qualname__', type(func).__name__))
+        t = time.perf_counter_ns()
+        try:
+            return cmd()
+        finally:
+            self.record(name_id, t, time.perf_counter_ns())
+
+    def _gc_callback(self, phase, info):
+        if phase == 'start':
+            self._gc_start = time.perf_counter_ns()
+        else:
+            self.record(self._gc_ids[info['generation']], self._gc_start, time.perf_counter_ns())
+
+    def clear(self):
+        """Drop all the spans recorded."""
+        self._seq[:] = [-1] * self.capacity
+
+    def close(self):
+        """Stop recording the garbage collections."""
+        if self._gc_events and self._gc_callback in gc.callbacks:
+            gc.callbacks.remove(self._gc_callback)
+
+    def events(self):
+        """
+        Returns
+        -------
+        out : list of dict
+            the spans in the ring, oldest first, as Chrome trace events (times in microseconds),
+            preceded by the names of the threads
+        """
+        pid = os.getpid()
+        slots = sorted((i, k) for k, i in enumerate(list(self._seq)) if i >= 0)
+        out = [{'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid, 'args': {'name': name}}
+               for tid, name in list(self._threads.items())]
+        for _, k in slots:
+            out.append({'name': self._names[self._name[k]], 'ph': 'X', 'pid': pid, 'tid': self._tid[k],
+                        'ts': self._start[k] / 1000, 'dur': self._dur[k] / 1000})
+        return out
+
+    def dump(self, filename):
+        """Write the spans in the ring to a Chrome trace JSON file."""
+        with open(filename, 'w') as f:
+            json.dump({'traceEvents': self.events(), 'displayTimeUnit': 'ms'}, f)
@@ -10,17 +10,27 @@ class Op:
     Example:
         op = Op(np.add)
         w_out3 = op(w_out1, w_out2)
+
+        op = Op(np.multiply, const=(.5,))  # bound constant operand
+        w_out2 = op(w_out1)
     """
 
-    def __init__(self, fn):
+    def __init__(self, fn, const=(), reflected=False):
         """
 
         Parameters
         ----------
         fn : callable fn(*ndarrays) -> ndarray
-            combines a certain number of ndarrays producing a ndarray for output
+            combines a certain number of ndarrays producing a ndarray for output.
+            NumPy ufuncs (and np.clip) are evaluated in place, with out= set to the output buffer.
+        const : tuple
+            constant operands, passed after the ndarrays
+        reflected : bool
+            pass the constant operands before the ndarrays, e.g. for 1 - x
         """
         self.fn = fn
+        self.const = tuple(const)
+        self.reflected = reflected
 
     def __call__(self, *w_out_tuple):
         """
@@ -44,26 +54,60 @@ class Op:
             assert (w == w_out.parent.world)
             max_len = max(max_len, w_out.data().shape[1])
 
-        op_node = OpNode(w, self.fn, n_in=n_w_out, out_len=max_len)
+        op_node = OpNode(w, self.fn, n_in=n_w_out, out_len=max_len, const=self.const, reflected=self.reflected)
         return op_node(*w_out_tuple)
 
 
+def _in_place(fn):
+    """True if fn accepts the out= argument of the ufuncs."""
+    return isinstance(fn, np.ufunc) or fn is np.clip
+
+
 class OpNode(Node):
     """
     Generic operation node. Private class, used by Op.
     Creates a Node with the given function and n_in inputs, output buffer is out_len long
+
+    When fn accepts out= (see Op) the inputs are read from the buffers of the connected OutWires, without squeezing,
+    into a list of arguments allocated once, and the result is written directly in the output buffer.
     """
 
-    def __init__(self, world, fn, n_in, out_len):
+    def __init__(self, world, fn, n_in, out_len, const=(), reflected=False):
         super().__init__(world)
         self.fn = fn
         self.n_in = n_in
+        self.const = tuple(const)
+        self.reflected = reflected
         self.w_in = [InWire(self) for _ in range(n_in)]
         self.w_out = OutWire(self, out_len)
 
+        self.in_place = _in_place(fn)
+        n_const = len(self.const)
+        first_in, first_const = (n_const, 0) if reflected else (0, n_in)
+        self._args = [None] * (n_in + n_const)  # arguments of fn, the inputs are set at each calc_func
+        const = self.const
+        if self.in_place:  # scalar operands as 0-d arrays of the wires dtype, faster to broadcast for the ufuncs
+            const = [np.asarray(c, dtype=np.float32) if np.isscalar(c) else c for c in const]
+        self._args[first_const:first_const + n_const] = const
+        self._slots = list(zip(range(first_in, first_in + n_in), self.w_in))
+
     def calc_func(self):
-        in_arrays = [w_in_.get_data() for w_in_ in self.w_in]
-        self.w_out.set_data(self.fn(*in_arrays))
+        args = self._args
+        if not self.in_place:
+            for k, w_in_ in self._slots:
+                args[k] = w_in_.get_data()
+            self.w_out.set_data(self.fn(*args))
+            return
+
+        for k, w_in_ in self._slots:
+            ow = w_in_.out_wire()
+            args[k] = w_in_.get_data() if ow is None else ow.data()
+        # out by keyword: the ufuncs take it through vectorcall without building a dict, and np.maximum and
+        # np.minimum deprecate it as a third positional argument
+        self.fn(*args, out=self.w_out.buffer())
+
+    def is_pure(self):
+        return True
 
     def __call__(self, *out_wires_tuple):
         nout_wires = len(out_wires_tuple)
@@ -89,10 +133,14 @@ class OutWire:
         buf_len : int
             the length of the array
             usually this is world.buf_len for audio buffer, 1 (default) for control buffer
+
+        The array has shape (world.batch_size, buf_len): one row for each variant of a batched World.
         """
         self.parent = parent
-        self._data = np.zeros((1, buf_len), dtype=np.float32)
+        self._data = np.zeros((parent.world.batch_size, buf_len), dtype=np.float32)
         self._in_wires = []
+        self.version = 0  # number of changes of the data, when tracked (see ChangeTracking)
+        self.silent = False  # True when the data is known to be all zeros (see Silence)
         self.parent.out_wires.append(self)
 
     def in_wires(self): return self._in_wires
@@ -111,6 +159,20 @@ class OutWire:
     def data(self):
         return self._data
 
+    def buffer(self):
+        """
+        Return the internal buffer, for computing the output in place (e.g. with the out= argument of the ufuncs)
+        instead of copying it with set_data.
+
+        Call it at each calc_func: the buffer may be replaced between two calls (see World.set_buffer_sharing
+        and SuperBlock). All of its elements must be written.
+
+        Returns
+        -------
+        out : ndarray of shape (world.batch_size, buf_len)
+        """
+        return self._data
+
     def plug_into(self, in_wire):
         """
         Connect to a given InWire of another Node
@@ -122,15 +184,24 @@ class OutWire:
         """
         if self.parent == in_wire.parent:
             raise ValueError("trying to connect a node to itself")
+        if in_wire.out_wire() is not None:
+            in_wire.out_wire().unplug(in_wire)
         self._in_wires.append(in_wire)
         in_wire.set_out_wire(self)
 
+    def unplug(self, in_wire):
+        """
+        Disconnect from the given InWire, that falls back to its default data
+        """
+        self._in_wires.remove(in_wire)
+        in_wire.set_out_wire(None)
+
     def __add__(self, other):
         if other.__class__.__name__ == "OutWire":
             op = Op(np.add)
             return op(self, other)
         else:
-            op = Op(lambda x: x + other)
+            op = Op(np.add, const=(other,))
             return op(self)
 
     __radd__ = __add__
@@ -140,7 +211,7 @@ class OutWire:
             op = Op(np.multiply)
             return op(self, other)
         else:
-            op = Op(lambda x: x * other)
+            op = Op(np.multiply, const=(other,))
             return op(self)
 
     __rmul__ = __mul__
@@ -150,7 +221,7 @@ class OutWire:
             op = Op(np.subtract)
             return op(self, other)
         else:
-            op = Op(lambda x: x - other)
+            op = Op(np.subtract, const=(other,))
             return op(self)
 
     def __rsub__(self, other):
@@ -158,7 +229,7 @@ class OutWire:
             op = Op(np.subtract)
             return op(other, self)
         else:
-            op = Op(lambda x: other - x)
+            op = Op(np.subtract, const=(other,), reflected=True)
             return op(self)
 
     def __truediv__(self, other):
@@ -166,7 +237,7 @@ class OutWire:
             op = Op(np.divide)
             return op(self, other)
         else:
-            op = Op(lambda x: x / other)
+            op = Op(np.divide, const=(other,))
             return op(self)
 
     def __rtruediv__(self, other):
@@ -174,41 +245,67 @@ class OutWire:
             op = Op(np.divide)
             return op(other, self)
         else:
-            op = Op(lambda x: other / x)
+            op = Op(np.divide, const=(other,), reflected=True)
             return op(self)
 
     def clip(self, a_min, a_max):
-        op = Op(lambda x: np.clip(x, a_min, a_max))
+        op = Op(np.clip, const=(a_min, a_max))
         return op(self)
 
     def range_to_unit(self, a_min, a_max, invert=False):
         a = 1 if invert else 0
         b = -1 if invert else 1
-        op = Op(lambda x: a + b * (1 / (a_max - a_min)) * (np.clip(x, a_min, a_max) - a_min))
-        return op(self)
+        return (self.clip(a_min, a_max) - a_min) * (b / (a_max - a_min)) + a
 
 
 class InWire:
     """
     When overriding calc_func in a new node, do not modify the object returned by InWire.get_data but only a copy of it.
+
+    The connection is classified when plugged: the buffer of a control rate OutWire (a single value) is returned
+    as a 0-d view, the buffer of an audio rate OutWire as it is. The view is rebuilt only if the OutWire is given
+    another buffer (see World.set_buffer_sharing and SuperBlock).
     """
 
     def __init__(self, parent, default_data=None):
         self.parent = parent
         self._default_data = default_data
         self._out_wire = None  # not connected
+        self._source = None  # buffer of the connected OutWire, when _view was built
+        self._view = None  # what get_data returns when connected
         self.parent.in_wires.append(self)
 
     def get_data(self):
         if self._out_wire is None:  # not connected
             return self._default_data
         out_data = self._out_wire.data()
-        if all([s_ == 1 for s_ in out_data.shape]):  # control (scalar) out_data
-            return np.squeeze(out_data)
-        return out_data  # audio (vector) out_data
+        if out_data is not self._source:
+            self._set_view(out_data)
+        return self._view
+
+    def get_value(self):
+        """
+        Return the value of a control InWire as a Python float, without building a 0-d array.
+        In a batched World, the value of the first variant.
+        """
+        data = self._default_data if self._out_wire is None else self._out_wire.data()
+        if isinstance(data, np.ndarray):
+            return data.item(0)
+        return float(data)
+
+    def _set_view(self, out_data):
+        self._source = out_data
+        if out_data.size == 1:  # control (scalar) out_data
+            self._view = np.squeeze(out_data)
+        else:  # audio (vector) out_data
+            self._view = out_data
 
     def set_out_wire(self, out_wire):
         self._out_wire = out_wire
+        if out_wire is None:
+            self._source = self._view = None
+        else:
+            self._set_view(out_wire.data())
 
     def out_wire(self):
         return self._out_wire
@@ -239,9 +336,18 @@ class ObjOutWire:
     def plug_into(self, in_wire):
         if self.parent == in_wire.parent:
             raise ValueError("trying to connect a node to itself")
+        if in_wire.out_wire() is not None:
+            in_wire.out_wire().unplug(in_wire)
         self._in_wires.append(in_wire)
         in_wire.set_out_wire(self)
 
+    def unplug(self, in_wire):
+        """
+        Disconnect from the given InWire, that falls back to its default data
+        """
+        self._in_wires.remove(in_wire)
+        in_wire.set_out_wire(None)
+
 
 class ObjInWire:
     """
@@ -322,6 +428,8 @@ class InWireAdaptor(InWire):
 
     def get_data(self): return self.in_wire.get_data()
 
+    def get_value(self): return self.in_wire.get_value()
+
     def out_wire(self): return self.in_wire.out_wire()
 
     def set_out_wire(self, out_wire): self.in_wire.set_out_wire(out_wire)
@@ -342,8 +450,12 @@ class OutWireAdaptor(OutWire):
 
     def data(self): return self.out_wire.data()
 
+    def buffer(self): return self.out_wire.buffer()
+
     def plug_into(self, in_wire): self.out_wire.plug_into(in_wire)
 
+    def unplug(self, in_wire): self.out_wire.unplug(in_wire)
+
 
 class ObjInWireAdaptor(ObjInWire):
     """
@@ -377,3 +489,5 @@ class ObjOutWireAdaptor(ObjOutWire):
     def data(self): return self.out_wire.data()
 
     def plug_into(self, in_wire): self.out_wire.plug_into(in_wire)
+
+    def unplug(self, in_wire): self.out_wire.unplug(in_wire)
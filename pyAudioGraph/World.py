@@ -2,8 +2,20 @@
 
 from .AudioDriver import AudioDriver
 from .AudioGraph import Group
+from .SuperBlock import SuperBlockRunner
+from .BufferPool import share_buffers, release_buffers
+from .Fusion import fuse_ops
+from .Pruning import live_nodes, fold_constants
+from .ChangeTracking import track_changes
+from .Silence import sleep_on_silence, wake_nodes
+from .ControlBus import ControlBus
+from .Profiler import Profiler
+from .AudioStream import WaveFileWriter
+import gc
 import numpy as np
 
+GC_MODES = (None, 'freeze', 'disable')
+
 
 class World:
     """
@@ -15,24 +27,73 @@ class World:
     * World.add_tail(Node)
     * Node.add_after(Node)
     * Node.add_before(Node)
+
+    A batched World (batch_size > 1) evaluates batch_size variants of the graph at once, for non-real-time rendering.
+    The wires carry one row for each variant, and control InWires accept one value for each variant
+    (see World.per_batch). inBuffer and outBuffer have shape (batch_size, nchannels, buf_len).
     """
 
-    def __init__(self, buf_len=64, sample_rate=44100, nchannels=2):
+    def __init__(self, buf_len=64, sample_rate=44100, nchannels=2, batch_size=1):
         self.buf_len = buf_len
         self.sample_rate = sample_rate
         self.nchannels = nchannels
+        self.batch_size = batch_size
 
-        self._audioDriver = AudioDriver(self)
+        self._audioDriver = None  # opened by start(), so that non-real-time worlds do not need a device
+        self._on_xrun = None
+        self._gc_mode = None
         self._topGroup = Group(self)
         self._isRunning = False
+        self._nodes = []
+        self._plan = None  # tuple of bound calc_func, built by compile()
+        self._executor = None
+        self._remote_groups = []  # RemoteGroups created in this world, closed by dispose()
+        self._buffer_sharing = False
+        self._op_fusion = False
+        self._graph_pruning = False
+        self._change_tracking = False
+        self._silence_detection = False
+        self._sleeping_nodes = []  # Nodes wrapped by sleep_on_silence in the plan
+        self.detects_silence = False  # True when the plan built by compile() detects silence
+        self._use_control_bus = False
+        self.control_bus = None  # ControlBus built by compile(), when enabled
+        self.profiler = None  # Profiler, see set_profiling
+        self._profiled_plan = None  # the plan prepared by the profiler
+        self.tracer = None  # Tracer, see set_tracer
+        self._traced_plan = None  # the plan prepared by the tracer
+        self._shared_wires = []  # OutWires given a shared buffer by compile()
+        self.n_wire_buffers = 0  # size of the pool of shared buffers
+        self._input_stream = None  # feeds inBuffer in non-real-time mode
+        self._input_read = 0  # frames read from _input_stream in the last cycle
 
         self._allocate_buffers()
 
         self.nrt = False
 
     def _allocate_buffers(self):
-        self.inBuffer = np.zeros((self.nchannels, self.buf_len), dtype=np.float32)
-        self.outBuffer = np.zeros((self.nchannels, self.buf_len), dtype=np.float32)
+        shape = (self.nchannels, self.buf_len)
+        if self.batch_size > 1:
+            shape = (self.batch_size,) + shape
+        self.inBuffer = np.zeros(shape, dtype=np.float32)
+        self.outBuffer = np.zeros(shape, dtype=np.float32)
+        # interleaved output of run(), reused at every callback
+        self._out_frames = np.zeros((self.buf_len, self.nchannels), dtype=np.float32)
+
+    def per_batch(self, values):
+        """
+        Shape a value for each variant of a batched World, for use as default data of a control InWire.
+
+        Parameters
+        ----------
+        values : sequence of batch_size floats
+
+        Returns
+        -------
+        out : ndarray of shape (batch_size, 1)
+        """
+        out = np.array(values, dtype=np.float32).reshape((-1, 1))
+        assert(out.shape[0] == self.batch_size)
+        return out
 
     def append(self, node):
         """
@@ -46,34 +107,309 @@ class World:
                 self._topGroup.append(n)
         except TypeError:
             self._topGroup.append(node)
+        self._plan = None
+
+    def remove(self, node):
+        """Disconnect the node and remove it from the top group, see Group.remove"""
+        self._topGroup.remove(node)
+        self._plan = None
+
+    def connect(self, out_wire, in_wire):
+        """Plug out_wire into in_wire keeping the graph sorted, see Group.connect"""
+        self._topGroup.connect(out_wire, in_wire)
+        self._plan = None
 
     def sort(self):
+        """Sort the graph and build the execution plan."""
         self._topGroup.sort()
+        self.compile()
+
+    def compile(self):
+        """
+        Build the execution plan: the flat sequence of the calc_func of all the Nodes, nested Groups included.
+
+        World.run and World.run_nrt replay the plan without checking the sorting state of the Groups.
+        The plan is rebuilt automatically after World.append, call compile() again after editing a nested Group.
+        """
+        self._nodes = self._topGroup.compile()
+        release_buffers(self._shared_wires)
+        self._shared_wires, self.n_wire_buffers = [], 0
+        wake_nodes(self._sleeping_nodes)
+        self._sleeping_nodes = []
+        self.detects_silence = False
+        if self.control_bus is not None:
+            release_buffers(self.control_bus.wires)
+            self.control_bus = None
+
+        plan_nodes = self._nodes
+        folded = set()
+        if self._graph_pruning:
+            self._nodes = plan_nodes = live_nodes(self._nodes)
+            folded = set(fold_constants(plan_nodes))
+            plan_nodes = [n for n in plan_nodes if n not in folded]
+        if self._use_control_bus:
+            self.control_bus = ControlBus(self._nodes, self.batch_size)
+
+        if self._executor is None:
+            if self._op_fusion:
+                plan_nodes = fuse_ops(plan_nodes)
+            if self._change_tracking:
+                plan_nodes = track_changes(plan_nodes, constant=folded)
+            if self._silence_detection:
+                self._sleeping_nodes = plan_nodes = sleep_on_silence(plan_nodes)
+                self.detects_silence = True
+            if self._buffer_sharing:
+                on_bus = self.control_bus.wires if self.control_bus is not None else ()
+                self._shared_wires, self.n_wire_buffers = share_buffers(plan_nodes, exclude=on_bus)
+            self._plan = tuple(n.calc_func for n in plan_nodes)
+        else:
+            self._executor.compile(plan_nodes)
+            self._plan = (self._executor.run,)
+        if self.profiler is not None:
+            self._profiled_plan = self.profiler.prepare(self._plan)
+        if self.tracer is not None:
+            self._traced_plan = self.tracer.prepare(self._plan)
+
+    def set_executor(self, executor):
+        """
+        Evaluate the graph with the given executor, instead of serially in the audio thread.
+
+        Parameters
+        ----------
+        executor : object with methods compile(nodes) and run(), e.g. ParallelExecutor, or None
+            None restores the serial evaluation. The previous executor is not closed.
+        """
+        self._executor = executor
+        self._plan = None
+
+    def set_buffer_sharing(self, enabled):
+        """
+        Let the OutWires share their buffers, when their live ranges in the evaluation order do not overlap
+        (see BufferPool). The working set drops from one buffer per wire to the maximum width of the graph.
+
+        The data of a connected OutWire is valid only until its last consumer is evaluated, so it should not be
+        read from outside the graph. The wires keep private buffers while an executor is set.
+
+        Parameters
+        ----------
+        enabled : bool
+        """
+        self._buffer_sharing = enabled
+        self._plan = None
+
+    def set_op_fusion(self, enabled):
+        """
+        Evaluate each tree of OpNodes built from ufuncs (e.g. (a + b) * g - c, clip, range_to_unit) as a single
+        Node, without writing the intermediate OutWires (see Fusion).
+        Like buffer sharing, fusion applies to the serial plan only, not to executors and super-blocks.
+
+        Parameters
+        ----------
+        enabled : bool
+        """
+        self._op_fusion = enabled
+        self._plan = None
+
+    def set_graph_pruning(self, enabled):
+        """
+        Simplify the graph when building the plan (see Pruning): the Nodes that cannot reach a sink
+        (a Node without OutWires, e.g. OutNode or a recorder) are not evaluated, and the pure Nodes with
+        constant inputs (e.g. Ops of constant wires, ControlSeqGen of length 1) are evaluated once.
+
+        Call compile() after changing the default data of the InWires of a constant Node.
+        Super-blocks evaluate the constant Nodes at every block.
+
+        Parameters
+        ----------
+        enabled : bool
+        """
+        self._graph_pruning = enabled
+        self._plan = None
+
+    def set_change_tracking(self, enabled):
+        """
+        Skip the pure control rate Nodes (e.g. Ops over static knobs) whose inputs did not change since their
+        last evaluation, keeping their previous output (see ChangeTracking). Applies to the serial plan only.
+
+        Parameters
+        ----------
+        enabled : bool
+        """
+        self._change_tracking = enabled
+        self._plan = None
+
+    def set_silence_detection(self, enabled):
+        """
+        Let the Nodes that give silence out of silence (e.g. Lowpass, Delay, MixerNode) sleep while their signal
+        inputs are silent and their tail has decayed, instead of processing zeros (see Silence).
+        The sources flag their silent outputs (e.g. SamplerNode, DiskInNode), the mixers skip the silent inputs.
+        Applies to the serial plan only.
+
+        Parameters
+        ----------
+        enabled : bool
+        """
+        self._silence_detection = enabled
+        self._plan = None
+
+    def set_control_bus(self, enabled):
+        """
+        Keep the data of all the control rate OutWires in one contiguous array, World.control_bus.values,
+        built by compile() (see ControlBus). The controls of the whole graph can then be saved, restored or
+        updated at once, e.g. world.control_bus.restore(snapshot).
+
+        Parameters
+        ----------
+        enabled : bool
+        """
+        self._use_control_bus = enabled
+        self._plan = None
+
+    def set_profiling(self, enabled):
+        """
+        Measure the time of each Node and of each block in World.profiler (see Profiler), for finding the Nodes
+        to optimize and sizing buf_len: World.profiler.snapshot() returns the DSP load (the time of a block as a
+        fraction of buf_len / sample_rate), the hotspots and the percentiles of each class of Node.
+        The Groups evaluated by calc_func report their Nodes too.
+
+        Parameters
+        ----------
+        enabled : bool
+            True starts a new Profiler, False removes it
+        """
+        self.profiler = Profiler(self) if enabled else None
+        self._plan = None
+
+    def set_tracer(self, tracer):
+        """
+        Record the timeline of the blocks and of their Nodes in tracer, to be dumped as a Chrome trace
+        (see Trace). Pass the same tracer to the command queues (AsyncCmdQueue.set_tracer, e.g. the cmd_queue
+        of DiskInNode) for their commands to appear in the timeline. The profiler, if set, takes precedence.
+
+        Parameters
+        ----------
+        tracer : Tracer or None
+        """
+        self.tracer = tracer
+        self._plan = None
+
+    def set_gc_mode(self, mode):
+        """
+        Keep the garbage collector out of the audio callback, whose pauses are not bounded.
+
+        Parameters
+        ----------
+        mode : None, 'freeze' or 'disable'
+            * None: the collector runs when the allocations trigger it, possibly in the audio callback
+            * 'freeze': start() collects and moves all the objects to the permanent generation (gc.freeze), so that
+              the collections triggered afterwards only scan the objects created since. stop() unfreezes them.
+            * 'disable': the collector is disabled during each World.run, and enabled again after it if it was.
+              The collections happen in the other threads, which should allocate enough to trigger them.
+        """
+        assert(mode in GC_MODES)
+        if self._isRunning and not self.nrt and self._gc_mode == 'freeze' and mode != 'freeze':
+            gc.unfreeze()
+        elif self._isRunning and not self.nrt and mode == 'freeze' and self._gc_mode != 'freeze':
+            gc.collect()
+            gc.freeze()
+        self._gc_mode = mode
+
+    def set_input_stream(self, stream):
+        """
+        Feed World.inBuffer (and so InNode) from an AudioStream, block by block, in non-real-time mode.
+
+        Parameters
+        ----------
+        stream : AudioStream, e.g. AudioStreamArray, AudioStreamGenerator, AudioStreamWaveFileMemmap, or None
+            must have world.nchannels channels. None restores silence.
+            When rendering without a given length, the rendering stops at the end of the stream.
+        """
+        assert(stream is None or stream.nchannels == self.nchannels)
+        self._input_stream = stream
+
+    def _process_block(self):
+        """Evaluate the graph once, compiling it first if needed."""
+        if self._plan is None:
+            self.compile()
+        if self.profiler is not None:
+            self.profiler.run(self._profiled_plan)
+            return
+        if self.tracer is not None:
+            self.tracer.run(self._traced_plan)
+            return
+        for calc_func in self._plan:
+            calc_func()
 
     def start(self):
         """Start the audio thread if not already running."""
         if not self._isRunning:
+            assert(self.batch_size == 1)
+            if self._audioDriver is None:
+                self._audioDriver = AudioDriver(self, on_xrun=self._on_xrun)
+            if self._gc_mode == 'freeze':
+                gc.collect()
+                gc.freeze()
             self._audioDriver.start()
             self._isRunning = True
 
     def run(self, in_data):
-        # deinterlave
-        self.inBuffer[:] = np.fromstring(in_data, dtype=np.float32).reshape((self.nchannels, -1), order='F')
+        """
+        Evaluate one block in the audio callback, without allocating memory.
+
+        Parameters
+        ----------
+        in_data : bytes-like
+            interleaved float32 input samples, buf_len frames of nchannels
 
-        # give self.buffers[0] to in unit
-        self._topGroup.calc_func()
+        Returns
+        -------
+        out : numpy.ndarray of shape (buf_len, nchannels)
+            the interleaved output samples. The array is reused at the next call.
+        """
+        # deinterleave, in_frames is a view of the device buffer
+        in_frames = np.frombuffer(in_data, dtype=np.float32).reshape((-1, self.nchannels))
+        np.copyto(self.inBuffer, in_frames.T)
+
+        if self._gc_mode == 'disable' and gc.isenabled():
+            gc.disable()
+            try:
+                self._process_block()
+            finally:
+                gc.enable()
+        else:
+            self._process_block()
 
-        # interlave
-        out_data = self.outBuffer.tostring(order='F')
-        return out_data
+        # interleave
+        np.copyto(self._out_frames, self.outBuffer.T)
+        return self._out_frames
+
+    def callback_monitor(self):
+        """
+        Return the CallbackMonitor of the audio driver (xruns, jitter and DSP load of the audio callbacks),
+        None before start().
+        """
+        return None if self._audioDriver is None else self._audioDriver.monitor
+
+    def set_xrun_callback(self, on_xrun):
+        """
+        Parameters
+        ----------
+        on_xrun : callable on_xrun(status, monitor) or None
+            called in the audio thread when the device reports an underflow or an overflow (see CallbackMonitor)
+        """
+        self._on_xrun = on_xrun
+        if self._audioDriver is not None:
+            self._audioDriver.monitor.on_xrun = on_xrun
 
     def stop(self):
         """Stop the audio thread if running."""
         if self._isRunning:
             self._audioDriver.stop()
             self._isRunning = False
+            if self._gc_mode == 'freeze':
+                gc.unfreeze()
 
-    def run_nrt(self, stop_condition):
+    def run_nrt(self, stop_condition, n_blocks=1):
         """
         Run in non-real-time mode.
 
@@ -81,17 +417,170 @@ class World:
         ----------
         stop_condition : callable
             called at every cycle. Return if True
+        n_blocks : int
+            blocks evaluated at every cycle. With n_blocks > 1 the nodes implementing calc_func_batch
+            process n_blocks blocks in one call (see SuperBlock), and the executor is not used.
         """
+        cycles = self._nrt_cycles(n_blocks)
+        try:
+            while not stop_condition():
+                next(cycles)
+        finally:
+            cycles.close()
+
+    def _nrt_cycles(self, n_blocks):
+        """Generator evaluating the graph in non-real-time mode, yields the output of each cycle."""
         self.nrt = True
         self._isRunning = True
-        while not stop_condition():
-            self._topGroup.calc_func()
-        self._isRunning = False
-        self.nrt = False
+        runner = None
+        in_stream = self._input_stream
+        # the input of a batched world is the same for all the variants
+        in_scratch = self.inBuffer if self.batch_size == 1 else np.zeros(self.inBuffer.shape[1:], dtype=np.float32)
+        try:
+            if n_blocks == 1:
+                while True:
+                    if in_stream is not None:
+                        self._input_read = in_stream.read(in_scratch)
+                        if in_scratch is not self.inBuffer:
+                            self.inBuffer[:] = in_scratch
+                    self._process_block()
+                    yield self.outBuffer
+            else:
+                if self._plan is None:
+                    self.compile()
+                runner = SuperBlockRunner(self, self._nodes, n_blocks)
+                in_buffer, out_buffer = runner.in_buffer(), runner.out_buffer()
+                while True:
+                    if in_stream is not None:
+                        self._input_read = in_stream.read(in_buffer)
+                    runner.run()
+                    yield out_buffer
+        finally:
+            if runner is not None:
+                runner.close()
+            self._isRunning = False
+            self.nrt = False
+
+    def _n_samples(self, n_samples, seconds):
+        if n_samples is None and seconds is not None:
+            n_samples = int(round(seconds * self.sample_rate))
+        return n_samples
+
+    def iter_blocks(self, n_samples=None, seconds=None, n_blocks=1):
+        """
+        Evaluate the graph in non-real-time mode, lazily. No audio device is needed.
+
+        Parameters
+        ----------
+        n_samples : int
+            number of samples to render, None for endless rendering (or until the end of the input stream)
+        seconds : float
+            duration to render, alternative to n_samples
+        n_blocks : int
+            blocks evaluated at once, see run_nrt
+
+        Yields
+        ------
+        out : numpy.ndarray of shape ([batch_size,] nchannels, n_blocks * buf_len)
+            the output of the graph (the last one may be shorter).
+            The array is overwritten at the next iteration, copy it if needed.
+        """
+        n_samples = self._n_samples(n_samples, seconds)
+        if n_samples is not None and n_samples <= 0:
+            return
+        done = 0
+        cycles = self._nrt_cycles(n_blocks)
+        try:
+            for out_buffer in cycles:
+                if n_samples is None and self._input_stream is not None:  # until the end of the input
+                    if self._input_read < out_buffer.shape[-1]:
+                        if self._input_read > 0:
+                            yield out_buffer[..., :self._input_read]
+                        return
+                elif n_samples is not None:
+                    if done + out_buffer.shape[-1] >= n_samples:
+                        yield out_buffer[..., :n_samples - done]
+                        return
+                    done += out_buffer.shape[-1]
+                yield out_buffer
+        finally:
+            cycles.close()
+
+    def render(self, n_samples=None, seconds=None, n_blocks=1):
+        """
+        Evaluate the graph in non-real-time mode and return its output. No audio device is needed.
+
+        Parameters
+        ----------
+        n_samples : int
+            number of samples to render, None for the remaining length of the input stream, or until its end
+            when its length is unknown (e.g. AudioStreamGenerator)
+        seconds : float
+            duration to render, alternative to n_samples
+        n_blocks : int
+            blocks evaluated at once, see run_nrt
+
+        Returns
+        -------
+        out : numpy.ndarray of shape ([batch_size,] nchannels, n_samples)
+        """
+        n_samples = self._n_samples(n_samples, seconds)
+        if n_samples is None:
+            if self._input_stream is None:
+                raise ValueError("render needs n_samples or seconds when there is no input stream")
+            if self._input_stream.length == 0:  # unknown length, render until the end of the stream
+                blocks = [block.copy() for block in self.iter_blocks(n_blocks=n_blocks)]
+                if not blocks:
+                    return np.zeros(self.outBuffer.shape[:-1] + (0,), dtype=np.float32)
+                return np.concatenate(blocks, axis=-1)
+            n_samples = self._input_stream.length - self._input_stream.pos()
+        out = np.zeros(self.outBuffer.shape[:-1] + (n_samples,), dtype=np.float32)
+        pos = 0
+        for block in self.iter_blocks(n_samples, n_blocks=n_blocks):
+            out[..., pos:pos + block.shape[-1]] = block
+            pos += block.shape[-1]
+        return out
+
+    def render_to_wav(self, filename, n_samples=None, seconds=None, n_blocks=1, samplewidth=2):
+        """
+        Evaluate the graph in non-real-time mode and write its output to a wave file.
+
+        The file is written by a background thread through a fixed pool of buffers (see WaveFileWriter),
+        so long renders are not accumulated in memory. No audio device is needed.
+
+        Parameters
+        ----------
+        filename : str
+        n_samples : int
+            number of samples to render, None for rendering until the end of the input stream
+        seconds : float
+            duration to render, alternative to n_samples
+        n_blocks : int
+            blocks evaluated at once, see run_nrt
+        samplewidth : int
+            bytes per sample of the wave file: 1 (unsigned), 2 or 4, otherwise ValueError
+        """
+        n_samples = self._n_samples(n_samples, seconds)
+        if n_samples is None and self._input_stream is None:
+            raise ValueError("render_to_wav needs n_samples or seconds when there is no input stream")
+        assert(self.batch_size == 1)
+        writer = WaveFileWriter(filename, self.nchannels, self.sample_rate, self.buf_len * n_blocks,
+                                samplewidth=samplewidth)
+        try:
+            for block in self.iter_blocks(n_samples, n_blocks=n_blocks):
+                writer.write(block)
+        finally:
+            writer.close()
 
     def is_running(self):
         return self._isRunning
 
     def dispose(self):
-        """Clean up."""
-        self._audioDriver.dispose()
+        """Clean up: close the audio driver, the executor and the RemoteGroups."""
+        if self._audioDriver is not None:
+            self._audioDriver.dispose()
+        if self._executor is not None:
+            self._executor.close()
+        for remote in self._remote_groups:
+            remote.close()
+        self._remote_groups = []
@@ -2,7 +2,11 @@ from .AudioBuffer import AudioBuffer, RingBuffer
 from .Wire import Op, InWire, OutWire, pass_thru, ObjOutWire, ObjInWire
 from .AudioGraph import Node, Group
 from .World import World
-from .AudioStream import AudioStreamWaveFile
+from .Executor import ParallelExecutor, PipelineExecutor
+from .RemoteGroup import RemoteGroup
+from .BatchRenderer import BatchRenderer, BatchGraph, BatchResult
+from .AudioStream import AudioStreamWaveFile, AudioStreamWaveFileMemmap, AudioStreamArray, AudioStreamGenerator
+from .AudioStream import WaveFileWriter
 from .CmdQueue import LambdaCommand, AsyncCmdQueue
 from .Range import Range, RangeQueue
 from .MovingViterbi import MovingViterbi
@@ -0,0 +1,87 @@
+import gc
+import numpy as np
+
+
+def test_audit_allocations():
+    import pyAudioGraph as ag
+    from pyAudioGraph.Allocations import audit_allocations
+
+    w = ag.World(buf_len=512)
+    osc = ag.Nodes.SinOsc(w)
+    lp = ag.Nodes.Lowpass(w)
+    slope = ag.Nodes.AudioSlopeGen(w)
+    osc.w_out.plug_into(lp.w_in)
+    y = lp.w_out * 0.5
+    out = ag.Nodes.OutNode(w)
+    for i in range(2):
+        y.plug_into(out.w_in[i])
+    slope.w_out.plug_into(out.w_level)
+    w.append(out)
+    w.sort()
+
+    report = audit_allocations(w, n_blocks=8)
+    stats = {s.name: s for s in report.nodes}
+    assert(set(stats) == {'SinOsc', 'Lowpass', 'OpNode', 'AudioSlopeGen', 'OutNode'})
+    assert(all(s.blocks == 8 for s in report.nodes))
+
+    # lfilter returns new arrays
+    allocating = [s.name for s in report.allocating()]
+    assert('Lowpass' in allocating)
+    assert(stats['Lowpass'].peak_bytes >= 512 * 4)
+    # the OpNode writes in place, the AudioSlopeGen ramps in preallocated buffers
+    assert('OpNode' not in allocating)
+    assert('AudioSlopeGen' not in allocating)
+    assert(report.report().splitlines()[1].startswith('Lowpass'))
+
+    # the audit evaluates the graph as World.run
+    np.testing.assert_allclose(y.data()[0, :4], 0.5 * lp.w_out.data()[0, :4])
+
+
+def test_gc_mode_disable():
+    import pyAudioGraph as ag
+
+    w = ag.World(buf_len=16)
+    in_node = ag.Nodes.InNode(w)
+    out = ag.Nodes.OutNode(w)
+    for i in range(2):
+        in_node.w_out[i].plug_into(out.w_in[i])
+    w.append(out)
+    w.sort()
+
+    frames = np.zeros((16, 2), dtype=np.float32).tobytes()
+    w.set_gc_mode('disable')
+    was_enabled = gc.isenabled()
+    gc.enable()
+    try:
+        w.run(frames)
+        assert(gc.isenabled())
+        gc.disable()
+        w.run(frames)
+        assert(not gc.isenabled())
+    finally:
+        if was_enabled:
+            gc.enable()
+
+
+def test_clip_allocation_free():
+    import warnings
+    import pyAudioGraph as ag
+    from pyAudioGraph.Allocations import audit_allocations
+
+    w = ag.World(buf_len=512)
+    osc = ag.Nodes.SinOsc(w)
+    y = (osc.w_out * 2).clip(-.5, .5)
+    out = ag.Nodes.OutNode(w)
+    for i in range(2):
+        y.plug_into(out.w_in[i])
+    w.append(out)
+    w.sort()
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        w.render(512 * 2)
+        report = audit_allocations(w, n_blocks=8)
+    ops = [s for s in report.nodes if s.name == 'OpNode']
+    assert(len(ops) == 2)  # *, clip
+    assert(not [s for s in report.allocating() if s.name == 'OpNode'])
+    assert(np.abs(y.data()).max() <= .5)
@@ -0,0 +1,81 @@
+import os
+import numpy as np
+import pyAudioGraph as ag
+
+
+class _LowpassGraph(ag.BatchGraph):
+
+    def __init__(self):
+        self.n_builds = 0
+
+    def build(self, world):
+        self.n_builds += 1
+        in_node = ag.Nodes.InNode(world)
+        out = ag.Nodes.OutNode(world)
+        self.lp = ag.Nodes.Lowpass(world)
+        self.rms = ag.Nodes.RmsNode(world)
+        self.rec = ag.Nodes.ControlRateRecorder(world, 1)
+        in_node.w_out[0].plug_into(self.lp.w_in)
+        self.lp.w_out.plug_into(out.w_in[0])
+        self.lp.w_out.plug_into(out.w_in[1])
+        self.lp.w_out.plug_into(self.rms.w_in)
+        self.rms.w_out.plug_into(self.rec.w_in[0])
+        world.append([out, self.rec])
+
+    def setup(self, job):
+        self.lp.reset()
+        self.lp.w_f0._default_data = job['params']['f0']
+        self.rec.clear()
+
+    def results(self):
+        return {'rms': self.rec.get_data(0).copy(), 'n_builds': np.array(self.n_builds)}
+
+
+def test_batch_renderer(tmpdir):
+    x = np.random.RandomState(0).uniform(-.5, .5, (2, 640)).astype(np.float32)
+    jobs = [{'input': x, 'params': {'f0': 500 + 100 * i}} for i in range(4)]
+    jobs[1]['output'] = os.path.join(str(tmpdir), 'out1.npy')
+    jobs[2]['output'] = os.path.join(str(tmpdir), 'out2.wav')
+    jobs[3]['output'] = os.path.join(str(tmpdir), 'out3.npz')
+
+    progress = []
+    renderer = ag.BatchRenderer(_LowpassGraph(), n_workers=2)
+    results = renderer.run(jobs, progress=lambda n, n_jobs, r: progress.append((n, n_jobs)))
+
+    assert(progress == [(1, 4), (2, 4), (3, 4), (4, 4)])
+    assert([r.index for r in results] == [0, 1, 2, 3])
+    assert(all(r.n_samples == 640 and r.seconds > 0 for r in results))
+    assert(all(r.data['n_builds'] == 1 for r in results))
+    assert(results[0].data['out'].shape == (2, 640) and len(results[0].data['rms']) == 10)
+
+    w = ag.World()
+    g = _LowpassGraph()
+    g.build(w)
+    g.setup(jobs[1])
+    w.set_input_stream(ag.AudioStreamArray(x))
+    assert(np.allclose(np.load(jobs[1]['output']), w.render()))
+    assert(os.path.exists(jobs[2]['output']))
+    assert(np.allclose(np.load(jobs[3]['output'])['rms'], results[3].data['rms']))
+
+
+class _ReservedKeyGraph(_LowpassGraph):
+
+    def results(self):
+        return {'out': np.zeros(1)}
+
+
+def test_batch_renderer_invalid_jobs():
+    renderer = ag.BatchRenderer(_LowpassGraph(), n_workers=1)
+    for job in ({'params': {'f0': 500}}, {'n_samples': 64, 'output': 'out.mp3', 'params': {'f0': 500}}):
+        try:
+            renderer.run([job])
+            assert(False)
+        except ValueError:
+            pass
+
+    renderer = ag.BatchRenderer(_ReservedKeyGraph(), n_workers=1)
+    try:
+        renderer.run([{'n_samples': 64, 'params': {'f0': 500}}])
+        assert(False)
+    except ValueError as e:
+        assert("'out'" in str(e))
@@ -0,0 +1,60 @@
+import numpy as np
+
+
+def _build(w, freq, f0, weight):
+    import pyAudioGraph as ag
+
+    osc = ag.Nodes.SinOsc(w, freq=freq)
+    lp = ag.Nodes.Lowpass(w, f0=f0)
+    dl = ag.Nodes.Delay(w, 100, weight=weight)
+    mix = ag.Nodes.MixerNode(w, np.array([[.5, .5]]))
+    out = ag.Nodes.OutNode(w)
+    osc.w_out.plug_into(lp.w_in)
+    lp.w_out.plug_into(dl.w_in)
+    dl.w_out.plug_into(mix.w_in[0])
+    osc.w_out.plug_into(mix.w_in[1])
+    mix.w_out[0].plug_into(out.w_in[0])
+    lp.w_out.plug_into(out.w_in[1])
+    w.append(out)
+    w.sort()
+
+
+def test_batched_world():
+    import pyAudioGraph as ag
+
+    freqs, f0s, weights = [200, 300, 450], [500, 1000, 4000], [.1, .5, .9]
+
+    w = ag.World(buf_len=64, batch_size=3)
+    _build(w, w.per_batch(freqs), w.per_batch(f0s), w.per_batch(weights))
+    y = w.render(640)
+    assert(y.shape == (3, 2, 640))
+
+    for k in range(3):
+        w_k = ag.World(buf_len=64)
+        _build(w_k, freqs[k], f0s[k], weights[k])
+        assert(np.allclose(w_k.render(640), y[k], atol=1e-4))
+
+
+def test_batched_audio_slope_gen():
+    import pyAudioGraph as ag
+
+    def build(w):
+        slope = ag.Nodes.AudioSlopeGen(w, initial_value=0.)
+        slope.w_in._default_data = 1.
+        out = ag.Nodes.OutNode(w)
+        for i in range(2):
+            slope.w_out.plug_into(out.w_in[i])
+        w.append(out)
+        w.sort()
+
+    w_1 = ag.World(buf_len=64)
+    build(w_1)
+    ref = w_1.render(640)
+    assert(ref.max() > .5)
+
+    # a scalar target ramps every row of the batch
+    w = ag.World(buf_len=64, batch_size=3)
+    build(w)
+    y = w.render(640)
+    for k in range(3):
+        assert(np.allclose(y[k], ref))
@@ -0,0 +1,44 @@
+import json
+import os
+import sys
+
+BENCHMARKS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks')
+
+
+def test_compare(tmp_path):
+    sys.path.insert(0, BENCHMARKS)
+    try:
+        import compare
+        from harness import measure
+    finally:
+        sys.path.remove(BENCHMARKS)
+
+    r = measure(lambda: None, repeat=3, min_time=0.001)
+    assert(r['repeat'] == 3 and r['number'] >= 1 and r['min'] <= r['median'] <= r['max'])
+
+    def results(**times):
+        return {'meta': {}, 'results': {name: {'median': t, 'min': t} for name, t in times.items()}}
+
+    baseline = results(a=1e-6, b=1e-6, c=1e-6, d=1e-6)
+    new = results(a=1.05e-6, b=1.5e-6, c=0.5e-6, e=1e-6)
+    rows = compare.compare(baseline, new, threshold=0.1)
+    assert([(row[0], row[4]) for row in rows] == [('a', 'ok'), ('b', 'regression'), ('c', 'improvement'),
+                                                  ('d', 'missing'), ('e', 'new')])
+    assert(compare.compare(baseline, new, threshold=0.6)[1][4] == 'ok')
+    text = compare.report(rows)
+    assert('b ' in text and 'a ' not in text)
+    assert(text.splitlines()[-1] == '1 regression, 1 improvement, 1 ok, 1 new, 1 missing')
+
+    # the committed baseline is the default, the results of the same machine compare without notes
+    with open(compare.BASELINE) as f:
+        baseline = json.load(f)
+    assert(compare.environment_changes(baseline, baseline) == [])
+    filename = str(tmp_path / 'results.json')
+    with open(filename, 'w') as f:
+        json.dump(baseline, f)
+    assert(compare.main([filename]) == 0)
+    name = sorted(baseline['results'])[0]
+    baseline['results'][name]['median'] *= 2
+    with open(filename, 'w') as f:
+        json.dump(baseline, f)
+    assert(compare.main([filename]) == 1)
@@ -0,0 +1,54 @@
+import numpy as np
+
+
+def _chain(w, n):
+    import pyAudioGraph as ag
+
+    osc = ag.Nodes.SinOsc(w, freq=300)
+    x = osc.w_out
+    for k in range(n):
+        lp = ag.Nodes.Lowpass(w, f0=500 + 100 * k)
+        x.plug_into(lp.w_in)
+        x = lp.w_out
+    mix = ag.Nodes.MixerNode(w, np.array([[.5, .5], [.5, -.5]]))
+    x.plug_into(mix.w_in[0])
+    osc.w_out.plug_into(mix.w_in[1])  # osc is live until the mixer
+    out = ag.Nodes.OutNode(w)
+    for i in range(2):
+        mix.w_out[i].plug_into(out.w_in[i])
+    w.append(out)
+    w.sort()
+
+
+def test_share_buffers():
+    import pyAudioGraph as ag
+
+    w = ag.World(buf_len=32)
+    _chain(w, 10)
+    ref = w.render(320)
+
+    w = ag.World(buf_len=32)
+    _chain(w, 10)
+    w.set_buffer_sharing(True)
+    y = w.render(320)
+    assert(np.array_equal(y, ref))
+    # osc, the lowpass chain alternating between two buffers, the second mixer output
+    assert(w.n_wire_buffers == 4)
+    assert(len(w._shared_wires) == 13)
+
+    w.set_buffer_sharing(False)
+    w.compile()
+    assert(w.n_wire_buffers == 0)
+    assert(len(set(id(ow.data()) for n in w._nodes for ow in n.out_wires)) == 13)
+
+
+def test_wire_live_ranges():
+    import pyAudioGraph as ag
+    from pyAudioGraph.BufferPool import wire_live_ranges
+
+    w = ag.World(buf_len=32)
+    _chain(w, 2)
+    ranges = wire_live_ranges(w._nodes)
+    nodes = w._nodes
+    assert(ranges[nodes[0].w_out] == (0, 3))
+    assert(ranges[nodes[1].w_out] == (1, 2))
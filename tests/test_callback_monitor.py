@@ -0,0 +1,34 @@
+import numpy as np
+
+
+def test_callback_monitor():
+    import pyAudioGraph as ag
+    from pyAudioGraph.AudioDriver import AudioDriver, CallbackMonitor, paContinue, paOutputUnderflow, paInputOverflow
+
+    w = ag.World(buf_len=64, nchannels=2)
+    xruns = []
+    driver = AudioDriver(w, window=16, on_xrun=lambda status, monitor: xruns.append(status))
+    in_data = np.zeros((64, 2), dtype=np.float32).tobytes()
+    for k in range(20):
+        status = paOutputUnderflow if k == 5 else 0
+        out, flag = driver.callback(in_data, 64, {'current_time': 1., 'output_buffer_dac_time': 1.01}, status)
+        assert(flag == paContinue and out.shape == (64, 2))
+    stats = driver.monitor.stats()
+    assert(stats['callbacks'] == 20)
+    assert(stats['xruns']['output_underflow'] == 1 and stats['xruns']['input_overflow'] == 0)
+    assert(xruns == [paOutputUnderflow])
+    assert(0 < stats['load_mean'] <= stats['load_max'])
+    assert(abs(stats['latency'] - .01) < 1e-9)
+
+    period = 64 / 44100
+    monitor = CallbackMonitor(period, window=4)
+    assert(monitor.stats()['jitter_max'] == 0)
+    t = 0.
+    for k, late in enumerate([0, 0, .001, 0, 0, 0]):
+        t += period + late
+        monitor.update(t, t + period * (2 if k == 3 else .5), paInputOverflow if k == 4 else 0)
+    stats = monitor.stats()
+    assert(stats['xruns']['input_overflow'] == 1)
+    assert(abs(stats['jitter_max'] - .001) < 1e-9)  # within the last 4 callbacks
+    assert(stats['deadline_misses'] == 1)
+    assert(abs(stats['load_max'] - 2) < 1e-9)
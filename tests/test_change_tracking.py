@@ -0,0 +1,48 @@
+import numpy as np
+
+
+def _graph(w):
+    import pyAudioGraph as ag
+
+    knob = ag.Nodes.ControlSlopeGen(w, initial_value=0.)
+    y = (knob.w_out * 2 + .5).clip(0, 1.5)
+    osc = ag.Nodes.SinOsc(w, freq=300)
+    out = ag.Nodes.OutNode(w)
+    for i in range(2):
+        osc.w_out.plug_into(out.w_in[i])
+    y.plug_into(out.w_level)
+    w.append(out)
+    w.sort()
+    return knob, y
+
+
+def _render(tracking, fusion=False):
+    import pyAudioGraph as ag
+
+    w = ag.World(buf_len=16)
+    knob, y = _graph(w)
+    w.set_change_tracking(tracking)
+    w.set_op_fusion(fusion)
+    out = [w.render(16 * 100)]
+    knob.w_in._default_data = .3
+    out.append(w.render(16 * 100))
+    knob.w_in._default_data = 1.
+    out.append(w.render(16 * 100))
+    return w, np.concatenate(out, axis=1)
+
+
+def test_change_tracking():
+    from pyAudioGraph.ChangeTracking import _TrackedNode
+
+    _, ref = _render(False)
+    w, y = _render(True)
+    assert(np.array_equal(y, ref))
+
+    tracked = [n.__self__ for n in w._plan if isinstance(n.__self__, _TrackedNode)]
+    assert(len(tracked) == 4)  # the knob publishes its changes, the 3 ops are skippable
+    ops = [t for t in tracked if t.skippable]
+    # the slope converges in less than 100 blocks after each move of the knob
+    assert(all(t.n_skipped > 100 for t in ops))
+
+    w, y = _render(True, fusion=True)
+    assert(np.allclose(y, ref))
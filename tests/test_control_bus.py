@@ -0,0 +1,55 @@
+import numpy as np
+
+
+def _graph(w):
+    import pyAudioGraph as ag
+
+    knob = ag.Nodes.ControlSlopeGen(w, initial_value=.5)
+    f0 = knob.w_out * 1000 + 200
+    osc = ag.Nodes.SawOsc(w, freq=300)
+    lp = ag.Nodes.Lowpass(w)
+    osc.w_out.plug_into(lp.w_in)
+    f0.plug_into(lp.w_f0)
+    out = ag.Nodes.OutNode(w)
+    for i in range(2):
+        lp.w_out.plug_into(out.w_in[i])
+    (knob.w_out * .5).plug_into(out.w_level)
+    w.append(out)
+    w.sort()
+    return knob
+
+
+def test_control_bus():
+    import pyAudioGraph as ag
+
+    w = ag.World(buf_len=32)
+    knob = _graph(w)
+    ref = w.render(320)
+
+    w = ag.World(buf_len=32)
+    knob = _graph(w)
+    w.set_control_bus(True)
+    w.set_buffer_sharing(True)
+    y = w.render(320)
+    assert(np.array_equal(y, ref))
+
+    bus = w.control_bus
+    assert(bus.values.shape == (1, 4))  # the knob and the three ops
+    k = bus.column(knob.w_out)
+    assert(np.shares_memory(knob.w_out.data(), bus.values))
+    assert(bus.values[0, k] == knob.w_out.data()[0, 0])
+    assert(not any(ow in bus.wires for ow in w._shared_wires))
+
+    snapshot = bus.snapshot()
+    knob.w_in._default_data = 1.
+    w.render(320)
+    assert(bus.values[0, k] > .9)
+    bus.restore(snapshot)
+    assert(knob.w_out.data()[0, 0] == snapshot[0, k])
+
+    w.set_control_bus(False)
+    w.set_buffer_sharing(False)
+    w.compile()
+    assert(w.control_bus is None)
+    assert(not np.shares_memory(knob.w_out.data(), bus.values))
+    assert(knob.w_out.data()[0, 0] == snapshot[0, k])
@@ -0,0 +1,45 @@
+import numpy as np
+
+
+def test_sampler_writes_out_buffers():
+    import pyAudioGraph as ag
+
+    w = ag.World(buf_len=8)
+    sampler = ag.Nodes.SamplerNode(w, 2)
+    sample = np.arange(24, dtype=np.float32).reshape((2, 12))
+    sampler.add_buffer(sample)
+    sampler.w_trigger_list._default_data = [(0, 0, 1.)]
+    buffers = [w_out.buffer() for w_out in sampler.w_out]
+
+    sampler.calc_func()
+    sampler.w_trigger_list._default_data = []
+    assert(np.array_equal(sampler.w_out[0].data(), sample[:1, :8]))
+    assert(np.array_equal(sampler.w_out[1].data(), sample[1:, :8]))
+    sampler.calc_func()
+    assert(np.array_equal(sampler.w_out[1].data()[:, :4], sample[1:, 8:]))
+    assert(all(w_out.data() is b for w_out, b in zip(sampler.w_out, buffers)))
+
+
+def test_mixer_delay_in_place():
+    import pyAudioGraph as ag
+
+    w = ag.World(buf_len=16, nchannels=1)
+    in_node = ag.Nodes.InNode(w)
+    dl = ag.Nodes.Delay(w, 16, weight=.5)
+    mix = ag.Nodes.MixerNode(w, np.array([[1., -.5]]))
+    out = ag.Nodes.OutNode(w)
+    in_node.w_out[0].plug_into(dl.w_in)
+    dl.w_out.plug_into(mix.w_in[0])
+    in_node.w_out[0].plug_into(mix.w_in[1])
+    mix.w_out[0].plug_into(out.w_in[0])
+    w.append(out)
+    w.sort()
+
+    x = np.arange(64, dtype=np.float32).reshape((1, 64))
+    w.set_input_stream(ag.AudioStreamArray(x, w.sample_rate))
+    y = w.render()
+    comb = np.copy(x)  # comb[n] = x[n] + .5 * comb[n - 16]
+    for n in range(16, 64):
+        comb[:, n] += .5 * comb[:, n - 16]
+    expected = comb - .5 * x
+    assert(np.allclose(y, expected))
@@ -0,0 +1,134 @@
+import numpy as np
+
+
+def _build(w, n_chains):
+    import pyAudioGraph as ag
+
+    rec = ag.Nodes.AudioRateRecorder(w, n_chains)
+    for i in range(n_chains):
+        osc = ag.Nodes.SinOsc(w)
+        lp = ag.Nodes.Lowpass(w, f0=200 * (i + 1))
+        osc.w_out.plug_into(lp.w_in)
+        lp.w_out.plug_into(rec.w_in[i])
+    w.append(rec)
+    w.sort()
+    return rec
+
+
+def test_dependency_levels():
+    import pyAudioGraph as ag
+    from pyAudioGraph.Executor import dependency_levels
+
+    w = ag.World()
+    _build(w, 3)
+    levels = dependency_levels(w._nodes)
+    assert([len(lv) for lv in levels] == [3, 3, 1])
+    assert(all(isinstance(n, ag.Nodes.SinOsc) for n in levels[0]))
+
+
+def test_parallel_executor():
+    import pyAudioGraph as ag
+
+    w_ser = ag.World()
+    rec_ser = _build(w_ser, 4)
+
+    w_par = ag.World()
+    rec_par = _build(w_par, 4)
+    ex = ag.ParallelExecutor(n_threads=3, sync_cost=0, calibration_blocks=2)
+    w_par.set_executor(ex)
+    w_par.compile()
+
+    for i in range(10):
+        w_ser._process_block()
+        w_par._process_block()
+    assert(any(parallel for parallel, tasks in ex._schedule))
+
+    for k in range(4):
+        assert(np.allclose(rec_ser.get_data(k), rec_par.get_data(k)))
+    ex.close()
+
+
+def test_partition_stages():
+    from pyAudioGraph.Executor import partition_stages
+
+    assert(partition_stages([1, 1, 1, 1], 2) == [(0, 2), (2, 4)])
+    assert(partition_stages([3, 1, 1, 1], 2) == [(0, 1), (1, 4)])
+    assert(partition_stages([1], 3) == [(0, 1), (1, 1), (1, 1)])
+
+
+def test_pipeline_executor():
+    import pyAudioGraph as ag
+
+    def build(w):
+        csg = ag.Nodes.ControlSeqGen(w, np.arange(50))
+        fir1 = ag.Nodes.ControlFIRFilter(w, [1, .5, .2])
+        fir2 = ag.Nodes.ControlFIRFilter(w, [.3, .1])
+        rec = ag.Nodes.ControlRateRecorder(w, 2)
+        csg.w_out.plug_into(fir1.w_in)
+        fir1.w_out.plug_into(fir2.w_in)
+        fir2.w_out.plug_into(rec.w_in[0])
+        csg.w_out.plug_into(rec.w_in[1])
+        w.append(rec)
+        w.sort()
+        return rec
+
+    w_ser = ag.World()
+    rec_ser = build(w_ser)
+
+    w_pip = ag.World()
+    rec_pip = build(w_pip)
+    ex = ag.PipelineExecutor(n_stages=2, calibration_blocks=1)
+    w_pip.set_executor(ex)
+    w_pip.compile()
+    w_pip._process_block()  # calibration
+    ex._cost = dict.fromkeys(ex._cost, 1.)
+
+    for i in range(20):
+        w_ser._process_block()
+        w_pip._process_block()
+    assert([len(s) for s in ex.stages()] == [2, 2])
+
+    # calibration block + 20 blocks, the recorder is in the last stage, 1 block late
+    assert(rec_pip.count == 1 + 20 - 1)
+    for k in range(2):
+        assert(np.allclose(rec_pip.get_data(k), rec_ser.get_data(k)[:rec_pip.count]))
+    ex.close()
+    assert(isinstance(rec_pip.w_in[1].out_wire(), ag.OutWire))
+
+
+def test_pipeline_executor_mixer():
+    import pyAudioGraph as ag
+
+    def build(w):
+        osc = ag.Nodes.SinOsc(w)
+        lp = ag.Nodes.Lowpass(w)
+        mixer = ag.Nodes.MixerNode(w, np.full((2, 1), .5))
+        out = ag.Nodes.OutNode(w)
+        osc.w_out.plug_into(lp.w_in)
+        lp.w_out.plug_into(mixer.w_in[0])
+        for i in range(2):
+            mixer.w_out[i].plug_into(out.w_in[i])
+        w.append(out)
+        w.sort()
+
+    w_ser = ag.World()
+    build(w_ser)
+    w_ser.set_silence_detection(True)
+
+    w_pip = ag.World()
+    build(w_pip)
+    w_pip.set_silence_detection(True)  # not applied to executors
+    ex = ag.PipelineExecutor(n_stages=2, calibration_blocks=1)
+    w_pip.set_executor(ex)
+    w_pip.compile()
+    w_pip._process_block()  # calibration
+    ex._cost = dict.fromkeys(ex._cost, 1.)
+
+    # the mixer reads the Lowpass through a pipeline register, one block late,
+    # and the calibration block advanced the sources by one block
+    ref = w_ser.render(64 * 10)
+    y = w_pip.render(64 * 10)
+    assert([len(s) for s in ex.stages()] == [2, 2])
+    assert(not w_pip.detects_silence)
+    assert(np.allclose(y[:, 64:], ref[:, 64:], atol=1e-6))
+    ex.close()
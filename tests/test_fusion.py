@@ -0,0 +1,144 @@
+import numpy as np
+
+
+def _expr_graph(w):
+    import pyAudioGraph as ag
+
+    seq = ag.Nodes.ControlSeqGen(w, [100., 700., 1200.])
+    a = ag.Nodes.SinOsc(w, freq=300)
+    b = ag.Nodes.SawOsc(w, freq=200)
+    gain = seq.w_out.range_to_unit(0, 1000, invert=True)  # control rate, computed with floats
+    y = ((a.w_out + b.w_out) * gain - a.w_out / 4).clip(-.8, .8)
+    rec = ag.Nodes.AudioRateRecorder(w, 1)
+    y.plug_into(rec.w_in[0])
+    w.append(rec)
+    w.sort()
+    return rec
+
+
+def _render(buf_len, fusion, sharing=False):
+    import pyAudioGraph as ag
+
+    w = ag.World(buf_len=buf_len)
+    rec = _expr_graph(w)
+    w.set_op_fusion(fusion)
+    w.set_buffer_sharing(sharing)
+    for _ in range(6):
+        w._process_block()
+    return w, rec.get_data(0)
+
+
+def test_fusion():
+    import pyAudioGraph as ag
+    from pyAudioGraph.Fusion import FusedOpNode
+
+    ref_w, ref = _render(64, False)
+    w, y = _render(64, True)
+    assert(np.allclose(y, ref, atol=1e-6))
+
+    fused = [n for n in w._plan if isinstance(getattr(n, '__self__', None), FusedOpNode)]
+    n_ops = sum(isinstance(n, ag.Wire.OpNode) for n in ref_w._nodes)
+    assert(len(fused) == 1)  # the OpNodes form a single tree
+    assert(len(w._plan) == len(ref_w._plan) - n_ops + 1)
+    assert(len(fused[0].__self__.fused_nodes) == n_ops)
+
+    w, y = _render(64, True, sharing=True)
+    assert(np.allclose(y, ref, atol=1e-6))
+
+
+def test_fusion_chunked(monkeypatch):
+    from pyAudioGraph.Fusion import FusedOpNode
+
+    monkeypatch.setattr(FusedOpNode, 'chunk', 256)
+    _, ref = _render(1000, False)
+    _, y = _render(1000, True)
+    assert(np.allclose(y, ref, atol=1e-6))
+
+
+def test_fusion_control_and_batched():
+    import pyAudioGraph as ag
+
+    x = np.array([.25, 2., -1.])
+    for batch_size in (1, 3):
+        w = ag.World(buf_len=16, batch_size=batch_size)
+        seq = ag.Nodes.ControlSeqGen(w, x)
+        y = (seq.w_out * 2).range_to_unit(0, 1) - seq.w_out / 4
+        out = ag.Nodes.OutNode(w)
+        y.plug_into(out.w_level)
+        for i in range(2):
+            seq.w_out.plug_into(out.w_in[i])
+        w.append(out)
+        w.sort()
+        w.set_op_fusion(True)
+        w.compile()
+        assert(len(w._plan) == 3)  # seq, the fused expression, out
+        ys = []
+        for _ in range(3):
+            w._process_block()
+            ys.append(np.copy(y.data()))
+        assert(np.allclose(np.concatenate(ys, axis=1), np.clip(2 * x, 0, 1) - x / 4))
+
+
+def test_fusion_deep_chain():
+    import pyAudioGraph as ag
+    from pyAudioGraph.Fusion import FusedOpNode
+
+    w = ag.World(buf_len=16)
+    seq = ag.Nodes.ControlSeqGen(w, [1., 2.])
+    osc = ag.Nodes.SinOsc(w)
+    y, z = seq.w_out, osc.w_out
+    for _ in range(100):
+        y, z = y * .5 + 1, z * .5 + 1
+    out = ag.Nodes.OutNode(w)
+    y.plug_into(out.w_level)
+    for i in range(2):
+        z.plug_into(out.w_in[i])
+    w.append(out)
+    w.sort()
+    ref = w.render(64)
+    w.set_op_fusion(True)
+    w.compile()
+    fused = [n.__self__ for n in w._plan if isinstance(n.__self__, FusedOpNode)]
+    assert(len(fused) == 2 * 7)  # 200 ops in trees of at most 32
+    assert(np.allclose(w.render(64), ref))
+
+
+def test_fusion_nan():
+    import linecache
+    import pyAudioGraph as ag
+    from pyAudioGraph.Fusion import FusedOpNode
+
+    # maximum and minimum of the control rate expressions propagate NaN as the ufuncs, whatever the operand order
+    w = ag.World(buf_len=16)
+    a = ag.Nodes.ControlSeqGen(w, [.5])
+    b = ag.Nodes.ControlSeqGen(w, [np.nan])
+    y = ag.Op(np.maximum)(a.w_out, b.w_out) + ag.Op(np.minimum)(a.w_out, b.w_out)
+    out = ag.Nodes.OutNode(w)
+    y.plug_into(out.w_level)
+    for i in range(2):
+        a.w_out.plug_into(out.w_in[i])
+    w.append(out)
+    w.sort()
+    w.set_op_fusion(True)
+    w._process_block()
+    fused = [n.__self__ for n in w._plan if isinstance(n.__self__, FusedOpNode)]
+    assert(len(fused) == 1 and np.isnan(y.data()).all())
+
+    # the generated source is shown in the tracebacks
+    assert(''.join(linecache.getlines(fused[0]._fn.__code__.co_filename)) == fused[0].source)
+
+    # clip keeps the NaN of its operand, as np.clip
+    w = ag.World(buf_len=16)
+    x = ag.Nodes.ControlSeqGen(w, [np.nan, 2., -1.])
+    y = (x.w_out * 1).clip(0, 1)
+    rec = ag.Nodes.ControlRateRecorder(w, 1)
+    y.plug_into(rec.w_in[0])
+    w.append(rec)
+    w.sort()
+    w.set_op_fusion(True)
+    for _ in range(3):
+        w._process_block()
+    fused = [n.__self__ for n in w._plan if isinstance(n.__self__, FusedOpNode)]
+    assert(len(fused) == 1 and '_minimum(_maximum(' in fused[0].source)
+    a = rec.get_data(0)
+    assert(np.isnan(a[0]) and np.array_equal(a[1:], [1., 0.]))
@@ -0,0 +1,110 @@
+import numpy as np
+
+
+def test_compile_nested_group():
+    import pyAudioGraph as ag
+
+    w = ag.World()
+
+    csg = ag.Nodes.ControlSeqGen(w, [1, 0, 0, 1, 0, 0, 1, 0])
+    fir = ag.Nodes.ControlFIRFilter(w, [1, .5, .2])
+    rec = ag.Nodes.ControlRateRecorder(w, 1)
+    csg.w_out.plug_into(fir.w_in)
+    fir.w_out.plug_into(rec.w_in[0])
+
+    g = ag.Group(w)
+    g.append(rec)
+    w.append(g)
+    w.sort()
+    assert(w._nodes == [csg, fir, rec])
+
+    for i in range(8):
+        w._process_block()
+    a = rec.data[0][:8]
+
+    a_expected = np.array([[1., 0.5, 0.2, 1., 0.5, 0.2, 1., 0.5]])
+    assert(np.allclose(a, a_expected))
+
+
+def test_incremental_sort():
+    import pyAudioGraph as ag
+
+    w = ag.World()
+    g = ag.Group(w)
+    g.sort()  # from now on the group is kept sorted
+
+    csg1 = ag.Nodes.ControlSeqGen(w, [1])
+    csg2 = ag.Nodes.ControlSeqGen(w, [2])
+    rec = ag.Nodes.ControlRateRecorder(w, 2)
+    csg1.w_out.plug_into(rec.w_in[0])
+    g.append(rec)
+    assert(g.is_sorted and g.nodesList == [csg1, rec])
+
+    # a new node entering through a connection is inserted before its child
+    g.connect(csg2.w_out, rec.w_in[1])
+    assert(g.is_sorted and g.nodesList == [csg1, csg2, rec])
+
+    # a new edge between sorted nodes moves only the affected nodes
+    fir = ag.Nodes.ControlFIRFilter(w, [1])
+    g.append(fir)
+    assert(g.nodesList[-1] is fir)
+    g.connect(fir.w_out, rec.w_in[0])
+    nl = g.nodesList
+    assert(g.is_sorted and nl.index(fir) < nl.index(rec))
+    assert(csg1.w_out.in_wires() == [])
+
+    g.remove(fir)
+    assert(fir not in g.nodesList)
+    assert(rec.w_in[0].out_wire() is None)
+
+
+def test_cycle():
+    import pyAudioGraph as ag
+
+    w = ag.World()
+    fir1 = ag.Nodes.ControlFIRFilter(w, [1])
+    fir2 = ag.Nodes.ControlFIRFilter(w, [1])
+    fir1.w_out.plug_into(fir2.w_in)
+    w.append(fir2)
+    w.sort()
+
+    try:
+        w.connect(fir2.w_out, fir1.w_in)
+        assert(False)
+    except ValueError:
+        pass
+    assert(fir1.w_in.out_wire() is None)
+
+
+def test_append_then_plug():
+    import pyAudioGraph as ag
+
+    # a new group is sorted lazily: the parents plugged after append are found when compiling
+    w = ag.World(buf_len=16)
+    osc = ag.Nodes.SinOsc(w)
+    rec = ag.Nodes.AudioRateRecorder(w, 1)
+    w.append(rec)
+    osc.w_out.plug_into(rec.w_in[0])
+    w.run(np.zeros((16, 2), dtype=np.float32).tobytes())
+    assert(w._nodes == [osc, rec])
+    assert(np.abs(rec.data[0][:16]).max() > 0)
+
+
+def test_append_then_plug_sorted():
+    import pyAudioGraph as ag
+
+    # in a sorted group, the parents plugged after append are found when compiling again
+    w = ag.World(buf_len=16)
+    osc = ag.Nodes.SinOsc(w)
+    rec = ag.Nodes.AudioRateRecorder(w, 1)
+    w.append(rec)
+    osc.w_out.plug_into(rec.w_in[0])
+    w.sort()
+
+    osc2 = ag.Nodes.SinOsc(w, freq=220)
+    rec2 = ag.Nodes.AudioRateRecorder(w, 1)
+    w.append(rec2)
+    osc2.w_out.plug_into(rec2.w_in[0])
+    w.run(np.zeros((16, 2), dtype=np.float32).tobytes())
+    assert(w._nodes.index(osc2) < w._nodes.index(rec2))
+    assert(np.abs(rec2.data[0][:16]).max() > 0)
@@ -0,0 +1,25 @@
+import numpy as np
+
+
+def test_in_wire_view():
+    import pyAudioGraph as ag
+
+    w = ag.World(buf_len=16)
+    osc = ag.Nodes.SinOsc(w)
+    seq = ag.Nodes.ControlSeqGen(w, [.5])
+    delay = ag.Nodes.Delay(w, 100)
+    osc.w_out.plug_into(delay.w_in)
+    seq.w_out.plug_into(delay.w_in_weight)
+
+    assert(delay.w_in.get_data() is osc.w_out.data())
+    weight = delay.w_in_weight.get_data()
+    assert(weight.shape == () and weight is delay.w_in_weight.get_data())
+    seq.w_out.set_data(.25)
+    assert(weight == .25)  # a view of the buffer
+
+    # the view follows a new buffer of the OutWire
+    seq.w_out._data = np.full((1, 1), .75, dtype=np.float32)
+    assert(delay.w_in_weight.get_data() == .75)
+
+    seq.w_out.unplug(delay.w_in_weight)
+    assert(delay.w_in_weight.get_data() == .2)  # the default weight
@@ -0,0 +1,210 @@
+import numpy as np
+
+
+def _build_chain(w):
+    import pyAudioGraph as ag
+
+    osc = ag.Nodes.SinOsc(w)
+    f0 = ag.Nodes.ControlSeqGen(w, [300, 300, 800, 2000, 2000])
+    lp = ag.Nodes.Lowpass(w)
+    dl = ag.Nodes.Delay(w, 100, weight=.5)
+    mix = ag.Nodes.MixerNode(w, np.array([[.5, .5]]))
+    rec = ag.Nodes.AudioRateRecorder(w, 1, init_size=w.buf_len)
+    osc.w_out.plug_into(lp.w_in)
+    f0.w_out.plug_into(lp.w_f0)
+    lp.w_out.plug_into(dl.w_in)
+    dl.w_out.plug_into(mix.w_in[0])
+    osc.w_out.plug_into(mix.w_in[1])
+    mix.w_out[0].plug_into(rec.w_in[0])
+    w.append(rec)
+    w.sort()
+    return rec
+
+
+def test_super_block():
+    import pyAudioGraph as ag
+
+    n_cycles = 6
+    w1 = ag.World(buf_len=32)
+    rec1 = _build_chain(w1)
+    w1.run_nrt(lambda: rec1.count == 8 * n_cycles)
+
+    w8 = ag.World(buf_len=32)
+    rec8 = _build_chain(w8)
+    count = [0]
+
+    def stop():
+        count[0] += 1
+        return count[0] > n_cycles
+    w8.run_nrt(stop, n_blocks=8)
+
+    assert(rec8.count == rec1.count)
+    assert(np.allclose(rec8.get_data(0), rec1.get_data(0), atol=1e-5))
+
+
+def _build_osc(w):
+    import pyAudioGraph as ag
+
+    osc = ag.Nodes.SinOsc(w)
+    out = ag.Nodes.OutNode(w)
+    for i in range(w.nchannels):
+        osc.w_out.plug_into(out.w_in[i])
+    w.append(out)
+    w.sort()
+
+
+def test_render():
+    import pyAudioGraph as ag
+
+    w = ag.World(buf_len=64)
+    _build_osc(w)
+    x = w.render(1000)
+    assert(x.shape == (2, 1000))
+    assert(not w.is_running() and not w.nrt)
+
+    w_blocks = ag.World(buf_len=64)
+    _build_osc(w_blocks)
+    blocks = [b.copy() for b in w_blocks.iter_blocks(seconds=1000 / 44100, n_blocks=4)]
+    assert([b.shape[1] for b in blocks] == [256, 256, 256, 232])
+    assert(np.allclose(np.concatenate(blocks, axis=1), x, atol=1e-5))
+
+    assert(list(w_blocks.iter_blocks(n_samples=0)) == [])
+    try:
+        w_blocks.render()
+        assert(False)
+    except ValueError:
+        pass
+
+
+def test_render_to_wav(tmpdir):
+    import wave
+    import pyAudioGraph as ag
+
+    filename = str(tmpdir.join('out.wav'))
+    w = ag.World(buf_len=64)
+    _build_osc(w)
+    w.render_to_wav(filename, 1000)
+
+    w_ref = ag.World(buf_len=64)
+    _build_osc(w_ref)
+    x = w_ref.render(1000)
+
+    wf = wave.open(filename, 'rb')
+    assert(wf.getnchannels() == 2 and wf.getnframes() == 1000)
+    y = np.frombuffer(wf.readframes(1000), dtype=np.int16).reshape((2, -1), order='F')
+    wf.close()
+    assert(np.allclose(y / 32767, x, atol=1e-4))
+
+
+def test_render_to_wav_samplewidth(tmpdir):
+    import wave
+    import pyAudioGraph as ag
+
+    # 8 bit wave files are unsigned, centered on 128
+    filename = str(tmpdir.join('out8.wav'))
+    w = ag.World(buf_len=64)
+    _build_osc(w)
+    w.render_to_wav(filename, 1000, samplewidth=1)
+
+    w_ref = ag.World(buf_len=64)
+    _build_osc(w_ref)
+    x = w_ref.render(1000)
+
+    wf = wave.open(filename, 'rb')
+    assert(wf.getsampwidth() == 1)
+    y = np.frombuffer(wf.readframes(1000), dtype=np.uint8).reshape((2, -1), order='F')
+    wf.close()
+    assert(np.allclose((y - 128.) / 127, x, atol=1.5 / 127))
+
+    a = np.zeros((2, 1000), dtype=np.float32)
+    ag.AudioStreamWaveFile(filename).read(a)
+    assert(np.allclose(a, x, atol=1.5 / 127))
+
+    try:
+        w.render_to_wav(str(tmpdir.join('out24.wav')), 1000, samplewidth=3)
+        assert(False)
+    except ValueError:
+        pass
+
+
+def _build_lowpass(w):
+    import pyAudioGraph as ag
+
+    in_node = ag.Nodes.InNode(w)
+    out = ag.Nodes.OutNode(w)
+    for i in range(w.nchannels):
+        lp = ag.Nodes.Lowpass(w, f0=1000)
+        in_node.w_out[i].plug_into(lp.w_in)
+        lp.w_out.plug_into(out.w_in[i])
+    w.append(out)
+    w.sort()
+
+
+def test_input_stream(tmpdir):
+    import scipy.signal
+    import pyAudioGraph as ag
+    from pyAudioGraph.Nodes.Filters import lowpass_coeff
+
+    x = np.random.RandomState(0).uniform(-.5, .5, (2, 1000)).astype(np.float32)
+    b, a = lowpass_coeff(44100, 1000, 1)
+    y_expected = scipy.signal.lfilter(b, a, x, axis=1)
+
+    for n_blocks in (1, 4):
+        w = ag.World(buf_len=64)
+        _build_lowpass(w)
+        w.set_input_stream(ag.AudioStreamArray(x))
+        assert(np.allclose(w.render(n_blocks=n_blocks), y_expected, atol=1e-5))
+
+    w = ag.World(buf_len=64)
+    _build_lowpass(w)
+    w.set_input_stream(ag.AudioStreamGenerator((x[:, i:i + 100] for i in range(0, 1000, 100)), 2))
+    y = np.concatenate([b.copy() for b in w.iter_blocks()], axis=1)
+    assert(np.allclose(y, y_expected, atol=1e-5))
+
+    # a generator has no length: render until its end
+    w = ag.World(buf_len=64)
+    _build_lowpass(w)
+    w.set_input_stream(ag.AudioStreamGenerator((x[:, i:i + 100] for i in range(0, 1000, 100)), 2))
+    assert(np.allclose(w.render(), y_expected, atol=1e-5))
+
+    filename = str(tmpdir.join('in.wav'))
+    writer = ag.WaveFileWriter(filename, 2, 44100, 1000)
+    writer.write(x)
+    writer.close()
+    s_mm = ag.AudioStreamWaveFileMemmap(filename)
+    s_wf = ag.AudioStreamWaveFile(filename)
+    assert(s_mm.length == s_wf.length == 1000)
+    a_mm, a_wf = np.zeros((2, 1000), dtype=np.float32), np.zeros((2, 1000), dtype=np.float32)
+    s_mm.read(a_mm)
+    s_wf.read(a_wf)
+    assert(np.allclose(a_mm, a_wf) and np.allclose(a_mm, x, atol=1e-4))
+
+
+def test_wave_file_memmap_formats(tmpdir):
+    import wave
+    import pyAudioGraph as ag
+
+    x = np.random.RandomState(0).uniform(-.5, .5, (2, 1000)).astype(np.float32)
+    filename = str(tmpdir.join('in8.wav'))
+    writer = ag.WaveFileWriter(filename, 2, 44100, 1000, samplewidth=1)
+    writer.write(x)
+    writer.close()
+    s_mm = ag.AudioStreamWaveFileMemmap(filename)
+    a_mm, a_wf = np.zeros((2, 1000), dtype=np.float32), np.zeros((2, 1000), dtype=np.float32)
+    s_mm.read(a_mm)
+    ag.AudioStreamWaveFile(filename).read(a_wf)
+    assert(np.allclose(a_mm, a_wf) and np.allclose(a_mm, x, atol=1.5 / 127))
+
+    # 24 bit samples are not supported
+    filename = str(tmpdir.join('in24.wav'))
+    wf = wave.open(filename, 'wb')
+    wf.setnchannels(2)
+    wf.setsampwidth(3)
+    wf.setframerate(44100)
+    wf.writeframes(bytes(2 * 3 * 100))
+    wf.close()
+    try:
+        ag.AudioStreamWaveFileMemmap(filename)
+        assert(False)
+    except ValueError:
+        pass
@@ -0,0 +1,45 @@
+import numpy as np
+
+
+def test_operators_in_place():
+    import pyAudioGraph as ag
+
+    w = ag.World(buf_len=16)
+    seq = ag.Nodes.ControlSeqGen(w, [1., 2., 4.])
+    osc = ag.Nodes.SinOsc(w, freq=300)
+    expr = (1 - seq.w_out / 2) * osc.w_out + 0.5
+    clipped = expr.clip(0, 1)
+    rec = ag.Nodes.AudioRateRecorder(w, 2)
+    expr.plug_into(rec.w_in[0])
+    clipped.plug_into(rec.w_in[1])
+    w.append(rec)
+    w.sort()
+
+    ops = [n for n in w._nodes if isinstance(n, ag.Wire.OpNode)]
+    assert(len(ops) == 5 and all(op.in_place for op in ops))
+    buffers = [op.w_out.buffer() for op in ops]
+
+    osc_rec = []
+    for _ in range(3):
+        w._process_block()
+        osc_rec.append(np.copy(osc.w_out.data()))
+    expected = (1 - np.array([1., 2., 4.])[:, None] / 2) * np.concatenate(osc_rec) + .5
+    assert(np.allclose(rec.get_data(0), expected.reshape(-1)))
+    assert(np.allclose(rec.get_data(1), np.clip(expected, 0, 1).reshape(-1)))
+    assert(all(op.w_out.buffer() is b for op, b in zip(ops, buffers)))
+
+
+def test_op_generic_fn():
+    import pyAudioGraph as ag
+
+    w = ag.World(buf_len=8)
+    seq = ag.Nodes.ControlSeqGen(w, [.25, 2.])
+    y = ag.Op(lambda x: 1 - np.clip(x, 0, 1))(seq.w_out)
+    assert(not y.parent.in_place)
+    rec = ag.Nodes.ControlRateRecorder(w, 1)
+    y.plug_into(rec.w_in[0])
+    w.append(rec)
+    w.sort()
+    w._process_block()
+    w._process_block()
+    assert(np.allclose(rec.get_data(0), [.75, 0.]))
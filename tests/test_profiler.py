@@ -0,0 +1,72 @@
+import numpy as np
+
+
+def test_profiler():
+    import pyAudioGraph as ag
+    from pyAudioGraph.Profiler import _bin, _bin_start, percentile, N_BINS
+
+    for ns in [0, 7, 15, 16, 17, 100, 1000, 12345, 10 ** 9]:
+        b = _bin(ns)
+        assert(_bin_start(b) <= ns < _bin_start(b + 1))
+    hist = np.zeros(N_BINS, dtype=np.int64)
+    hist[_bin(1000)] = 99
+    hist[_bin(10 ** 6)] = 1
+    assert(abs(percentile(hist, 50) - 1e-6) < .1e-6)
+    assert(abs(percentile(hist, 100) - 1e-3) < .1e-3)
+
+    ref = _graph(ag.World(buf_len=64)).render(64 * 50)
+    w = _graph(ag.World(buf_len=64))
+    w.set_profiling(True)
+    assert(np.array_equal(w.render(64 * 50), ref))
+
+    profile = w.profiler.snapshot()
+    assert(profile.blocks.calls == 50)
+    assert(profile.deadline == 64 / 44100)
+    assert(0 < profile.dsp_load['p50'] <= profile.dsp_load['p99'] * 1.2 and profile.dsp_load['max'] > 0)
+    classes = {s.name: s for s in profile.by_class()}
+    assert(set(classes) == {'SinOsc', 'Filters', 'Group', 'SawOsc', 'Lowpass', 'AudioRateRecorder', 'MixerNode',
+                            'OutNode'})
+    assert(classes['Lowpass'].calls == 200)  # one of them evaluated by the nested Groups
+    assert(classes['Group'].calls == 50)
+    # the Groups count only their own overhead: the times of the Nodes add up to the time of the blocks
+    assert(abs(sum(s.total for s in profile.nodes) - profile.blocks.total) < 1e-9)
+    assert(classes['Filters'].total < classes['SawOsc'].total)
+    assert(profile.hotspots(1)[0].name in ('SawOsc', 'Lowpass'))
+    assert('Lowpass' in profile.report())
+
+    w.profiler.reset()
+    assert(w.profiler.snapshot().blocks.calls == 0)
+    w.set_profiling(False)
+    assert(w.profiler is None)
+    w.render(64)
+
+
+def _graph(w):
+    import pyAudioGraph as ag
+
+    class Filters(ag.Group):  # kept as one Node of the plan, evaluating its Nodes
+        def calc_func(self):
+            super().calc_func()
+
+    osc = ag.Nodes.SinOsc(w)
+    mixer = ag.Nodes.MixerNode(w, np.ones((2, 3)) / 3)
+    for k in range(3):
+        lp = ag.Nodes.Lowpass(w, f0=300 * (k + 1))
+        osc.w_out.plug_into(lp.w_in)
+        lp.w_out.plug_into(mixer.w_in[k])
+    out = ag.Nodes.OutNode(w)
+    for i in range(2):
+        mixer.w_out[i].plug_into(out.w_in[i])
+
+    g = Filters(w)
+    inner = ag.Group(w)  # evaluated by g
+    saw = ag.Nodes.SawOsc(w)
+    lp = ag.Nodes.Lowpass(w)
+    rec = ag.Nodes.AudioRateRecorder(w, 1)
+    saw.w_out.plug_into(lp.w_in)
+    lp.w_out.plug_into(rec.w_in[0])
+    inner.append(rec)
+    g.append(inner)
+    w.append([out, g])
+    w.sort()
+    return w
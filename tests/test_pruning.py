@@ -0,0 +1,49 @@
+import numpy as np
+
+
+def _graph(w):
+    import pyAudioGraph as ag
+
+    osc = ag.Nodes.SinOsc(w, freq=300)
+    dead = ag.Nodes.Lowpass(w)  # output not connected
+    osc.w_out.plug_into(dead.w_in)
+    level = ag.Nodes.ControlSeqGen(w, [.5])
+    gain = level.w_out * 2 - .25
+    out = ag.Nodes.OutNode(w)
+    for i in range(2):
+        osc.w_out.plug_into(out.w_in[i])
+    gain.plug_into(out.w_level)
+    w.append([out, dead])
+    w.sort()
+    return osc, dead, level, gain
+
+
+def test_graph_pruning():
+    import pyAudioGraph as ag
+
+    w = ag.World(buf_len=32)
+    _graph(w)
+    ref = w.render(320)
+
+    w = ag.World(buf_len=32)
+    osc, dead, level, gain = _graph(w)
+    w.set_graph_pruning(True)
+    y = w.render(320)
+    assert(np.allclose(y, ref))
+
+    assert(dead not in w._nodes)
+    assert(len(w._plan) == 2)  # osc and out, the gain is folded
+    assert(np.allclose(gain.data(), .75))
+    assert(w.render(64, n_blocks=2).shape == (2, 64))  # super-blocks evaluate the constant Nodes
+
+
+def test_live_nodes_and_constants():
+    import pyAudioGraph as ag
+    from pyAudioGraph.Pruning import live_nodes, fold_constants
+
+    w = ag.World(buf_len=32)
+    osc, dead, level, gain = _graph(w)
+    nodes = live_nodes(w._topGroup.compile())
+    assert(osc in nodes and dead not in nodes)
+    folded = fold_constants(nodes)
+    assert(folded[0] is level and gain.parent in folded and osc not in folded)
@@ -0,0 +1,58 @@
+import numpy as np
+
+
+def _make_fir(world):
+    import pyAudioGraph as ag
+
+    fir = ag.Nodes.ControlFIRFilter(world, [1, .5, .2])
+    return [fir.w_in], [fir.w_out]
+
+
+def test_remote_group():
+    import pyAudioGraph as ag
+
+    for latency in (0, 1):
+        w = ag.World()
+        csg = ag.Nodes.ControlSeqGen(w, [1, 0, 0, 1, 0, 0, 1, 0])
+        remote = ag.RemoteGroup(w, _make_fir, in_lens=[1], out_lens=[1], latency=latency)
+        rec = ag.Nodes.ControlRateRecorder(w, 1)
+        csg.w_out.plug_into(remote.w_in[0])
+        remote.w_out[0].plug_into(rec.w_in[0])
+        w.append(rec)
+        w.sort()
+
+        for i in range(8 + latency):
+            w._process_block()
+        remote.close()
+
+        a = rec.data[0][latency:8 + latency]
+        a_expected = np.array([[1., 0.5, 0.2, 1., 0.5, 0.2, 1., 0.5]])
+        assert(np.allclose(a, a_expected))
+
+
+def test_remote_group_dispose():
+    from multiprocessing import shared_memory
+    import pyAudioGraph as ag
+
+    w = ag.World()
+    csg = ag.Nodes.ControlSeqGen(w, [1, 0])
+    remote = ag.RemoteGroup(w, _make_fir, in_lens=[1], out_lens=[1])
+    rec = ag.Nodes.ControlRateRecorder(w, 1)
+    csg.w_out.plug_into(remote.w_in[0])
+    remote.w_out[0].plug_into(rec.w_in[0])
+    w.append(rec)
+    w.sort()
+    for i in range(4):
+        w._process_block()
+
+    # dispose stops the child process and unlinks the shared memory
+    names = [remote._shm_in.name, remote._shm_out.name]
+    w.dispose()
+    assert(not remote._process.is_alive())
+    for name in names:
+        try:
+            shared_memory.SharedMemory(name=name)
+            assert(False)
+        except FileNotFoundError:
+            pass
+    remote.close()  # already closed
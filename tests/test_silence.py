@@ -0,0 +1,55 @@
+import numpy as np
+
+
+def _render(detection, n_voices=8):
+    import pyAudioGraph as ag
+
+    w = ag.World(buf_len=64)
+    matrix = np.ones((2, n_voices)) / n_voices
+    mixer = ag.Nodes.MixerNode(w, matrix)
+    samplers = []
+    for i in range(n_voices):
+        sampler = ag.Nodes.SamplerNode(w, 1)
+        sampler.add_buffer(np.ones((1, 300), dtype=np.float32))
+        sampler.w_trigger_list._default_data = []
+        lp = ag.Nodes.Lowpass(w, f0=2000)
+        delay = ag.Nodes.Delay(w, 100, weight=.5)
+        sampler.w_out[0].plug_into(lp.w_in)
+        lp.w_out.plug_into(delay.w_in)
+        delay.w_out.plug_into(mixer.w_in[i])
+        samplers.append(sampler)
+    out = ag.Nodes.OutNode(w)
+    for i in range(2):
+        mixer.w_out[i].plug_into(out.w_in[i])
+    w.append(out)
+    w.sort()
+    w.set_silence_detection(detection)
+
+    samplers[0].w_trigger_list._default_data = [(0, 10, 1.)]
+    y = [w.render(64)]
+    samplers[0].w_trigger_list._default_data = []
+    y.append(w.render(64 * 200))
+    return w, np.concatenate(y, axis=1)
+
+
+def test_silence_detection():
+    from pyAudioGraph.Silence import _SleepingNode
+
+    _, ref = _render(False)
+    w, y = _render(True)
+    assert(np.allclose(y, ref, atol=1e-5))
+    assert(np.abs(ref[:, :1000]).max() > .1)
+
+    sleeping = [n.__self__ for n in w._plan if isinstance(n.__self__, _SleepingNode)]
+    assert(len(sleeping) == 8 * 2 + 1)
+    # of 201 blocks, the silent voices sleep after the first one (the delays once their line is flushed),
+    # the played voice and the mixer once its tail has decayed
+    slept = sorted(s.n_slept for s in sleeping)
+    assert(slept[3:] == [199] * 7 + [200] * 7)
+    assert(min(slept) > 150)
+    assert(all(s.asleep for s in sleeping))
+
+    # the outputs of the sleeping nodes are flagged silent, until the plan is rebuilt without detection
+    w.set_silence_detection(False)
+    w.compile()
+    assert(not any(s.node.out_wires[0].silent for s in sleeping))
@@ -0,0 +1,53 @@
+import json
+import time
+import gc
+
+
+def test_tracer(tmp_path):
+    import pyAudioGraph as ag
+    from pyAudioGraph.Trace import Tracer
+
+    w = ag.World(buf_len=64)
+    osc = ag.Nodes.SinOsc(w)
+    lp = ag.Nodes.Lowpass(w)
+    out = ag.Nodes.OutNode(w)
+    osc.w_out.plug_into(lp.w_in)
+    for i in range(2):
+        lp.w_out.plug_into(out.w_in[i])
+    w.append(out)
+    w.sort()
+
+    tracer = Tracer(capacity=64)
+    w.set_tracer(tracer)
+    w.render(64 * 4)
+    events = [e for e in tracer.events() if e['ph'] == 'X']
+    assert([e['name'] for e in events] == ['SinOsc', 'Lowpass', 'OutNode', 'block'] * 4)
+    block = events[3]
+    assert(all(block['ts'] <= e['ts'] and e['ts'] + e['dur'] <= block['ts'] + block['dur'] + 1e-3
+               for e in events[:3]))
+
+    # the ring keeps the last capacity spans
+    w.render(64 * 100)
+    assert(len([e for e in tracer.events() if e['ph'] == 'X']) == 64)
+
+    tracer.clear()
+    queue = ag.AsyncCmdQueue()
+    queue.set_tracer(tracer)
+    buf = ag.RingBuffer(1, 8)
+    queue.push(ag.LambdaCommand(buf.advance_write_index, args=(4,)))
+    for _ in range(100):
+        if queue.empty():
+            break
+        time.sleep(.01)
+    queue.join()
+    gc.collect()
+    tracer.close()
+
+    filename = str(tmp_path / 'trace.json')
+    tracer.dump(filename)
+    with open(filename) as f:
+        events = json.load(f)['traceEvents']
+    threads = {e['tid']: e['args']['name'] for e in events if e['ph'] == 'M'}
+    spans = {e['name']: e for e in events if e['ph'] == 'X'}
+    assert(threads[spans['RingBuffer.advance_write_index']['tid']] == 'AsyncCmdQueue')
+    assert('gc (generation 2)' in spans)
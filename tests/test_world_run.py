@@ -0,0 +1,22 @@
+import numpy as np
+
+
+def test_run_interleaved_io():
+    import pyAudioGraph as ag
+
+    w = ag.World(buf_len=16, nchannels=2)
+    in_node = ag.Nodes.InNode(w)
+    out = ag.Nodes.OutNode(w)
+    for i in range(2):
+        in_node.w_out[i].plug_into(out.w_in[i])
+    out.w_level._default_data = 2.
+    w.append(out)
+    w.sort()
+
+    frames = np.arange(32, dtype=np.float32).reshape((16, 2))  # left = even, right = odd
+    out_data = w.run(frames.tobytes())
+    assert(np.array_equal(w.inBuffer, frames.T))
+    assert(np.array_equal(np.frombuffer(out_data, dtype=np.float32), 2 * frames.reshape(-1)))
+
+    # the output buffer is reused
+    assert(w.run(bytes(frames)) is out_data)